@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Cold-start import benchmark for the package.
+
+Each scenario is imported in a fresh interpreter, so the numbers include every
+module a headless worker would load. Pass ``--max-ms`` to fail when the median
+import time of a scenario exceeds a budget.
+
+Usage:
+    python benchmarks/import_time.py --repeat 10 --max-ms 400
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'import src': "import src",
+    'solver only': "from src import find_max_rectangle_general, find_max_rectangle_convex",
+    'plotting': "from src import plot_polygon_with_rectangle",
+}
+
+# Runs inside the child interpreter and reports the import time and loaded modules
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'matplotlib': 'matplotlib' in sys.modules,
+                   'modules': len(sys.modules)}}))
+"""
+
+
+def measure(statement: str, repeat: int) -> dict:
+    """
+    Import a statement in fresh interpreters and summarise the timings.
+
+    Args:
+        statement: Python import statement to time
+        repeat: Number of fresh interpreters to start
+
+    Returns:
+        Dictionary with the median and best time in milliseconds and the module footprint
+    """
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(statement=statement)],
+            cwd=ROOT, check=True, capture_output=True, text=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    times = [run['seconds'] * 1000 for run in runs]
+    return {
+        'median_ms': statistics.median(times),
+        'best_ms': min(times),
+        'matplotlib_loaded': runs[-1]['matplotlib'],
+        'modules': runs[-1]['modules'],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per scenario")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="fail if a solver scenario's median exceeds this budget")
+    args = parser.parse_args()
+
+    failed = False
+    for name, statement in SCENARIOS.items():
+        result = measure(statement, args.repeat)
+        print(f"{name:12s} median {result['median_ms']:8.1f} ms  best {result['best_ms']:8.1f} ms  "
+              f"modules {result['modules']:5d}  matplotlib {'yes' if result['matplotlib_loaded'] else 'no'}")
+        if name != 'plotting':
+            if result['matplotlib_loaded']:
+                print(f"  FAIL: '{statement}' imports matplotlib")
+                failed = True
+            if args.max_ms is not None and result['median_ms'] > args.max_ms:
+                print(f"  FAIL: median above budget of {args.max_ms:.1f} ms")
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Load generator for the local solving service.
+
+Sends ``POST /solve`` requests from a number of concurrent keep-alive
+connections and reports throughput, latency percentiles and the service's own
+metrics. A fraction of the requests repeat polygons already sent, to exercise
+in-flight deduplication. Without ``--url`` a service is started in this
+process on a free loopback port.
+
+Usage:
+    python benchmarks/load_generator.py --requests 2000 --concurrency 64 --duplicates 0.5
+    python benchmarks/load_generator.py --url http://127.0.0.1:8080 --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.service.server import serve  # noqa: E402
+
+
+def random_polygon(rng: random.Random, vertices: int = 12) -> list:
+    """Return a random star-shaped polygon around the origin."""
+    angles = sorted(rng.uniform(0, 2 * np.pi) for _ in range(vertices))
+    radii = [rng.uniform(0.5, 1.0) for _ in range(vertices)]
+    return [[r * np.cos(a), r * np.sin(a)] for r, a in zip(radii, angles)]
+
+
+async def _request(reader, writer, host: str, method: str, path: str, payload: dict = None):
+    """Send one keep-alive request and return (status, body)."""
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+                  f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _client(host: str, port: int, jobs: asyncio.Queue, latencies: list, statuses: dict) -> None:
+    """Send requests from the queue over one connection."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                payload = jobs.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            began = time.perf_counter()
+            status, _ = await _request(reader, writer, host, 'POST', '/solve', payload)
+            latencies.append(time.perf_counter() - began)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, args: argparse.Namespace) -> dict:
+    """Run the load test against a listening service and return a report."""
+    rng = random.Random(args.seed)
+    jobs = asyncio.Queue()
+    sent = []
+    for _ in range(args.requests):
+        if sent and rng.random() < args.duplicates:
+            polygon = rng.choice(sent)
+        else:
+            polygon = random_polygon(rng, args.vertices)
+            sent.append(polygon)
+        jobs.put_nowait({'polygon': polygon, 'engine': args.engine,
+                         'relative_gap': args.relative_gap, 'timeout': args.timeout})
+
+    latencies, statuses = [], {}
+    began = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, jobs, latencies, statuses) for _ in range(args.concurrency)))
+    wall = time.perf_counter() - began
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, metrics = await _request(reader, writer, host, 'GET', '/metrics')
+    writer.close()
+
+    latencies = np.asarray(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'seconds': wall,
+        'throughput_rps': len(latencies) / wall,
+        'latency_p50_ms': float(np.percentile(latencies, 50)),
+        'latency_p99_ms': float(np.percentile(latencies, 99)),
+        'statuses': statuses,
+        'service': metrics,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    if args.url:
+        address = urlsplit(args.url)
+        return await run_load(address.hostname, address.port or 80, args)
+
+    ready = asyncio.Event()
+    server = asyncio.create_task(serve('127.0.0.1', 0, ready=ready, jobs=args.jobs,
+                                       batch_window=args.batch_window))
+    await ready.wait()
+    try:
+        return await run_load('127.0.0.1', ready.port, args)
+    finally:
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', help="service to load (default: start one in this process)")
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=32, help="number of concurrent connections")
+    parser.add_argument('--duplicates', type=float, default=0.3,
+                        help="fraction of requests that repeat an earlier polygon")
+    parser.add_argument('--vertices', type=int, default=12)
+    parser.add_argument('--engine', default='general')
+    parser.add_argument('--relative-gap', type=float, default=0.05)
+    parser.add_argument('--timeout', type=float, default=30.0, help="per-request deadline in seconds")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 2, help="workers of the local service")
+    parser.add_argument('--batch-window', type=float, default=0.005)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"requests      {report['requests']}")
+        print(f"throughput    {report['throughput_rps']:.1f} req/s")
+        print(f"latency p50   {report['latency_p50_ms']:.1f} ms")
+        print(f"latency p99   {report['latency_p99_ms']:.1f} ms")
+        print(f"statuses      {report['statuses']}")
+        service = report['service']
+        print(f"deduplicated  {service['deduplicated']}  batches {service['batches']}  "
+              f"mean batch {service['mean_batch_size']:.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
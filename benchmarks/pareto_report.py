@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Accuracy-versus-speed report of every engine against reference answers.
+
+A seeded corpus is generated, reference answers are computed (or read from
+the on-disk cache), and every engine is run over a sweep of relative gaps.
+The report directory receives a Markdown table per polygon class
+(``pareto.md``), the raw records (``records.csv``) and, when matplotlib is
+installed, a plot of error against wall time (``pareto.png``). The exit
+status is 1 if any engine returned a rectangle outside its polygon.
+
+Usage:
+    python benchmarks/pareto_report.py --per-class 8 --seed 0 --output-dir pareto-report
+    python benchmarks/pareto_report.py --engines general grid --gaps 0.05 0.025 --classes star rectilinear
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.evaluation import (  # noqa: E402
+    POLYGON_CLASSES, cached_reference, evaluate_engines, format_table, generate_corpus, plot_pareto, summarize
+)
+from src.evaluation.pareto import DEFAULT_RELATIVE_GAPS, EvaluationRecord  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--per-class", type=int, default=8, help="polygons per class")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    parser.add_argument("--classes", nargs="+", choices=sorted(POLYGON_CLASSES), help="polygon classes (default: all)")
+    parser.add_argument("--engines", nargs="+", help="engines to run (default: all registered engines)")
+    parser.add_argument("--gaps", nargs="+", type=float, default=list(DEFAULT_RELATIVE_GAPS),
+                        help="relative point gaps to sweep")
+    parser.add_argument("--oracle-angles", type=int, default=180,
+                        help="orientations scanned per quarter turn by the reference oracle")
+    parser.add_argument("--cache", default=os.path.join(ROOT, ".cache", "oracle"),
+                        help="directory of cached reference answers")
+    parser.add_argument("--output-dir", default="pareto-report", help="directory for the table, records and plot")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.per_class, args.seed, args.classes)
+    start = time.perf_counter()
+    references = {item.polygon_id: cached_reference(item.coords, args.cache, angles=args.oracle_angles)
+                  for item in corpus}
+    print(f"{len(corpus)} reference answers in {time.perf_counter() - start:.1f} s (cache: {args.cache})")
+
+    start = time.perf_counter()
+    records = evaluate_engines(corpus, references, args.engines, args.gaps)
+    print(f"{len(records)} engine runs in {time.perf_counter() - start:.1f} s")
+    summary = summarize(records)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    table = format_table(summary)
+    with open(os.path.join(args.output_dir, "pareto.md"), "w", encoding="utf-8") as handle:
+        handle.write(table)
+    with open(os.path.join(args.output_dir, "records.csv"), "w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(EvaluationRecord._fields)
+        writer.writerows(records)
+    try:
+        plot_pareto(summary, os.path.join(args.output_dir, "pareto.png"))
+    except ImportError:
+        print("matplotlib is not installed; skipping the plot")
+    print(table)
+
+    outside = [record for record in records if not record.contained]
+    for record in outside:
+        print(f"FAIL: {record.engine} (relative gap {record.relative_gap:g}) returned a rectangle outside "
+              f"{record.polygon_id}")
+    return 1 if outside else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,10 @@ with open("README.md", "r", encoding="utf-8") as fh:
 with open("requirements.txt", "r", encoding="utf-8") as fh:
     requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
 
+# Plotting is optional so headless solver installs don't pull in matplotlib
+plot_requirements = [req for req in requirements if req.startswith("matplotlib")]
+requirements = [req for req in requirements if req not in plot_requirements]
+
 setup(
     name="max-inscribed-rectangle",
     version="1.0.0",
@@ -36,6 +40,7 @@ setup(
     python_requires=">=3.8",
     install_requires=requirements,
     extras_require={
+        "plot": plot_requirements,
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
@@ -43,6 +48,11 @@ setup(
             "flake8>=3.8",
         ],
     },
+    entry_points={
+        "console_scripts": [
+            "lir=src.cli:main",
+        ],
+    },
     include_package_data=True,
     zip_safe=False,
 ) 
\ No newline at end of file
@@ -2,18 +2,46 @@
 Maximum Inscribed Rectangle Finder
 
 A package for finding the largest possible rectangle that can be inscribed within a given polygon.
+
+Submodules and the public functions below are imported lazily on first access,
+so solver-only processes never pay for (or need) matplotlib.
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from .algorithms.convex_algorithm import find_max_rectangle_convex
-from .algorithms.general_algorithm import find_max_rectangle_general
-from .visualization.plotter import plot_polygon_with_rectangle
+# Public name -> module that defines it, relative to this package
+_LAZY_ATTRIBUTES = {
+    'find_max_rectangle': '.algorithms.engines',
+    'find_max_rectangle_convex': '.algorithms.convex_algorithm',
+    'find_max_rectangle_general': '.algorithms.general_algorithm',
+    'plot_polygon_with_rectangle': '.visualization.plotter',
+}
+
+_SUBMODULES = {'algorithms', 'batch', 'core', 'evaluation', 'formats', 'service', 'visualization'}
 
 __all__ = [
+    'find_max_rectangle',
     'find_max_rectangle_convex',
     'find_max_rectangle_general', 
     'plot_polygon_with_rectangle'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    """Import public functions and submodules on first access."""
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _SUBMODULES)
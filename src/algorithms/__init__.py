@@ -4,8 +4,36 @@ Algorithms for finding maximum inscribed rectangles in polygons.
 
 from .convex_algorithm import find_max_rectangle_convex
 from .general_algorithm import find_max_rectangle_general
+from .grid_algorithm import find_max_rectangle_grid
+from .fixed_orientation import find_max_rectangle_at_angle
+from .raster_algorithm import find_max_rectangle_raster
+from .incremental import IncrementalGeneralSolver
+from .multi_rectangle import find_top_k_rectangles
+from .refinement import RefinementReport, refine_rectangle
+from .engines import RectangleResult, solve, find_max_rectangle
+from .cost_model import CostEstimate, estimate_cost, plan_schedule, tune_point_gap
+from .orientation_profile import OrientationMatch, RectangleOrientationProfile
+from .sampling_algorithm import SamplingReport, find_max_rectangle_sampling
 
 __all__ = [
     'find_max_rectangle_convex',
-    'find_max_rectangle_general'
+    'find_max_rectangle_general',
+    'find_max_rectangle_grid',
+    'find_max_rectangle_at_angle',
+    'find_max_rectangle_raster',
+    'IncrementalGeneralSolver',
+    'find_top_k_rectangles',
+    'RefinementReport',
+    'refine_rectangle',
+    'RectangleResult',
+    'solve',
+    'find_max_rectangle',
+    'CostEstimate',
+    'estimate_cost',
+    'plan_schedule',
+    'tune_point_gap',
+    'RectangleOrientationProfile',
+    'OrientationMatch',
+    'find_max_rectangle_sampling',
+    'SamplingReport'
 ] 
\ No newline at end of file
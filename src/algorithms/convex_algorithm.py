@@ -4,9 +4,16 @@ Algorithm for finding maximum inscribed rectangles in convex polygons.
 
 import numpy as np
 import math
+import shapely
 from shapely.geometry import Point, LineString, Polygon
 from ..core.geometry_utils import azimuth, increment, sort_rectangle_coords
-from ..core.polygon_processor import split_into_points, min_extension, tiny_increment
+from ..core.constraints import RectangleConstraints, pair_mask, side_range
+from ..core.polygon_processor import (
+    BoundarySamples, split_into_points, min_extension, tiny_increment, simplify_inward, sample_boundary, nudged_inside
+)
+from ..core.distance_field import DistanceField
+from ..core.ray_index import PolygonRayIndex
+from ..core.symmetry import canonical_pair_mask, detect_symmetries, sample_orbits
 
 
 def extension_interior_check(point1: np.ndarray, point2: np.ndarray, angle: float, polygon: Polygon, tiny_increment_value: float, clockwise: bool = True) -> bool:
@@ -49,7 +56,8 @@ def extend_line(point: np.ndarray, angle: float, extension_length: float, tiny_i
     return LineString((start_point, end_point))
 
 
-def extend_perpendicular(point1: np.ndarray, point2: np.ndarray, polygon: Polygon, extension_length: float, tiny_increment_value: float) -> float:
+def extend_perpendicular(point1: np.ndarray, point2: np.ndarray, polygon: Polygon, extension_length: float, tiny_increment_value: float,
+                         ray_index: PolygonRayIndex = None, side: int = None) -> float:
     """
     Extend line until intersection occurs.
     
@@ -59,70 +67,227 @@ def extend_perpendicular(point1: np.ndarray, point2: np.ndarray, polygon: Polygo
         polygon: Shapely polygon object
         extension_length: Length to extend
         tiny_increment_value: Small increment value
+        ray_index: Optional edge index of the polygon used to shoot the two
+            perpendicular rays instead of intersecting lines with the polygon
+        side: Optional extension side from ``extension_sides``; found with
+            ``extension_interior_check`` otherwise
         
     Returns:
         Side length of the rectangle
     """
     angle = azimuth(point1, point2)
+    if side is None:
+        side = next((switch for switch in (1, -1) if extension_interior_check(
+            point1, point2, angle, polygon, tiny_increment_value, switch == 1)), 0)
+    if not side:
+        return 0
     
-    if extension_interior_check(point1, point2, angle, polygon, tiny_increment_value):
-        crosses_left = polygon.intersection(extend_line(point1, angle + np.pi/2, extension_length, tiny_increment_value))
-        crosses_right = polygon.intersection(extend_line(point2, angle + np.pi/2, extension_length, tiny_increment_value))
+    if ray_index is not None:
+        direction = increment(angle + (np.pi/2) * side, 1.0)
+        return float(ray_index.first_hit(np.array([point1, point2]), np.array([direction, direction]),
+                                         tiny_increment_value).min())
+    
+    crosses_left = polygon.intersection(extend_line(point1, angle + (np.pi/2) * side, extension_length, tiny_increment_value))
+    crosses_right = polygon.intersection(extend_line(point2, angle + (np.pi/2) * side, extension_length, tiny_increment_value))
+    
+    if crosses_left.geom_type == 'MultiLineString':
+        crosses_left = crosses_left.geoms[0]
+    if crosses_right.geom_type == 'MultiLineString':
+        crosses_right = crosses_right.geoms[0]
         
-        if crosses_left.geom_type == 'MultiLineString':
-            crosses_left = crosses_left.geoms[0]
-        if crosses_right.geom_type == 'MultiLineString':
-            crosses_right = crosses_right.geoms[0]
-            
-        side = min(math.dist(crosses_left.coords[1], point1), math.dist(crosses_right.coords[1], point2))
-        return side
+    return min(math.dist(crosses_left.coords[1], point1), math.dist(crosses_right.coords[1], point2))
+
+
+def extension_sides(index1: int, indices2: np.ndarray, samples: BoundarySamples, polygon: Polygon,
+                    tiny_increment_value: float, min_length: float = 0.0) -> np.ndarray:
+    """
+    Find the side every base from one sample extends to from the samples' inward normals.
+    
+    The answer is the one ``extension_interior_check`` gives, tried clockwise
+    first; only moved points that ``nudged_inside`` cannot decide are tested
+    against the polygon.
+    
+    Args:
+        index1: Index of the first point in the samples
+        indices2: Indices of the candidate second points, shape (N,)
+        samples: Output of ``sample_boundary`` for the polygon
+        polygon: Shapely polygon object
+        tiny_increment_value: Small increment value
+        min_length: Bases of at most this length are skipped
         
-    elif extension_interior_check(point1, point2, angle, polygon, tiny_increment_value, False):
-        crosses_left = polygon.intersection(extend_line(point1, angle - np.pi/2, extension_length, tiny_increment_value))
-        crosses_right = polygon.intersection(extend_line(point2, angle - np.pi/2, extension_length, tiny_increment_value))
+    Returns:
+        Array with 1 (angle + pi/2), -1 (angle - pi/2) or 0 (neither, or skipped) per base
+    """
+    point1 = samples.points[index1]
+    delta = samples.points[indices2] - point1
+    sides = np.zeros(len(indices2), dtype=int)
+    todo = np.flatnonzero(np.hypot(delta[:, 0], delta[:, 1]) > min_length)
+    angles = np.arctan2(delta[todo, 1], delta[todo, 0])
+    for switch in (1, -1):
+        directions = np.stack((np.cos(angles + (np.pi/2) * switch), np.sin(angles + (np.pi/2) * switch)), axis=1)
+        first = nudged_inside(samples, np.full(len(todo), index1), directions, tiny_increment_value)
+        second = nudged_inside(samples, indices2[todo], directions, tiny_increment_value)
+        inside = (first == 1) & (second == 1)
+        for position in np.flatnonzero((first != 0) & (second != 0) & ~inside):
+            point2 = samples.points[indices2[todo[position]]]
+            inside[position] = extension_interior_check(point1, point2, azimuth(point1, point2), polygon,
+                                                        tiny_increment_value, switch == 1)
+        sides[todo[inside]] = switch
+        todo, angles = todo[~inside], angles[~inside]
+    return sides
+
+
+def extend_row(point1: np.ndarray, points2: np.ndarray, polygon: Polygon, ray_index: PolygonRayIndex,
+               tiny_increment_value: float, min_length: float = 0.0, sides: np.ndarray = None) -> np.ndarray:
+    """
+    Extend every base from one point at once with an edge index.
+    
+    Args:
+        point1: First point
+        points2: Candidate second points, shape (N, 2)
+        polygon: Shapely polygon object (prepared for faster containment tests)
+        ray_index: Edge index of the polygon
+        tiny_increment_value: Small increment value
+        min_length: Bases of at most this length are skipped
+        sides: Optional extension side of every base from ``extension_sides``;
+            found with the same test as ``extension_interior_check`` otherwise
         
-        if crosses_left.geom_type == 'MultiLineString':
-            crosses_left = crosses_left.geoms[0]
-        if crosses_right.geom_type == 'MultiLineString':
-            crosses_right = crosses_right.geoms[0]
-            
-        side = min(math.dist(crosses_left.coords[1], point1), math.dist(crosses_right.coords[1], point2))
-        return side
-    else:
-        return 0
+    Returns:
+        Array of side lengths as ``extend_perpendicular`` computes them, NaN where skipped
+    """
+    lengths = np.full(len(points2), np.nan)
+    delta = points2 - point1
+    todo = np.flatnonzero(np.hypot(delta[:, 0], delta[:, 1]) > min_length)
+    angles = np.arctan2(delta[todo, 1], delta[todo, 0])
+    for switch in (1, -1):
+        directions = np.stack((np.cos(angles + (np.pi/2) * switch), np.sin(angles + (np.pi/2) * switch)), axis=1)
+        if sides is not None:
+            inside = sides[todo] == switch
+        else:
+            # Same interior test as extension_interior_check, on all undecided bases at once
+            step = directions * tiny_increment_value
+            inside = (shapely.contains_properly(polygon, shapely.points(point1 + step)) &
+                      shapely.contains_properly(polygon, shapely.points(points2[todo] + step)))
+        hits = ray_index.first_hit(np.concatenate((np.broadcast_to(point1, (inside.sum(), 2)), points2[todo[inside]])),
+                                   np.concatenate((directions[inside], directions[inside])), tiny_increment_value)
+        lengths[todo[inside]] = np.minimum(*np.split(hits, 2))
+        todo, angles = todo[~inside], angles[~inside]
+    lengths[todo] = 0
+    return lengths
 
 
-def find_max_rectangle_convex(polygon_coords: list, point_gap: float = 0.015) -> tuple:
+def find_max_rectangle_convex(polygon_coords: list, point_gap: float = 0.015,
+                              simplify_tolerance: float = None,
+                              constraints: RectangleConstraints = None, symmetry: bool = False,
+                              ray_index=None, samples: np.ndarray = None, distance_field=None) -> tuple:
     """
     Find the maximum inscribed rectangle in a convex polygon.
     
     Args:
         polygon_coords: List of (x, y) coordinates defining the polygon
         point_gap: Distance between sampled points (default: 0.015)
+        simplify_tolerance: Optional tolerance for simplifying the polygon inward
+            before sampling (see ``simplify_inward``)
+        constraints: Optional limits on side lengths, aspect ratio and orientation;
+            pass the same constraints' longest side to ``find_final_rectangle``
+            (see ``side_range``)
+        symmetry: Detect mirror and rotational symmetries of the polygon and
+            skip base pairs that a symmetry maps onto others (see ``sample_orbits``);
+            ignored with an orientation constraint
+        ray_index: Optional ``PolygonRayIndex`` of the polygon, or True to build
+            one; perpendicular rays then only test the edges they pass
+        samples: Optional boundary samples in the layout of ``split_into_points``
+            with the same point gap, e.g. from ``SharedBoundary.samples``
+        distance_field: Optional ``DistanceField`` of the polygon, or True to
+            build one with a cell of one point gap; bases whose perpendicular
+            rays certainly leave the polygon too early to beat the best area
+            are skipped without intersecting them (ignored when a ray index is given)
         
     Returns:
         Tuple of (area, (point1, point2)) where point1 and point2 define the base of the rectangle
+        
+    Raises:
+        ValueError: If no rectangle (meeting the constraints) is found, or if
+            samples are combined with simplification
     """
+    if samples is not None and simplify_tolerance:
+        raise ValueError("Given samples cannot be combined with simplification")
     polygon = Polygon(polygon_coords)
+    if simplify_tolerance:
+        polygon, _ = simplify_inward(polygon, simplify_tolerance)
     tiny_increment_value = tiny_increment(polygon, point_gap)
+    ray_index = PolygonRayIndex(polygon) if ray_index is True else ray_index or None
+    if ray_index is not None:
+        shapely.prepare(polygon)
+    # The edge index already bounds sweeps exactly, so a distance field is only used without it
+    field = None if ray_index is not None else \
+        DistanceField(polygon, point_gap) if distance_field is True else distance_field or None
     area = 0.00001
-    edge = split_into_points(polygon, point_gap)
+    # Mirrored and rotated bases change direction, so an orientation window turns symmetry off
+    oriented = constraints is not None and constraints.orientation is not None
+    symmetries = detect_symmetries(list(polygon.exterior.coords)) if symmetry and not oriented else []
+    # Samples know their edges' inward normals, so extension sides need no containment tests
+    boundary = sample_boundary(polygon, point_gap, points=samples)
+    edge = boundary.points
+    orbits = sample_orbits(edge, symmetries) if symmetries else None
     extension_length = min_extension(polygon)
+    shortest, longest = 0.0, np.inf
+    coords = None
+    ceilings = None
     
-    for point1 in edge:
-        for point2 in edge:
+    for index, point1 in enumerate(edge):
+        # Skip pairs whose length or direction can never meet the constraints
+        mask = None if constraints is None else pair_mask(point1, edge, constraints)
+        if symmetries:
+            # Skip pairs that a symmetry maps onto a pair evaluated elsewhere
+            canonical = canonical_pair_mask(index, orbits, ordered=False)
+            mask = canonical if mask is None else mask & canonical
+        candidates = edge if mask is None else edge[mask]
+        # Bases too short to win are skipped up front
+        switches = extension_sides(
+            index, np.arange(len(edge)) if mask is None else np.flatnonzero(mask), boundary, polygon,
+            tiny_increment_value, area / extension_length)
+        # With an index the row is extended in one batch
+        sides = None if ray_index is None else extend_row(point1, candidates, polygon, ray_index,
+                                                          tiny_increment_value, area / extension_length, switches)
+        if field is not None:
+            field.bases += len(candidates)
+            # Upper bounds on every base's area from the rays through its ends, on its side or on either side
+            offsets = candidates - point1
+            lengths = np.hypot(offsets[:, 0], offsets[:, 1])
+            normals = np.stack((-offsets[:, 1], offsets[:, 0]), axis=1) / np.where(lengths > 0, lengths, 1.0)[:, None]
+            heights = np.zeros(len(candidates))
+            for switch in (1, -1):
+                if switches is None or np.any(switches == switch):
+                    limit = field.height_limits(point1, candidates, normals * switch, extension_length, middle=False)[0]
+                    heights = np.maximum(heights, limit if switches is None else np.where(switches == switch, limit, 0.0))
+            ceilings = heights * lengths
+        for position, point2 in enumerate(candidates):
             if np.any(point1 != point2):
+                if ceilings is not None and ceilings[position] <= area:
+                    field.rejected += 1
+                    continue
                 distance = math.dist(point1, point2)
-                if distance > area / extension_length:
-                    area_found = extend_perpendicular(point1, point2, polygon, extension_length, tiny_increment_value) * distance
-                    if area_found > area:
+                if constraints is not None:
+                    shortest, longest = side_range(distance, constraints)
+                if distance > area / min(extension_length, longest):
+                    if sides is None:
+                        side = min(extend_perpendicular(point1, point2, polygon, extension_length, tiny_increment_value,
+                                                        side=None if switches is None else switches[position]), longest)
+                    else:
+                        side = min(sides[position], longest)
+                    area_found = side * distance
+                    if area_found > area and side >= shortest:
                         area = area_found
                         coords = (point1, point2)
     
+    if coords is None:
+        raise ValueError("No rectangle found")
     return area, coords
 
 
-def find_final_rectangle(point1: np.ndarray, point2: np.ndarray, polygon: Polygon, tiny_increment_value: float) -> tuple:
+def find_final_rectangle(point1: np.ndarray, point2: np.ndarray, polygon: Polygon, tiny_increment_value: float,
+                         max_side: float = None, ray_index: PolygonRayIndex = None) -> tuple:
     """
     Find the complete rectangle coordinates after finding the base points.
     
@@ -131,6 +296,9 @@ def find_final_rectangle(point1: np.ndarray, point2: np.ndarray, polygon: Polygo
         point2: Second base point
         polygon: Shapely polygon object
         tiny_increment_value: Small increment value
+        max_side: Optional limit on the side perpendicular to the base
+        ray_index: Optional edge index of the polygon used to shoot the two
+            perpendicular rays
         
     Returns:
         Tuple of four rectangle corner coordinates
@@ -138,7 +306,21 @@ def find_final_rectangle(point1: np.ndarray, point2: np.ndarray, polygon: Polygo
     angle = azimuth(point1, point2)
     extension_length = min_extension(polygon)
     
-    if extension_interior_check(point1, point2, angle, polygon, tiny_increment_value):
+    if ray_index is not None:
+        for switch in (1, -1):
+            if extension_interior_check(point1, point2, angle, polygon, tiny_increment_value, switch == 1):
+                direction = increment(angle + (np.pi/2) * switch, 1.0)
+                left, right = ray_index.first_hit(np.array([point1, point2]), np.array([direction, direction]),
+                                                  tiny_increment_value)
+                if left < right:
+                    coord3, coord4 = point1 + direction * left, point2 + direction * left
+                else:
+                    coord3, coord4 = point2 + direction * right, point1 + direction * right
+                break
+        else:
+            raise ValueError("Could not determine rectangle orientation")
+    
+    elif extension_interior_check(point1, point2, angle, polygon, tiny_increment_value):
         crosses_left = polygon.intersection(extend_line(point1, angle + np.pi/2, extension_length, tiny_increment_value))
         crosses_right = polygon.intersection(extend_line(point2, angle + np.pi/2, extension_length, tiny_increment_value))
         
@@ -161,5 +343,12 @@ def find_final_rectangle(point1: np.ndarray, point2: np.ndarray, polygon: Polygo
             coord4 = point1 + increment(azimuth(point2, coord3), math.dist(coord3, point2))
     else:
         raise ValueError("Could not determine rectangle orientation")
+    
+    if max_side is not None:
+        normal = increment(angle + np.pi/2, 1.0)
+        side = np.dot(coord3 - point1, normal)
+        if abs(side) > max_side:
+            shift = normal * (side - np.sign(side) * max_side)
+            coord3, coord4 = coord3 - shift, coord4 - shift
         
     return point1, point2, coord3, coord4 
\ No newline at end of file
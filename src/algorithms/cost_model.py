@@ -0,0 +1,356 @@
+"""
+Runtime and accuracy model for choosing ``point_gap``.
+
+A boundary sampled every ``point_gap`` has N samples, and the engines loop
+over all N * (N - 1) ordered pairs, so the pair checks alone grow with
+(perimeter / point_gap) ** 2. Pairs that survive the eligibility and area
+pruning tests are then swept. In the general engine a sweep takes one
+containment test per step of ``tiny_increment`` = point_gap / diagonal, so its
+cost also grows with 1 / point_gap. The convex engine also samples the
+boundary with edge normals and finds every row's extension sides in one
+vectorized call, which adds a fixed cost per sample and a small one per pair;
+its sweeps then intersect two lines with the polygon each. The model is
+
+    seconds = samples * row_seconds + pairs * pair_seconds
+              + pairs * eligible_fraction * swept_fraction
+                * (1 + sweep_length / point_gap) * step_seconds
+
+The constants are measured on the polygon itself, from a few hundred random
+pairs (``calibrate``). The sample count is computed exactly the way
+``split_into_points`` would produce it, so a prediction never samples the
+boundary at the target gap.
+
+The accuracy model bounds the discretization loss. Each end of the best base
+lies within one gap of a sample, and the swept side can lose about one gap at
+its far corner. For a w x h rectangle this loses about point_gap * (w + h)
+of its area w * h. The polygon's own perimeter / (2 * area) stands in for
+the unknown (w + h) / (w * h); the two are equal when the polygon is itself
+a rectangle.
+"""
+
+import math
+import time
+import numpy as np
+import shapely
+from shapely.geometry import LineString, Polygon
+from typing import List, NamedTuple
+from ..core.polygon_processor import min_extension, sample_boundary, sweep_heights
+from ..core.precision import segments_in_ring, snap_polygon_inward
+from . import convex_algorithm, general_algorithm
+from .convex_algorithm import extension_sides
+from .grid_algorithm import grid_samples
+
+ENGINE_MODELS = ('convex', 'general', 'grid')
+
+
+class CostCalibration(NamedTuple):
+    """
+    Per-polygon cost constants measured on a small sample of pairs.
+
+    Attributes:
+        engine: Engine the constants were measured for
+        pair_seconds: Time to visit one ordered pair (eligibility check included)
+        step_seconds: Time of one sweep step (general), one perpendicular
+            extension (convex) or one height computation (grid)
+        eligible_fraction: Fraction of pairs whose base lies inside the polygon
+        swept_fraction: Fraction of eligible pairs that pass the area pruning test
+        sweep_length: Mean sweep height of swept pairs times the bounding-box
+            diagonal; a sweep takes about sweep_length / point_gap steps
+        row_seconds: Fixed cost per first sample of a pair (the grid engine
+            checks all pairs of one sample in a single vectorized call, the
+            convex engine finds their extension sides in one)
+    """
+    engine: str
+    pair_seconds: float
+    step_seconds: float
+    eligible_fraction: float
+    swept_fraction: float
+    sweep_length: float
+    row_seconds: float = 0.0
+
+
+class CostEstimate(NamedTuple):
+    """Predicted cost and accuracy of one solve."""
+    engine: str
+    point_gap: float
+    samples: int
+    pairs: int
+    sweep_steps: float
+    seconds: float
+    relative_error: float
+
+
+def sample_count(polygon: Polygon, point_gap: float) -> int:
+    """
+    Number of points ``split_into_points`` returns, without sampling.
+
+    Args:
+        polygon: Shapely polygon object
+        point_gap: Distance between consecutive points
+
+    Returns:
+        Number of boundary samples
+    """
+    coords = list(polygon.exterior.coords[:-1])
+    edges = zip(coords, coords[1:] + coords[:1])
+    return 1 + sum(int(math.dist(vertex1, vertex2) // point_gap) + 1 for vertex1, vertex2 in edges)
+
+
+def predict_error(polygon: Polygon, point_gap: float) -> float:
+    """
+    Estimate the relative area lost to sampling at a given gap.
+
+    Args:
+        polygon: Shapely polygon object
+        point_gap: Distance between sampled points
+
+    Returns:
+        Estimated relative error of the returned area (0.01 means 1%)
+    """
+    return min(point_gap * polygon.exterior.length / (2 * polygon.area), 1.0)
+
+
+def _timed(function, repeats: int) -> float:
+    """Mean wall-clock time of a function over a number of calls."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / max(repeats, 1)
+
+
+def calibrate(polygon_coords: list, engine: str = 'general', pairs: int = 256, seed: int = 0) -> CostCalibration:
+    """
+    Measure the cost constants of an engine on one polygon.
+
+    The eligibility and pruning fractions come from random boundary pairs, and
+    the times come from running the engine's own pair check and sweep on them,
+    so the constants reflect the polygon's vertex count and shape.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        engine: One of ``ENGINE_MODELS``
+        pairs: Number of random pairs measured
+        seed: Seed of the pair sampler
+
+    Returns:
+        CostCalibration for the polygon and engine
+
+    Raises:
+        ValueError: If the engine has no cost model
+    """
+    if engine not in ENGINE_MODELS:
+        raise ValueError(f"No cost model for engine '{engine}', expected one of {ENGINE_MODELS}")
+    polygon = Polygon(polygon_coords)
+    coords = np.asarray(polygon.exterior.coords[:-1], dtype=float)
+    diagonal = min_extension(polygon)
+    rng = np.random.default_rng(seed)
+
+    # Random boundary points, paired in the order the engines visit them
+    if engine == 'grid':
+        # The grid engine samples the inward-snapped ring
+        frame, ring = snap_polygon_inward(polygon, diagonal / 4096)
+        boundary = grid_samples(ring, Polygon(ring).exterior.length / (2 * pairs))
+    elif engine == 'convex':
+        # The convex engine samples with edge normals, at a cost per sample
+        gap = polygon.exterior.length / (2 * pairs)
+        start = time.perf_counter()
+        samples = sample_boundary(polygon, gap)
+        sample_seconds = (time.perf_counter() - start) / len(samples.points)
+        boundary = samples.points
+    else:
+        distances = np.sort(rng.uniform(0, polygon.exterior.length, 2 * pairs))
+        boundary = shapely.get_coordinates(shapely.line_interpolate_point(polygon.exterior, distances))
+    order = rng.integers(0, len(boundary), size=(pairs, 2))
+    order = order[np.lexsort((order[:, 1], order[:, 0]))]
+    keep = order[:, 0] != order[:, 1]
+    points1, points2 = boundary[order[keep, 0]], boundary[order[keep, 1]]
+    if engine == 'grid':
+        grid1, grid2 = points1, points2
+        points1, points2 = frame.to_world(grid1), frame.to_world(grid2)
+    lengths = np.hypot(*(points2 - points1).T)
+    row_seconds = 0.0
+
+    if engine == 'grid':
+        # Rows are vectorized, so split a row's time into a fixed and a per-pair part
+        eligible = segments_in_ring(grid1, grid2, ring)
+        single = _timed(lambda: segments_in_ring(grid1[:1], grid2[:1], ring), 16)
+        batch = _timed(lambda: segments_in_ring(grid1, grid2, ring), 4)
+        row_seconds = single
+        pair_seconds = max(batch - single, 0.0) / max(len(points1) - 1, 1)
+    else:
+        if engine == 'general':
+            def visit(point1, point2):
+                return bool(np.any(point1 != point2)) and polygon.contains(LineString((point1, point2)))
+        else:
+            def visit(point1, point2):
+                return bool(np.any(point1 != point2)) and math.dist(point1, point2) > 0.0
+        start = time.perf_counter()
+        eligible = np.array([visit(point1, point2) for point1, point2 in zip(points1, points2)], dtype=bool)
+        pair_seconds = (time.perf_counter() - start) / max(len(points1), 1)
+    if engine == 'convex':
+        # Extension sides are found a row at a time, so split a row's time into a fixed and a per-pair part
+        tiny_increment_value = diagonal / 4096
+        index1, indices2 = order[keep, 0], order[keep, 1]
+        single = _timed(lambda: extension_sides(index1[0], indices2[:1], samples, polygon, tiny_increment_value), 16)
+        batch = _timed(lambda: extension_sides(index1[0], indices2, samples, polygon, tiny_increment_value), 4)
+        row_seconds = sample_seconds + single
+        pair_seconds += max(batch - single, 0.0) / max(len(points1) - 1, 1)
+
+    heights = np.zeros(len(points1))
+    if np.any(eligible):
+        heights[eligible] = sweep_heights(points1[eligible], points2[eligible], coords)
+    if engine == 'convex':
+        # The convex engine sweeps to whichever side is inside
+        heights = np.maximum(heights, sweep_heights(points2, points1, coords))
+
+    # Replay the area pruning test of the engines in loop order
+    best = 0.00001
+    swept = np.zeros(len(points1), dtype=bool)
+    for index in np.flatnonzero(eligible):
+        if engine == 'grid' or lengths[index] > best / diagonal:
+            swept[index] = True
+            best = max(best, heights[index] * lengths[index])
+    eligible_count = int(np.count_nonzero(eligible))
+    swept_fraction = np.count_nonzero(swept) / max(eligible_count, 1)
+
+    # Time the engine's own sweep on a few swept pairs
+    timed_pairs = [index for index in np.flatnonzero(swept) if heights[index] > 0][:8]
+    step_seconds = 0.0
+    sweep_length = 0.0
+    if timed_pairs and engine == 'general':
+        steps = 0
+        start = time.perf_counter()
+        for index in timed_pairs:
+            step = heights[index] / 16
+            general_algorithm.extend_perpendicular(points1[index], points2[index], polygon, step)
+            steps += 18
+        step_seconds = (time.perf_counter() - start) / steps
+        sweep_length = float(np.mean(heights[swept])) * diagonal
+    elif timed_pairs and engine == 'convex':
+        # The engine sweeps every swept base, with its side from extension_sides; the first call only warms up
+        timed_pairs = list(np.flatnonzero(swept)[:32])
+        switches = [extension_sides(index1[index], indices2[index:index + 1], samples, polygon,
+                                    tiny_increment_value)[0] for index in timed_pairs]
+
+        def extend_all():
+            for index, switch in zip(timed_pairs, switches):
+                convex_algorithm.extend_perpendicular(points1[index], points2[index], polygon, diagonal,
+                                                      tiny_increment_value, side=switch)
+        extend_all()
+        step_seconds = _timed(extend_all, 2) / len(timed_pairs)
+    elif timed_pairs:
+        batch = np.flatnonzero(swept)
+        single = _timed(lambda: sweep_heights(points1[batch[:1]], points2[batch[:1]], coords), 16)
+        whole = _timed(lambda: sweep_heights(points1[batch], points2[batch], coords), 4)
+        step_seconds = max(whole - single, 0.0) / max(len(batch) - 1, 1)
+        row_seconds += single
+
+    return CostCalibration(engine, pair_seconds, step_seconds, eligible_count / max(len(points1), 1),
+                           float(swept_fraction), sweep_length, row_seconds)
+
+
+def estimate_cost(polygon_coords: list, point_gap: float, engine: str = 'general',
+                  calibration: CostCalibration = None) -> CostEstimate:
+    """
+    Predict the runtime and accuracy of a solve before running it.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        point_gap: Distance between sampled points
+        engine: One of ``ENGINE_MODELS``
+        calibration: Constants from ``calibrate`` (default: measured now)
+
+    Returns:
+        CostEstimate for the solve
+    """
+    polygon = Polygon(polygon_coords)
+    calibration = calibration or calibrate(polygon_coords, engine)
+    samples = sample_count(polygon, point_gap)
+    pairs = samples * (samples - 1)
+    sweeps = pairs * calibration.eligible_fraction * calibration.swept_fraction
+    sweep_steps = sweeps * (1 + calibration.sweep_length / point_gap)
+    seconds = samples * calibration.row_seconds + pairs * calibration.pair_seconds + sweep_steps * calibration.step_seconds
+    return CostEstimate(engine, point_gap, samples, pairs, sweep_steps, seconds, predict_error(polygon, point_gap))
+
+
+def _finest_gap(polygon_coords: list, budget: float, engine: str, calibration: CostCalibration,
+                levels: int = 1, factor: float = 2.0) -> float:
+    """Finest gap whose schedule of ``levels`` coarse-to-fine solves fits the time budget."""
+    polygon = Polygon(polygon_coords)
+
+    def seconds(gap: float) -> float:
+        return sum(estimate_cost(polygon_coords, gap * factor ** level, engine, calibration).seconds
+                   for level in range(levels))
+
+    coarse = polygon.exterior.length / 8
+    if seconds(coarse) > budget:
+        return coarse
+    low, high = math.log(coarse) - 20, math.log(coarse)
+    for _ in range(40):
+        middle = (low + high) / 2
+        if seconds(math.exp(middle)) > budget:
+            low = middle
+        else:
+            high = middle
+    return math.exp(high)
+
+
+def tune_point_gap(polygon_coords: list, engine: str = 'general', time_budget: float = None,
+                   target_error: float = None, calibration: CostCalibration = None) -> CostEstimate:
+    """
+    Pick the point gap for a time budget, an accuracy target or both.
+
+    With only a time budget, the finest gap predicted to finish in time is
+    chosen. With only a target error, the coarsest gap predicted to meet it is
+    chosen. With both, the target error is met if the budget allows it, and
+    otherwise the budget wins.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        engine: One of ``ENGINE_MODELS``
+        time_budget: Largest acceptable predicted runtime in seconds
+        target_error: Largest acceptable predicted relative error
+        calibration: Constants from ``calibrate`` (default: measured now)
+
+    Returns:
+        CostEstimate of the chosen gap; its ``seconds`` can exceed the budget
+        when even the coarsest sensible gap is too slow
+
+    Raises:
+        ValueError: If neither a time budget nor a target error is given
+    """
+    if time_budget is None and target_error is None:
+        raise ValueError("Give a time budget, a target error or both")
+    polygon = Polygon(polygon_coords)
+    calibration = calibration or calibrate(polygon_coords, engine)
+    gap = 0.0
+    if target_error is not None:
+        gap = target_error * 2 * polygon.area / polygon.exterior.length
+    if time_budget is not None:
+        gap = max(gap, _finest_gap(polygon_coords, time_budget, engine, calibration))
+    return estimate_cost(polygon_coords, gap, engine, calibration)
+
+
+def plan_schedule(polygon_coords: list, time_budget: float, engine: str = 'general', levels: int = 3,
+                  factor: float = 2.0, calibration: CostCalibration = None) -> List[CostEstimate]:
+    """
+    Plan a coarse-to-fine sequence of solves that fits a time budget as a whole.
+
+    Each level divides the gap by ``factor``, so a usable answer is available
+    early and the last level is the finest gap the remaining budget allows.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        time_budget: Predicted runtime of all levels together, in seconds
+        engine: One of ``ENGINE_MODELS``
+        levels: Number of solves
+        factor: Ratio between consecutive gaps
+        calibration: Constants from ``calibrate`` (default: measured now)
+
+    Returns:
+        List of CostEstimate, coarsest first
+    """
+    calibration = calibration or calibrate(polygon_coords, engine)
+    finest = _finest_gap(polygon_coords, time_budget, engine, calibration, levels, factor)
+    return [estimate_cost(polygon_coords, finest * factor ** level, engine, calibration)
+            for level in reversed(range(levels))]
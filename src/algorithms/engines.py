@@ -0,0 +1,346 @@
+"""
+Uniform front end over the rectangle finders for batch and command-line use.
+"""
+
+import math
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence, Tuple
+from shapely.geometry import Polygon
+from ..core.classification import ShapeClass, classify_polygon
+from ..core.constraints import RectangleConstraints, side_range
+from ..core.geometry_utils import sort_rectangle_coords
+from ..core.polygon_processor import min_extension, tiny_increment, simplify_inward
+from ..core.distance_field import DistanceField, QuickRejectStats
+from ..core.ray_index import PolygonRayIndex
+from . import convex_algorithm, general_algorithm, grid_algorithm, sampling_algorithm
+from .fixed_orientation import find_max_rectangle_at_angle
+from .cost_model import ENGINE_MODELS, tune_point_gap
+from .refinement import RefinementReport, refine_rectangle
+from .sampling_algorithm import SamplingReport
+
+
+@dataclass
+class RectangleResult:
+    """Rectangle found by one of the engines, with the settings and timings that produced it."""
+    area: float
+    corners: List[Tuple[float, float]]
+    engine: str
+    point_gap: float
+    timings: Dict[str, float] = field(default_factory=dict)
+    shape_class: str = None
+    refinement: RefinementReport = None
+    quick_reject: QuickRejectStats = None
+    sampling: SamplingReport = None
+
+    def to_record(self) -> dict:
+        """Return a JSON-serialisable dictionary of the result."""
+        return {
+            'area': float(self.area),
+            'corners': [[float(x), float(y)] for x, y in self.corners],
+            'engine': self.engine,
+            'point_gap': float(self.point_gap),
+            'timings': {phase: float(seconds) for phase, seconds in self.timings.items()},
+            **({'shape_class': self.shape_class} if self.shape_class is not None else {}),
+            **({'refinement': {name: float(value) for name, value in self.refinement._asdict().items()}}
+               if self.refinement is not None else {}),
+            **({'quick_reject': {name: float(value) for name, value in self.quick_reject._asdict().items()}}
+               if self.quick_reject is not None else {}),
+            **({'sampling': {'evaluations': int(self.sampling.evaluations), 'batches': int(self.sampling.batches),
+                             'stalled': bool(self.sampling.stalled), 'seconds': float(self.sampling.seconds),
+                             'history': np.asarray(self.sampling.history, dtype=float).tolist()}}
+               if self.sampling is not None else {}),
+        }
+
+
+def _reject_options(engine: str, options: dict, supported: Sequence[str] = ()) -> None:
+    """Raise ValueError for options that an engine would otherwise ignore."""
+    unknown = sorted(set(options) - set(supported))
+    if unknown:
+        raise ValueError(f"The {engine} engine does not support {', '.join(unknown)}")
+
+
+def _run_convex(polygon: Polygon, point_gap: float, constraints: RectangleConstraints = None,
+                symmetry: bool = False, ray_index: bool = False, samples: np.ndarray = None,
+                distance_field: DistanceField = None, **options) -> Tuple[float, tuple]:
+    """Run the convex engine and return (area, corners)."""
+    _reject_options('convex', options)
+    index = PolygonRayIndex(polygon) if ray_index else None
+    area, (point1, point2) = convex_algorithm.find_max_rectangle_convex(
+        list(polygon.exterior.coords[:-1]), point_gap, constraints=constraints, symmetry=symmetry, ray_index=index,
+        samples=samples, distance_field=distance_field)
+    max_side = side_range(math.dist(point1, point2), constraints)[1] if constraints else None
+    corners = convex_algorithm.find_final_rectangle(point1, point2, polygon, tiny_increment(polygon, point_gap),
+                                                    None if max_side == np.inf else max_side, index)
+    return area, corners
+
+
+def _run_general(polygon: Polygon, point_gap: float, constraints: RectangleConstraints = None,
+                 symmetry: bool = False, ray_index: bool = False, samples: np.ndarray = None,
+                 distance_field: DistanceField = None, **options) -> Tuple[float, tuple]:
+    """Run the general engine and return (area, corners)."""
+    _reject_options('general', options)
+    side, angle, point1, point2 = general_algorithm.find_max_rectangle_general(
+        list(polygon.exterior.coords[:-1]), point_gap, constraints=constraints, symmetry=symmetry,
+        ray_index=ray_index, samples=samples, distance_field=distance_field)
+    return side * math.dist(point1, point2), general_algorithm.find_final_rectangle(side, angle, point1, point2)
+
+
+def _run_grid(polygon: Polygon, point_gap: float, grid_size: float = None, constraints: RectangleConstraints = None,
+              **options) -> Tuple[float, tuple]:
+    """Run the integer-grid engine (grid_size defaults to a tenth of the point gap)."""
+    if constraints is not None:
+        raise ValueError("The grid engine does not support constraints")
+    _reject_options('grid', options)
+    grid_size = grid_size or point_gap / 10
+    side, angle, point1, point2 = grid_algorithm.find_max_rectangle_grid(list(polygon.exterior.coords[:-1]), grid_size, point_gap)
+    return side * math.dist(point1, point2), general_algorithm.find_final_rectangle(side, angle, point1, point2)
+
+
+def orientation_candidates(polygon: Polygon, scan: int = 0) -> List[float]:
+    """
+    Rectangle orientations worth solving exactly, modulo a quarter turn.
+
+    Args:
+        polygon: Shapely polygon object, with or without holes
+        scan: Number of evenly spaced orientations added to the candidates
+
+    Returns:
+        Sorted list of distinct angles in [0, pi/2): every edge direction of
+        every ring, the minimum rotated rectangle's direction and the scan
+    """
+    angles = list(np.arange(scan) * (np.pi/2) / scan) if scan else []
+    for ring in [polygon.exterior, *polygon.interiors]:
+        coords = np.asarray(ring.coords)
+        edges = np.diff(coords, axis=0)
+        angles.extend(np.arctan2(edges[:, 1], edges[:, 0]))
+    corners = np.asarray(polygon.minimum_rotated_rectangle.exterior.coords)
+    angles.append(math.atan2(corners[1][1] - corners[0][1], corners[1][0] - corners[0][0]))
+    return sorted(set(np.round(np.mod(angles, np.pi/2), 12)) - {np.pi/2})
+
+
+def _run_orientations(polygon: Polygon, point_gap: float, angles: Sequence[float] = None, scan: int = 0,
+                      constraints: RectangleConstraints = None, **options) -> Tuple[float, tuple]:
+    """Solve exactly at a few orientations (default: ``orientation_candidates``) and keep the best."""
+    if constraints is not None:
+        raise ValueError("The orientations engine does not support constraints")
+    _reject_options('orientations', options)
+    exterior = list(polygon.exterior.coords[:-1])
+    holes = [list(ring.coords[:-1]) for ring in polygon.interiors]
+    best_area, best = 0.0, None
+    for angle in (orientation_candidates(polygon, scan) if angles is None else angles):
+        side, rectangle_angle, point1, point2 = find_max_rectangle_at_angle(exterior, angle, holes)
+        area = side * math.dist(point1, point2)
+        if area > best_area:
+            best_area, best = area, (side, rectangle_angle, point1, point2)
+    if best is None:
+        raise ValueError("No rectangle found")
+    return best_area, general_algorithm.find_final_rectangle(*best)
+
+
+def _run_sampling(polygon: Polygon, point_gap: float, seed: int = 0, jobs: int = 1,
+                  constraints: RectangleConstraints = None, report: list = None, **options) -> Tuple[float, tuple]:
+    """
+    Draw base pairs by adaptive importance sampling until the best area stalls.
+
+    The ``SamplingReport`` is appended to ``report`` if given; further options
+    must be tuning arguments of ``find_max_rectangle_sampling``.
+    """
+    if constraints is not None:
+        raise ValueError("The sampling engine does not support constraints")
+    _reject_options('sampling', options, SAMPLING_OPTIONS)
+    (side, angle, point1, point2), sampling = sampling_algorithm.find_max_rectangle_sampling(
+        list(polygon.exterior.coords[:-1]), point_gap, seed=seed, jobs=jobs, **options)
+    if report is not None:
+        report.append(sampling)
+    return side * math.dist(point1, point2), general_algorithm.find_final_rectangle(side, angle, point1, point2)
+
+
+# Tuning arguments of find_max_rectangle_sampling that the sampling engine passes on
+SAMPLING_OPTIONS = ('batch_size', 'elite_fraction', 'learning_rate', 'exploration', 'local_fraction', 'patience',
+                    'tolerance', 'max_evaluations', 'max_seconds')
+
+# Engine name -> (runner, default point gap)
+ENGINES: Dict[str, Tuple[Callable[..., Tuple[float, tuple]], float]] = {
+    'convex': (_run_convex, 0.015),
+    'general': (_run_general, 0.026),
+    'grid': (_run_grid, 0.026),
+    'orientations': (_run_orientations, 0.026),
+    'sampling': (_run_sampling, 0.026),
+}
+
+# Engines that search inside holes instead of ignoring them
+HOLE_ENGINES = {'orientations'}
+
+
+def choose_engine(shape: ShapeClass, constraints: RectangleConstraints = None,
+                  max_orientation_vertices: int = 64) -> Tuple[str, dict]:
+    """
+    Pick the fastest engine that is correct for a shape class.
+
+    - Polygons with holes: the orientations engine with a scan of 90
+      orientations, as it is the only engine that respects holes
+    - Convex or near-rectangular rectilinear polygons: one exact solve along
+      the edge directions; other rectilinear polygons, such as staircases
+      traced from raster masks, can hold a much larger tilted rectangle and
+      are treated like any other concave polygon
+    - Convex polygons: the convex engine
+    - Other small polygons: the orientations engine, at the edge directions
+      and the minimum rotated rectangle's direction for near-rectangular
+      shapes, plus a scan of 90 orientations otherwise
+    - Everything else: the general engine
+
+    Each exact solve gets slower with the vertex count, so concave polygons
+    with more than ``max_orientation_vertices`` vertices go to the general
+    engine. With constraints, which only the polygon engines support, convex
+    shapes go to the convex engine and everything else to the general engine.
+
+    Args:
+        shape: Output of ``classify_polygon``
+        constraints: Optional rectangle constraints
+        max_orientation_vertices: Largest concave polygon sent to the orientations engine
+
+    Returns:
+        Tuple of (engine name, extra engine keyword arguments)
+
+    Raises:
+        ValueError: If constraints are combined with holes
+    """
+    if constraints is not None:
+        if shape.has_holes:
+            raise ValueError("Constraints are not supported for polygons with holes")
+        return ('convex' if shape.convex else 'general'), {}
+    if shape.has_holes:
+        return 'orientations', {'scan': 90}
+    if shape.rectilinear and (shape.convex or shape.near_rectangular):
+        return 'orientations', {'angles': [shape.rectilinear_angle]}
+    if shape.convex:
+        return 'convex', {}
+    if shape.vertices <= max_orientation_vertices:
+        return 'orientations', ({} if shape.near_rectangular else {'scan': 90})
+    return 'general', {}
+
+
+def solve(polygon_coords: list, engine: str = 'general', point_gap: float = None,
+          relative_gap: float = None, simplify_tolerance: float = None, time_budget: float = None,
+          target_error: float = None, holes: Sequence[list] = None, refine: bool = False,
+          **engine_options) -> RectangleResult:
+    """
+    Find the maximum inscribed rectangle with the named engine.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        engine: Name of an engine in ``ENGINES``, or 'auto' to classify the
+            polygon and let ``choose_engine`` pick one
+        point_gap: Distance between sampled points (default: the engine's default)
+        relative_gap: Point gap as a fraction of the bounding-box diagonal; overrides point_gap
+        simplify_tolerance: Optional tolerance for simplifying the polygon inward first
+        time_budget: Without an explicit gap, pick the finest gap predicted to
+            finish in this many seconds (see ``cost_model.tune_point_gap``)
+        target_error: Without an explicit gap, pick the coarsest gap predicted
+            to lose at most this relative area
+        holes: Optional interior rings; only engines in ``HOLE_ENGINES`` accept them
+        refine: Polish the engine's rectangle with ``refine_rectangle`` so it is no
+            longer tied to the sample grid; the gain is in ``result.refinement``
+        **engine_options: Passed to the engine, which rejects options it does
+            not support with ValueError; ``distance_field=True`` gives the
+            convex and general engines a ``DistanceField`` at the point gap, and
+            its reject and start rates are in ``result.quick_reject``. The
+            sampling engine's progress is in ``result.sampling``
+
+    Returns:
+        RectangleResult with corners in plotting order and per-phase timings
+    """
+    if engine != 'auto' and engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {sorted(ENGINES)} or 'auto'")
+    if refine and engine_options.get('constraints') is not None:
+        raise ValueError("Refinement does not support rectangle constraints")
+    if simplify_tolerance and engine_options.get('samples') is not None:
+        raise ValueError("Given samples describe the unsimplified polygon")
+    timings = {}
+    shape_class = None
+
+    start = time.perf_counter()
+    polygon = Polygon(polygon_coords, holes)
+    if simplify_tolerance:
+        polygon, _ = simplify_inward(polygon, simplify_tolerance)
+    if engine == 'auto':
+        timings['prepare'] = time.perf_counter() - start
+        start = time.perf_counter()
+        shape = classify_polygon(polygon)
+        engine, chosen_options = choose_engine(shape, engine_options.get('constraints'))
+        engine_options = {**chosen_options, **engine_options}
+        shape_class = shape.kind
+        timings['classify'] = time.perf_counter() - start
+        start = time.perf_counter()
+    if polygon.interiors and engine not in HOLE_ENGINES:
+        raise ValueError(f"The {engine} engine does not support holes, use one of {sorted(HOLE_ENGINES)}")
+    runner, default_gap = ENGINES[engine]
+    if relative_gap is not None:
+        point_gap = relative_gap * min_extension(polygon)
+    elif point_gap is None and engine in ENGINE_MODELS and (time_budget is not None or target_error is not None):
+        timings['prepare'] = timings.get('prepare', 0.0) + time.perf_counter() - start
+        start = time.perf_counter()
+        point_gap = tune_point_gap(list(polygon.exterior.coords[:-1]), engine, time_budget, target_error).point_gap
+        timings['tune'] = time.perf_counter() - start
+        start = time.perf_counter()
+    elif point_gap is None:
+        point_gap = default_gap
+    timings['prepare'] = timings.get('prepare', 0.0) + time.perf_counter() - start
+
+    start = time.perf_counter()
+    field = None
+    if engine_options.get('distance_field') is True and engine in ('convex', 'general') and \
+            not engine_options.get('ray_index'):
+        field = engine_options['distance_field'] = DistanceField(polygon, point_gap)
+    sampling = []
+    if engine == 'sampling':
+        engine_options['report'] = sampling
+    area, corners = runner(polygon, point_gap, **engine_options)
+    timings['search'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    corners = [tuple(np.asarray(corner, dtype=float)) for corner in sort_rectangle_coords(list(corners))]
+    timings['finalize'] = time.perf_counter() - start
+
+    refinement = None
+    if refine:
+        start = time.perf_counter()
+        rectangle, refinement = refine_rectangle(list(polygon.exterior.coords[:-1]), corners,
+                                                 [list(ring.coords[:-1]) for ring in polygon.interiors] or None,
+                                                 point_gap=point_gap)
+        if refinement.gain > 0:
+            area = refinement.refined_area
+            corners = [tuple(np.asarray(corner, dtype=float)) for corner in
+                       sort_rectangle_coords(list(general_algorithm.find_final_rectangle(*rectangle)))]
+        timings['refine'] = time.perf_counter() - start
+
+    return RectangleResult(area=float(area), corners=corners, engine=engine, point_gap=point_gap, timings=timings,
+                           shape_class=shape_class, refinement=refinement,
+                           quick_reject=None if field is None else field.stats(),
+                           sampling=sampling[0] if sampling else None)
+
+
+def find_max_rectangle(polygon, point_gap: float = None, relative_gap: float = None,
+                       **options) -> RectangleResult:
+    """
+    Find the maximum inscribed rectangle with the engine that suits the polygon.
+
+    The polygon is classified first (see ``classify_polygon``) and solved
+    with the engine ``choose_engine`` picks. The result's ``engine``,
+    ``shape_class`` and ``timings['classify']`` record the decision.
+
+    Args:
+        polygon: Shapely polygon (holes are respected) or list of (x, y) coordinates
+        point_gap: Distance between sampled points (default: the chosen engine's default)
+        relative_gap: Point gap as a fraction of the bounding-box diagonal; overrides point_gap
+        **options: Further keyword arguments of ``solve``
+
+    Returns:
+        RectangleResult with corners in plotting order
+    """
+    if isinstance(polygon, Polygon):
+        options.setdefault('holes', [list(ring.coords[:-1]) for ring in polygon.interiors] or None)
+        polygon = list(polygon.exterior.coords[:-1])
+    return solve(polygon, 'auto', point_gap=point_gap, relative_gap=relative_gap, **options)
@@ -4,14 +4,20 @@ Algorithm for finding maximum inscribed rectangles in arbitrary polygons.
 
 import numpy as np
 import math
+import shapely
 from shapely.geometry import LineString, Polygon
 from shapely import transform
 from ..core.geometry_utils import azimuth, increment, sort_rectangle_coords
-from ..core.polygon_processor import split_into_points, min_extension, tiny_increment
+from ..core.constraints import RectangleConstraints, pair_mask, side_range
+from ..core.polygon_processor import split_into_points, min_extension, tiny_increment, simplify_inward
+from ..core.distance_field import DistanceField
+from ..core.ray_index import PolygonRayIndex
+from ..core.symmetry import canonical_pair_mask, detect_symmetries, orbit_pairs, sample_orbits
 
 
 def extend_perpendicular(point1: np.ndarray, point2: np.ndarray, polygon: Polygon, 
-                        tiny_increment_value: float) -> tuple:
+                        tiny_increment_value: float, max_side: float = np.inf,
+                        ray_index: PolygonRayIndex = None, start_side: float = 0.0) -> tuple:
     """
     Find the biggest rectangle possible given 2 eligible points.
     
@@ -20,53 +26,206 @@ def extend_perpendicular(point1: np.ndarray, point2: np.ndarray, polygon: Polygo
         point2: Second point
         polygon: Shapely polygon object
         tiny_increment_value: Small increment value
+        max_side: Side length at which the sweep stops early (default: no limit)
+        ray_index: Optional edge index of the polygon; the sweep height is then
+            computed from the nearby edges and rounded down to whole steps
+            instead of stepping the line
+        start_side: Height below which the moved line is known to stay inside
+            the polygon (see ``feasible_start``); stepping resumes from there
         
     Returns:
         Tuple of (side_length, angle, point1, point2)
     """
     angle = azimuth(point1, point2)
+    if ray_index is not None:
+        height = ray_index.sweep_heights(point1[None], point2[None])[0]
+        return min(np.floor(height / tiny_increment_value) * tiny_increment_value, max_side), angle + (np.pi/2), point1, point2
     line = LineString([point1, point2])
     inc = increment(angle + np.pi/2, tiny_increment_value)
     extends = 0
+    if start_side > 0:
+        extends = int(start_side / tiny_increment_value)
+        line = transform(line, lambda x: x + inc * extends)
     
     # Linearly transform line until it intersects an exterior side of the polygon
-    while polygon.contains(line):
+    while (extends - 1) * tiny_increment_value < max_side and polygon.contains(line):
         line = transform(line, lambda x: x + inc)
         extends += 1
     
-    side = (extends - 1) * tiny_increment_value
+    side = min((extends - 1) * tiny_increment_value, max_side)
     return side, angle + (np.pi/2), point1, point2
 
 
-def find_max_rectangle_general(polygon_coords: list, point_gap: float = 0.026) -> tuple:
+def sweep_row(point1: np.ndarray, points2: np.ndarray, polygon: Polygon, ray_index: PolygonRayIndex,
+              tiny_increment_value: float, min_length: float = 0.0, min_area: float = 0.0,
+              mirror_safe: bool = False) -> np.ndarray:
+    """
+    Sweep every base from one point at once with an edge index.
+    
+    Args:
+        point1: First point
+        points2: Candidate second points, shape (N, 2)
+        polygon: Shapely polygon object (prepared for faster containment tests)
+        ray_index: Edge index of the polygon
+        tiny_increment_value: Small increment value; sides are whole multiples of it
+        min_length: Bases of at most this length are skipped
+        min_area: Bases that cannot carry a larger rectangle are skipped
+        mirror_safe: Count heights a rounding error short of a whole step as
+            reaching it, so a base and its mirror image get the same side
+        
+    Returns:
+        Array of side lengths, NaN where the base is skipped or not inside the polygon
+    """
+    sides = np.full(len(points2), np.nan)
+    lengths = np.hypot(points2[:, 0] - point1[0], points2[:, 1] - point1[1])
+    todo = np.flatnonzero(lengths > min_length)
+    heights = ray_index.sweep_heights(np.broadcast_to(point1, (len(todo), 2)), points2[todo], min_area)
+    # Bases that cannot beat min_area are skipped before the containment test
+    winning = heights * lengths[todo] > min_area
+    todo, heights = todo[winning], heights[winning]
+    starts = np.broadcast_to(point1, (len(todo), 2))
+    inside = shapely.contains(polygon, shapely.linestrings(np.stack((starts, points2[todo]), axis=1)))
+    steps = np.floor(heights[inside] / tiny_increment_value + (1e-9 if mirror_safe else 0.0))
+    sides[todo[inside]] = steps * tiny_increment_value
+    return sides
+
+
+def find_max_rectangle_general(polygon_coords: list, point_gap: float = 0.026,
+                               simplify_tolerance: float = None,
+                               constraints: RectangleConstraints = None, symmetry: bool = False,
+                               ray_index=None, samples: np.ndarray = None, distance_field=None) -> tuple:
     """
     Find the maximum inscribed rectangle in an arbitrary polygon.
     
     Args:
         polygon_coords: List of (x, y) coordinates defining the polygon
         point_gap: Distance between sampled points (default: 0.026)
+        simplify_tolerance: Optional tolerance for simplifying the polygon inward
+            before sampling (see ``simplify_inward``)
+        constraints: Optional limits on side lengths, aspect ratio and orientation;
+            pairs that cannot meet them are skipped and sweeps stop at the
+            longest allowed side
+        symmetry: Detect mirror and rotational symmetries of the polygon and
+            skip base pairs that a symmetry maps onto others (see ``sample_orbits``);
+            ignored with an orientation constraint
+        ray_index: Optional ``PolygonRayIndex`` of the polygon, or True to build
+            one; sweeps then only test edges near the base
+        samples: Optional boundary samples in the layout of ``split_into_points``
+            with the same point gap, e.g. from ``SharedBoundary.samples``
+        distance_field: Optional ``DistanceField`` of the polygon, or True to
+            build one with a cell of one point gap; bases whose chord leaves
+            the polygon or whose height bound cannot beat the best area are
+            skipped without a containment test, and sweeps start from checked
+            height guesses (ignored when a ray index is given)
         
     Returns:
         Tuple of (side_length, angle, point1, point2) defining the rectangle
+        
+    Raises:
+        ValueError: If no rectangle (meeting the constraints) is found, or if
+            samples are combined with simplification
     """
+    if samples is not None and simplify_tolerance:
+        raise ValueError("Given samples cannot be combined with simplification")
     polygon = Polygon(polygon_coords)
+    if simplify_tolerance:
+        polygon, _ = simplify_inward(polygon, simplify_tolerance)
     tiny_increment_value = tiny_increment(polygon, point_gap)
+    ray_index = PolygonRayIndex(polygon) if ray_index is True else ray_index or None
+    if ray_index is not None:
+        shapely.prepare(polygon)
+    # The edge index already bounds sweeps exactly, so a distance field is only used without it
+    field = None if ray_index is not None else \
+        DistanceField(polygon, point_gap) if distance_field is True else distance_field or None
     area = 0.00001
-    edge = split_into_points(polygon, point_gap)
+    # Mirrored and rotated bases change direction, so an orientation window turns symmetry off
+    oriented = constraints is not None and constraints.orientation is not None
+    symmetries = detect_symmetries(list(polygon.exterior.coords)) if symmetry and not oriented else []
+    mirror_safe = bool(symmetries)
+    if symmetries:
+        # Stepped sweeps along boundary edges depend on rounding that differs between mirror images
+        if ray_index is None:
+            ray_index, field = PolygonRayIndex(polygon), None
+            shapely.prepare(polygon)
+        # Chords that only leave the polygon by rounding are contained in this slightly larger one
+        loose = polygon.buffer(1e-9 * min_extension(polygon), join_style='mitre')
+    edge = split_into_points(polygon, point_gap) if samples is None else np.asarray(samples, dtype=float)
+    orbits = sample_orbits(edge, symmetries) if symmetries else None
     extension_length = min_extension(polygon)
+    ceilings = guesses = normals = None
+    shortest, longest = 0.0, np.inf
+    final = None
     
-    for point1 in edge:
-        for point2 in edge:
+    for index, point1 in enumerate(edge):
+        # Skip pairs whose length or direction can never meet the constraints
+        mask = None if constraints is None else pair_mask(point1, edge, constraints)
+        if symmetries:
+            # Skip pairs that a symmetry maps onto a pair evaluated elsewhere
+            canonical = canonical_pair_mask(index, orbits, ordered=True)
+            mask = canonical if mask is None else mask & canonical
+        others = np.arange(len(edge)) if mask is None else np.flatnonzero(mask)
+        candidates = edge[others]
+        # With an index the row is swept in one batch; bases too short to win are skipped up front
+        sides = None if ray_index is None else sweep_row(point1, candidates, polygon, ray_index,
+                                                         tiny_increment_value, area / extension_length, area,
+                                                         mirror_safe)
+        retry = None
+        if symmetries:
+            # Long enough bases that failed only the containment test, and only by rounding
+            lengths = np.hypot(candidates[:, 0] - point1[0], candidates[:, 1] - point1[1])
+            suspect = np.flatnonzero(np.isnan(sides) & (lengths > area / extension_length))
+            chords = shapely.linestrings(np.stack((np.broadcast_to(point1, (len(suspect), 2)), candidates[suspect]),
+                                                  axis=1))
+            retry = np.zeros(len(candidates), dtype=bool)
+            retry[suspect] = ~shapely.contains(polygon, chords) & shapely.contains(loose, chords)
+        if field is not None:
+            field.bases += len(candidates)
+            # Upper bounds on every base's area from the distance field; a chord leaving the polygon bounds it by 0
+            offsets = candidates - point1
+            lengths = np.hypot(offsets[:, 0], offsets[:, 1])
+            normals = np.stack((-offsets[:, 1], offsets[:, 0]), axis=1) / np.where(lengths > 0, lengths, 1.0)[:, None]
+            heights, guesses = field.height_limits(point1, candidates, normals, extension_length)
+            ceilings = np.where(field.chord_leaves(point1, candidates), 0.0, heights * lengths)
+        for position, point2 in enumerate(candidates):
             if np.any(point1 != point2):
-                if polygon.contains(LineString((point1, point2))):  # Check if points are eligible
-                    distance = math.dist(point1, point2)
-                    if distance > area / extension_length:
-                        discovery = extend_perpendicular(point1, point2, polygon, tiny_increment_value)
+                if ceilings is not None and ceilings[position] <= area:
+                    field.rejected += 1
+                    continue
+                base1, base2 = point1, point2
+                side = None if sides is None else sides[position]
+                eligible = polygon.contains(LineString((point1, point2))) if sides is None else not np.isnan(side)
+                if retry is not None and retry[position]:
+                    # A sample rounded just outside the polygon fails the pair; a congruent image may still pass
+                    for first, second in orbit_pairs(index, others[position], orbits, ordered=True):
+                        if constraints is not None and not pair_mask(edge[first], edge[second][None], constraints)[0]:
+                            continue
+                        side = sweep_row(edge[first], edge[second][None], polygon, ray_index,
+                                         tiny_increment_value, area / extension_length, area, mirror_safe)[0]
+                        eligible = not np.isnan(side)
+                        if eligible:
+                            base1, base2 = edge[first], edge[second]
+                            break
+                if eligible:  # Check if points are eligible
+                    distance = math.dist(base1, base2)
+                    if constraints is not None:
+                        shortest, longest = side_range(distance, constraints)
+                    if distance > area / min(extension_length, longest):
+                        if sides is None:
+                            start = 0.0 if field is None or base1 is not point1 or \
+                                guesses[position] <= tiny_increment_value else \
+                                field.feasible_start(polygon, point1, point2, normals[position],
+                                                     min(guesses[position], longest))
+                            discovery = extend_perpendicular(base1, base2, polygon, tiny_increment_value, longest,
+                                                             start_side=start)
+                        else:
+                            discovery = (min(side, longest), azimuth(base1, base2) + (np.pi/2), base1, base2)
                         area_found = discovery[0] * distance
-                        if area_found > area:
+                        if area_found > area and discovery[0] >= shortest:
                             area = area_found
                             final = discovery
     
+    if final is None:
+        raise ValueError("No rectangle found")
     return final
 
 
@@ -0,0 +1,303 @@
+"""
+Incremental solver for re-finding the maximum rectangle after small polygon edits.
+"""
+
+import math
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from typing import List, Optional, Tuple
+from ..core.geometry_utils import azimuth, increment
+from ..core.polygon_processor import tiny_increment, sweep_heights
+
+# Sample slots are compacted once more than this share of them belongs to removed edges
+_DEAD_FRACTION = 0.5
+
+
+def _edge_samples(vertex1: np.ndarray, vertex2: np.ndarray, point_gap: float) -> np.ndarray:
+    """
+    Sample one polygon edge the same way as ``split_into_points``.
+
+    The start vertex is included and the end vertex is left to the next edge.
+
+    Args:
+        vertex1: Start vertex of the edge
+        vertex2: End vertex of the edge
+        point_gap: Distance between consecutive points
+
+    Returns:
+        Array of points along the edge
+    """
+    line_point_number = int(math.dist(vertex1, vertex2) // point_gap)
+    diff = increment(azimuth(vertex1, vertex2), point_gap)
+    steps = np.concatenate(([vertex1], np.repeat([diff], line_point_number, axis=0)))
+    return np.cumsum(steps, axis=0)
+
+
+class IncrementalGeneralSolver:
+    """
+    Stateful version of ``find_max_rectangle_general`` for interactive editing.
+
+    The solver keeps the boundary samples of every edge, the eligibility of
+    every ordered sample pair, the sweep height of every eligible pair and the
+    current best rectangle. An edit only resamples the edges it changes and
+    only re-evaluates pairs whose base segment or swept rectangle touches the
+    region where the old and new polygons differ.
+
+    The sweep step is fixed when the solver is built, so heights stay
+    comparable across edits.
+    """
+
+    def __init__(self, polygon_coords: list, point_gap: float = 0.026):
+        """
+        Build the solver and evaluate every pair of the initial polygon.
+
+        Args:
+            polygon_coords: List of (x, y) coordinates defining the polygon
+            point_gap: Distance between sampled points (default: 0.026)
+        """
+        self.point_gap = point_gap
+        self._vertices = [np.array(vertex, dtype=float) for vertex in polygon_coords]
+        self._vertex_ids = list(range(len(self._vertices)))
+        self._next_vertex_id = len(self._vertices)
+        self.polygon = self._build_polygon(self._vertices)
+        self.tiny_increment_value = tiny_increment(self.polygon, point_gap)
+
+        self._points = np.empty((0, 2))
+        self._alive = np.empty(0, dtype=bool)
+        self._edge_slots = {}
+        self._pair_i = np.empty(0, dtype=np.int64)
+        self._pair_j = np.empty(0, dtype=np.int64)
+        self._eligible = np.empty(0, dtype=bool)
+        self._side = np.empty(0)
+        self.last_update = {}
+
+        self._add_edges(self._vertex_ids)
+        self._add_pairs(np.flatnonzero(self._alive))
+        self.last_update = {'new_pairs': len(self._pair_i), 'rechecked_pairs': 0, 'recomputed_heights': 0}
+
+    @property
+    def vertices(self) -> List[Tuple[float, float]]:
+        """Current polygon vertices as (x, y) tuples."""
+        return [tuple(vertex) for vertex in self._vertices]
+
+    def best(self) -> Optional[tuple]:
+        """
+        Return the best rectangle found so far.
+
+        Returns:
+            Tuple of (side_length, angle, point1, point2) in the same convention as
+            ``find_max_rectangle_general``, or None if no rectangle was found
+        """
+        if len(self._pair_i) == 0:
+            return None
+        points1 = self._points[self._pair_i]
+        points2 = self._points[self._pair_j]
+        lengths = np.hypot(*(points2 - points1).T)
+        areas = np.where(self._eligible, self._side * lengths, 0.0)
+        index = int(np.argmax(areas))
+        if areas[index] <= 0.00001:
+            return None
+        point1, point2 = points1[index], points2[index]
+        return self._side[index], azimuth(point1, point2) + (np.pi/2), point1, point2
+
+    def move_vertex(self, index: int, point: Tuple[float, float]) -> Optional[tuple]:
+        """
+        Move a vertex and update the solution.
+
+        Args:
+            index: Position of the vertex in the ring
+            point: New (x, y) location of the vertex
+
+        Returns:
+            The new best rectangle (see ``best``)
+        """
+        vertices = list(self._vertices)
+        vertices[index] = np.array(point, dtype=float)
+        previous = self._vertex_ids[index - 1]
+        return self._apply(vertices, list(self._vertex_ids), [previous, self._vertex_ids[index]], [])
+
+    def insert_vertex(self, index: int, point: Tuple[float, float]) -> Optional[tuple]:
+        """
+        Insert a new vertex before position ``index`` and update the solution.
+
+        Args:
+            index: Position the new vertex will take in the ring
+            point: (x, y) location of the new vertex
+
+        Returns:
+            The new best rectangle (see ``best``)
+        """
+        vertices = list(self._vertices)
+        vertex_ids = list(self._vertex_ids)
+        new_id = self._next_vertex_id
+        previous = vertex_ids[index - 1]
+        vertices.insert(index, np.array(point, dtype=float))
+        vertex_ids.insert(index, new_id)
+        result = self._apply(vertices, vertex_ids, [previous, new_id], [])
+        self._next_vertex_id += 1
+        return result
+
+    def delete_vertex(self, index: int) -> Optional[tuple]:
+        """
+        Delete a vertex and update the solution.
+
+        Args:
+            index: Position of the vertex in the ring
+
+        Returns:
+            The new best rectangle (see ``best``)
+        """
+        if len(self._vertices) <= 3:
+            raise ValueError("A polygon needs at least 3 vertices")
+        vertices = list(self._vertices)
+        vertex_ids = list(self._vertex_ids)
+        removed = vertex_ids[index]
+        previous = vertex_ids[index - 1]
+        del vertices[index]
+        del vertex_ids[index]
+        return self._apply(vertices, vertex_ids, [previous], [removed])
+
+    @staticmethod
+    def _build_polygon(vertices: List[np.ndarray]) -> Polygon:
+        """Build and validate a polygon from a list of vertices."""
+        polygon = Polygon(vertices)
+        if not polygon.is_valid:
+            raise ValueError("Edit would make the polygon invalid")
+        shapely.prepare(polygon)
+        return polygon
+
+    def _apply(self, vertices: list, vertex_ids: list, changed_edges: list, removed_edges: list) -> Optional[tuple]:
+        """Replace the polygon and re-evaluate only the work touched by the edit."""
+        polygon = self._build_polygon(vertices)
+        dirty = self.polygon.symmetric_difference(polygon)
+        self._vertices = vertices
+        self._vertex_ids = vertex_ids
+        self.polygon = polygon
+
+        # Forget the samples of every edge whose end points changed
+        removed_slots = [self._edge_slots.pop(edge_id) for edge_id in changed_edges + removed_edges
+                         if edge_id in self._edge_slots]
+        if removed_slots:
+            removed_slots = np.concatenate(removed_slots)
+            self._alive[removed_slots] = False
+            keep = self._alive[self._pair_i] & self._alive[self._pair_j]
+            self._pair_i = self._pair_i[keep]
+            self._pair_j = self._pair_j[keep]
+            self._eligible = self._eligible[keep]
+            self._side = self._side[keep]
+
+        rechecked, recomputed = self._recheck_pairs(dirty)
+        new_slots = self._add_edges(changed_edges)
+        pair_count = len(self._pair_i)
+        self._add_pairs(new_slots)
+        if np.count_nonzero(~self._alive) > _DEAD_FRACTION * len(self._alive):
+            self._compact()
+        self.last_update = {
+            'new_pairs': len(self._pair_i) - pair_count,
+            'rechecked_pairs': rechecked,
+            'recomputed_heights': recomputed,
+        }
+        return self.best()
+
+    def _compact(self) -> None:
+        """Drop the slots of removed samples and renumber the pairs and edges that refer to the rest."""
+        slots = np.cumsum(self._alive) - 1
+        self._points = self._points[self._alive]
+        self._pair_i = slots[self._pair_i]
+        self._pair_j = slots[self._pair_j]
+        self._edge_slots = {edge_id: slots[edge_slots] for edge_id, edge_slots in self._edge_slots.items()}
+        self._alive = np.ones(len(self._points), dtype=bool)
+
+    def _add_edges(self, edge_ids: list) -> np.ndarray:
+        """Sample the given edges and return the slots of the new samples."""
+        positions = {vertex_id: i for i, vertex_id in enumerate(self._vertex_ids)}
+        new_slots = []
+        for edge_id in edge_ids:
+            i = positions[edge_id]
+            samples = _edge_samples(self._vertices[i], self._vertices[(i + 1) % len(self._vertices)], self.point_gap)
+            slots = np.arange(len(self._points), len(self._points) + len(samples))
+            self._points = np.concatenate((self._points, samples))
+            self._alive = np.concatenate((self._alive, np.ones(len(samples), dtype=bool)))
+            self._edge_slots[edge_id] = slots
+            new_slots.append(slots)
+        return np.concatenate(new_slots) if new_slots else np.empty(0, dtype=np.int64)
+
+    def _add_pairs(self, new_slots: np.ndarray) -> None:
+        """Evaluate every ordered pair that involves at least one new sample."""
+        if len(new_slots) == 0:
+            return
+        alive = np.flatnonzero(self._alive)
+        old = np.setdiff1d(alive, new_slots)
+        pair_i = np.concatenate((np.repeat(new_slots, len(alive)), np.repeat(old, len(new_slots))))
+        pair_j = np.concatenate((np.tile(alive, len(new_slots)), np.tile(new_slots, len(old))))
+        distinct = pair_i != pair_j
+        pair_i, pair_j = pair_i[distinct], pair_j[distinct]
+
+        eligible, side = self._evaluate(pair_i, pair_j)
+        self._pair_i = np.concatenate((self._pair_i, pair_i))
+        self._pair_j = np.concatenate((self._pair_j, pair_j))
+        self._eligible = np.concatenate((self._eligible, eligible))
+        self._side = np.concatenate((self._side, side))
+
+    def _evaluate(self, pair_i: np.ndarray, pair_j: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Check eligibility of the given pairs and compute heights of the eligible ones."""
+        points1 = self._points[pair_i]
+        points2 = self._points[pair_j]
+        eligible = np.zeros(len(pair_i), dtype=bool)
+        side = np.zeros(len(pair_i))
+        nondegenerate = np.any(points1 != points2, axis=1)
+        if np.any(nondegenerate):
+            lines = shapely.linestrings(np.stack((points1[nondegenerate], points2[nondegenerate]), axis=1))
+            eligible[nondegenerate] = shapely.contains(self.polygon, lines)
+        if np.any(eligible):
+            side[eligible] = self._heights(points1[eligible], points2[eligible])
+        return eligible, side
+
+    def _heights(self, points1: np.ndarray, points2: np.ndarray) -> np.ndarray:
+        """Sweep heights quantized to the sweep step of the general algorithm."""
+        coords = np.array(self._vertices)
+        heights = sweep_heights(points1, points2, coords)
+        return np.floor(heights / self.tiny_increment_value) * self.tiny_increment_value
+
+    def _recheck_pairs(self, dirty) -> Tuple[int, int]:
+        """Re-evaluate cached pairs whose result may depend on the changed region."""
+        if dirty.is_empty or len(self._pair_i) == 0:
+            return 0, 0
+        shapely.prepare(dirty)
+        min_x, min_y, max_x, max_y = dirty.bounds
+        points1 = self._points[self._pair_i]
+        points2 = self._points[self._pair_j]
+
+        # Segments touching the changed region may change eligibility
+        segment_lo = np.minimum(points1, points2)
+        segment_hi = np.maximum(points1, points2)
+        candidates = np.flatnonzero((segment_lo[:, 0] <= max_x) & (segment_hi[:, 0] >= min_x) &
+                                    (segment_lo[:, 1] <= max_y) & (segment_hi[:, 1] >= min_y))
+        if len(candidates):
+            lines = shapely.linestrings(np.stack((points1[candidates], points2[candidates]), axis=1))
+            candidates = candidates[shapely.intersects(dirty, lines)]
+        segment_changed = np.zeros(len(self._pair_i), dtype=bool)
+        segment_changed[candidates] = True
+
+        # Swept rectangles (including the blocking step) touching it may change height
+        base = points2 - points1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            normal = np.stack((-base[:, 1], base[:, 0]), axis=1) / np.hypot(*base.T)[:, None]
+        offset = normal * (self._side + self.tiny_increment_value)[:, None]
+        corners = np.stack((points1, points2, points2 + offset, points1 + offset), axis=1)
+        quad_lo = corners.min(axis=1)
+        quad_hi = corners.max(axis=1)
+        swept = np.flatnonzero(self._eligible & ~segment_changed &
+                               (quad_lo[:, 0] <= max_x) & (quad_hi[:, 0] >= min_x) &
+                               (quad_lo[:, 1] <= max_y) & (quad_hi[:, 1] >= min_y))
+        if len(swept):
+            swept = swept[shapely.intersects(dirty, shapely.polygons(corners[swept]))]
+
+        if len(candidates):
+            eligible, side = self._evaluate(self._pair_i[candidates], self._pair_j[candidates])
+            self._eligible[candidates] = eligible
+            self._side[candidates] = side
+        if len(swept):
+            self._side[swept] = self._heights(points1[swept], points2[swept])
+        return len(candidates), len(swept) + int(np.count_nonzero(self._eligible[candidates]))
@@ -0,0 +1,165 @@
+"""
+Top-k and non-overlapping extraction of several large rectangles from one polygon.
+
+All sample pairs are evaluated once, as in ``find_max_rectangle_general``, and
+their rectangles are kept in a priority queue ordered by area. For a greedy
+non-overlapping packing the queue is consumed lazily: a popped candidate is
+only re-checked against the rectangles placed since it was last checked, and
+only when its rectangle actually crosses one of them. Crossing candidates are
+cut back to the placed rectangle and pushed again with their smaller area, so
+later rectangles never require a fresh solve on ``polygon.difference(...)``.
+"""
+
+import heapq
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from typing import List, Tuple
+from ..core.geometry_utils import azimuth
+from ..core.polygon_processor import split_into_points, sweep_heights, tiny_increment
+from .general_algorithm import find_final_rectangle
+
+
+def evaluate_pairs(polygon: Polygon, samples: np.ndarray, tiny_increment_value: float,
+                   chunk_size: int = 65536) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find every eligible ordered sample pair and the sweep height of its rectangle.
+
+    Args:
+        polygon: Shapely polygon object
+        samples: Boundary samples, shape (N, 2)
+        tiny_increment_value: Sweep step; heights are rounded down to multiples of it
+        chunk_size: Number of pairs generated and checked against the polygon at once
+
+    Returns:
+        Tuple of (points1, points2, heights) for the eligible pairs
+    """
+    shapely.prepare(polygon)
+    count = len(samples)
+    coords = np.asarray(polygon.exterior.coords[:-1])
+    # Pairs are generated a block of rows at a time, never as an N x N mask
+    rows = max(1, chunk_size // max(count, 1))
+    points1, points2 = [], []
+    for start in range(0, count, rows):
+        pair_i = np.repeat(np.arange(start, min(start + rows, count)), count)
+        pair_j = np.tile(np.arange(count), len(pair_i) // max(count, 1))
+        distinct = (pair_i != pair_j) & np.any(samples[pair_i] != samples[pair_j], axis=1)
+        pair_i, pair_j = pair_i[distinct], pair_j[distinct]
+        lines = shapely.linestrings(np.stack((samples[pair_i], samples[pair_j]), axis=1))
+        eligible = shapely.contains(polygon, lines)
+        points1.append(samples[pair_i[eligible]])
+        points2.append(samples[pair_j[eligible]])
+
+    points1 = np.concatenate(points1) if points1 else np.empty((0, 2))
+    points2 = np.concatenate(points2) if points2 else np.empty((0, 2))
+    heights = sweep_heights(points1, points2, coords)
+    heights = np.floor(heights / tiny_increment_value) * tiny_increment_value
+    return points1, points2, heights
+
+
+def _distinct_samples(samples: np.ndarray, tolerance: float) -> np.ndarray:
+    """Drop samples lying within a tolerance of their predecessor on the ring, including the closing one."""
+    gaps = np.hypot(*(samples - np.roll(samples, 1, axis=0)).T)
+    keep = gaps > tolerance
+    keep[0] = True
+    return samples[keep]
+
+
+def _same_corners(corners1: np.ndarray, corners2: np.ndarray, tolerance: float) -> bool:
+    """Whether every corner of one rectangle lies within a tolerance of a corner of the other."""
+    distances = np.hypot(*(corners1[:, None, :] - corners2[None, :, :]).transpose(2, 0, 1))
+    return bool(np.all(distances.min(axis=1) <= tolerance) and np.all(distances.min(axis=0) <= tolerance))
+
+
+def _rectangle(point1: np.ndarray, point2: np.ndarray, height: float) -> Polygon:
+    """Rectangle swept a given height to the left of the base point1 -> point2."""
+    base = point2 - point1
+    offset = np.array([-base[1], base[0]]) / np.hypot(*base) * height
+    return Polygon([point1, point2, point2 + offset, point1 + offset])
+
+
+def _blocking_height(point1: np.ndarray, point2: np.ndarray, height: float, placed: Polygon) -> float:
+    """
+    Height at which a rectangle swept from a base first meets a placed rectangle.
+
+    Args:
+        point1: First base point
+        point2: Second base point
+        height: Current height of the candidate rectangle
+        placed: Rectangle already placed
+
+    Returns:
+        The candidate height if the two rectangles do not overlap, otherwise
+        the distance from the base to the lowest overlapping point
+    """
+    candidate = _rectangle(point1, point2, height)
+    overlap = candidate.intersection(placed)
+    # Rectangles sharing a side may overlap by rounding only
+    if overlap.area <= 1e-9 * max(candidate.area, placed.area):
+        return height
+    base = point2 - point1
+    normal = np.array([-base[1], base[0]]) / np.hypot(*base)
+    return float(np.min((np.asarray(overlap.exterior.coords) - point1) @ normal))
+
+
+def find_top_k_rectangles(polygon_coords: list, k: int, non_overlapping: bool = True,
+                          point_gap: float = 0.026) -> List[tuple]:
+    """
+    Find the k largest inscribed rectangles, or a greedy packing of k non-overlapping ones.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        k: Number of rectangles to return
+        non_overlapping: If True, each rectangle is the largest one that does
+            not overlap the rectangles already chosen; if False, the k largest
+            candidate rectangles are returned even if they overlap
+        point_gap: Distance between sampled points (default: 0.026)
+
+    Returns:
+        List of up to k tuples of (side_length, angle, point1, point2), largest
+        first, in the same convention as ``find_max_rectangle_general``
+    """
+    polygon = Polygon(polygon_coords)
+    tiny_increment_value = tiny_increment(polygon, point_gap)
+    samples = _distinct_samples(split_into_points(polygon, point_gap), tiny_increment_value)
+    points1, points2, heights = evaluate_pairs(polygon, samples, tiny_increment_value)
+    lengths = np.hypot(*(points2 - points1).T)
+    areas = heights * lengths
+
+    def result(index: int, height: float) -> tuple:
+        point1, point2 = points1[index], points2[index]
+        return height, azimuth(point1, point2) + (np.pi/2), point1, point2
+
+    if not non_overlapping:
+        chosen, corners = [], []
+        for index in np.argsort(-areas, kind='stable'):
+            if len(chosen) == k or areas[index] <= 0.00001:
+                break
+            # The same rectangle is reached from several bases; keep it once
+            rectangle = np.asarray(find_final_rectangle(*result(index, heights[index])))
+            if any(_same_corners(rectangle, other, tiny_increment_value) for other in corners):
+                continue
+            chosen.append(result(index, heights[index]))
+            corners.append(rectangle)
+        return chosen
+
+    # Heap entries: (-area, pair index, height, number of placed rectangles already checked)
+    heap = [(-area, index, height, 0) for index, (area, height) in enumerate(zip(areas, heights)) if area > 0.00001]
+    heapq.heapify(heap)
+    placed = []
+    chosen = []
+    while heap and len(chosen) < k:
+        negative_area, index, height, checked = heapq.heappop(heap)
+        if checked < len(placed):
+            for rectangle in placed[checked:]:
+                height = min(height, _blocking_height(points1[index], points2[index], height, rectangle))
+            height = np.floor(height / tiny_increment_value) * tiny_increment_value
+            area = height * lengths[index]
+            if area > 0.00001:
+                heapq.heappush(heap, (-area, index, height, len(placed)))
+            continue
+
+        # Heights only shrink, so an up-to-date entry on top is the best remaining rectangle
+        chosen.append(result(index, height))
+        placed.append(_rectangle(points1[index], points2[index], height))
+    return chosen
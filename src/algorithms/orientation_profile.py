@@ -0,0 +1,179 @@
+"""
+Best rectangle area as a function of orientation, computed once per polygon.
+
+A rectangle and its quarter turn are the same shape, so orientations are
+taken modulo pi/2. The profile solves ``find_max_rectangle_at_angle`` on an
+angular grid merged with the polygon's critical angles (edge directions and
+the minimum rotated rectangle, see ``orientation_candidates``). Every stored
+value is exact at its angle. A segment tree over the sorted angles then
+answers "best rectangle within +-tolerance of angle" in logarithmic time.
+Between grid angles the profile is only sampled, so a query is exact up to
+the grid resolution.
+"""
+
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from shapely.geometry import Polygon
+from typing import List, NamedTuple, Sequence
+from ..core.geometry_utils import sort_rectangle_coords
+from .engines import orientation_candidates
+from .fixed_orientation import find_max_rectangle_at_angle
+from .general_algorithm import find_final_rectangle
+
+_QUARTER = np.pi / 2
+
+
+class OrientationMatch(NamedTuple):
+    """Best sampled rectangle of an orientation range."""
+    area: float
+    angle: float
+    corners: np.ndarray
+
+
+def _solve_angles(polygon_coords: list, holes: Sequence[list], angles: Sequence[float]) -> List[tuple]:
+    """Solve exactly at every angle and return (area, corners) pairs (worker entry point)."""
+    solved = []
+    for angle in angles:
+        try:
+            side, rectangle_angle, point1, point2 = find_max_rectangle_at_angle(polygon_coords, angle, holes)
+        except ValueError:
+            solved.append((0.0, np.full((4, 2), np.nan)))
+            continue
+        corners = sort_rectangle_coords(list(find_final_rectangle(side, rectangle_angle, point1, point2)))
+        solved.append((side * math.dist(point1, point2), np.asarray(corners, dtype=float)))
+    return solved
+
+
+class RectangleOrientationProfile:
+    """Largest rectangle for every orientation on a grid, with range-maximum queries over angle."""
+
+    def __init__(self, polygon_coords: list, holes: Sequence[list] = None, resolution: float = np.pi / 360,
+                 jobs: int = 1):
+        """
+        Args:
+            polygon_coords: List of (x, y) coordinates defining the polygon
+            holes: Optional list of interior rings, each a list of (x, y) coordinates
+            resolution: Spacing of the angular grid in radians
+            jobs: Number of worker processes solving the angles (1 solves in this process)
+        """
+        polygon = Polygon(polygon_coords, holes)
+        grid = np.arange(0.0, _QUARTER, resolution)
+        angles = np.unique(np.concatenate((grid, orientation_candidates(polygon))))
+        coords = list(polygon.exterior.coords[:-1])
+        rings = [list(ring.coords[:-1]) for ring in polygon.interiors] or None
+
+        if jobs <= 1:
+            solved = _solve_angles(coords, rings, angles)
+        else:
+            chunks = np.array_split(angles, min(jobs * 4, len(angles)))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                solved = [pair for part in executor.map(_solve_angles, [coords] * len(chunks),
+                                                         [rings] * len(chunks), chunks) for pair in part]
+
+        self.resolution = float(resolution)
+        self.angles = angles
+        self.areas = np.array([area for area, _ in solved], dtype=float)
+        self.corners = np.array([corners for _, corners in solved], dtype=float).reshape(len(angles), 4, 2)
+        self._build_tree()
+
+    def _build_tree(self) -> None:
+        """Build the segment tree of arg-maxima over the sorted angles."""
+        size = 1 << max(len(self.angles) - 1, 0).bit_length()
+        values = np.concatenate((self.areas, [-np.inf]))
+        tree = np.full(2 * size, len(self.areas), dtype=int)
+        tree[size:size + len(self.areas)] = np.arange(len(self.areas))
+        for node in range(size - 1, 0, -1):
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = left if values[left] >= values[right] else right
+        self._size, self._values, self._tree = size, values, tree
+
+    def _range_argmax(self, start: int, stop: int) -> int:
+        """Index of the largest area among angles[start:stop] (len(angles) if the range is empty)."""
+        best = len(self.areas)
+        start, stop = start + self._size, stop + self._size
+        while start < stop:
+            for node in ((start,) if start & 1 else ()) + ((stop - 1,) if stop & 1 else ()):
+                if self._values[self._tree[node]] > self._values[best]:
+                    best = self._tree[node]
+            start, stop = (start + 1) >> 1, stop >> 1
+        return best
+
+    def __len__(self) -> int:
+        return len(self.angles)
+
+    def best_within(self, angle: float, tolerance: float) -> OrientationMatch:
+        """
+        Find the best sampled rectangle within +-tolerance of an orientation.
+
+        Args:
+            angle: Orientation in radians (taken modulo pi/2)
+            tolerance: Allowed deviation in radians
+
+        Returns:
+            OrientationMatch, or None if no sampled angle lies in the range
+        """
+        if 2 * tolerance >= _QUARTER:
+            ranges = [(0.0, _QUARTER)]
+        else:
+            low = float(np.mod(angle, _QUARTER)) - tolerance
+            high = low + 2 * tolerance
+            if low < 0:
+                ranges = [(low + _QUARTER, _QUARTER), (0.0, high)]
+            elif high >= _QUARTER:
+                ranges = [(low, _QUARTER), (0.0, high - _QUARTER)]
+            else:
+                ranges = [(low, high)]
+
+        best = len(self.areas)
+        slack = 1e-12
+        for low, high in ranges:
+            index = self._range_argmax(int(np.searchsorted(self.angles, low - slack, side='left')),
+                                       int(np.searchsorted(self.angles, high + slack, side='right')))
+            if self._values[index] > self._values[best]:
+                best = index
+        if best == len(self.areas):
+            return None
+        return OrientationMatch(float(self.areas[best]), float(self.angles[best]), self.corners[best])
+
+    def best(self) -> OrientationMatch:
+        """Best sampled rectangle over all orientations."""
+        return self.best_within(0.0, _QUARTER)
+
+    def save(self, path: str) -> None:
+        """
+        Write the profile to a NumPy ``.npz`` file, e.g. next to the polygon it describes.
+
+        Args:
+            path: Output file path
+        """
+        with open(path, 'wb') as fh:
+            np.savez(fh, angles=self.angles, areas=self.areas, corners=self.corners,
+                     resolution=self.resolution)
+
+    @classmethod
+    def load(cls, path: str) -> 'RectangleOrientationProfile':
+        """
+        Read a profile written by ``save``.
+
+        Args:
+            path: File written by ``save``
+
+        Returns:
+            RectangleOrientationProfile
+        """
+        with np.load(path) as data:
+            profile = cls.__new__(cls)
+            profile.angles = data['angles']
+            profile.areas = data['areas']
+            profile.corners = data['corners']
+            profile.resolution = float(data['resolution'])
+        profile._build_tree()
+        return profile
+
+    def __getstate__(self) -> dict:
+        return {'angles': self.angles, 'areas': self.areas, 'corners': self.corners, 'resolution': self.resolution}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._build_tree()
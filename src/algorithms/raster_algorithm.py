@@ -0,0 +1,163 @@
+"""
+Largest interior rectangle directly on boolean raster masks.
+
+The axis-aligned search is the classic maximal-rectangle dynamic programme:
+for every column it keeps the height of the run of True pixels ending at the
+current row and the widest left/right extent that run can have. Run
+boundaries are computed for a whole strip of rows at once with
+``maximum.accumulate``/``minimum.accumulate``, and only one row of state is
+carried between strips, so the mask can be a memory map of any size and
+memory stays at O(tile_rows * W). The total work is O(H * W).
+
+The rotated variant resamples the mask on a rotated pixel grid, strip by strip,
+and runs the same search on it. A rotated pixel is kept only when all four of
+its corners fall on True pixels, so rotated answers are within about one
+pixel of exact.
+
+Pixel (row, col) covers [col, col + 1] x [row, row + 1] in pixel coordinates.
+An affine transform (a, b, c, d, e, f), as used by GDAL and rasterio, maps
+pixel coordinates to world coordinates: x = a*col + b*row + c and
+y = d*col + e*row + f.
+"""
+
+import numpy as np
+from typing import Sequence, Tuple
+from ..core.geometry_utils import azimuth
+
+IDENTITY = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+
+
+def largest_rectangle_in_mask(mask, tile_rows: int = 1024) -> Tuple[int, int, int, int]:
+    """
+    Find the largest axis-aligned rectangle of True pixels.
+
+    Args:
+        mask: 2D boolean array, or any object with a ``shape`` and row slicing
+            (for example a ``np.memmap``)
+        tile_rows: Number of rows loaded at a time
+
+    Returns:
+        Tuple of (row0, col0, row1, col1), half-open pixel bounds of the rectangle
+
+    Raises:
+        ValueError: If the mask has no True pixel
+    """
+    rows, columns = mask.shape
+    indices = np.arange(columns)
+    height = np.zeros(columns, dtype=np.int64)
+    left = np.zeros(columns, dtype=np.int64)
+    right = np.full(columns, columns, dtype=np.int64)
+    best_area, best = 0, None
+
+    for start in range(0, rows, tile_rows):
+        block = np.asarray(mask[start:start + tile_rows], dtype=bool)
+        # First column of the run containing each pixel, and one past its last column
+        run_left = np.maximum.accumulate(np.where(block, 0, indices + 1), axis=1)
+        run_right = np.minimum.accumulate(np.where(block, columns, indices)[:, ::-1], axis=1)[:, ::-1]
+        for offset, row in enumerate(block):
+            height = np.where(row, height + 1, 0)
+            left = np.where(row, np.maximum(left, run_left[offset]), 0)
+            right = np.where(row, np.minimum(right, run_right[offset]), columns)
+            areas = (right - left) * height
+            column = int(np.argmax(areas))
+            if areas[column] > best_area:
+                best_area = int(areas[column])
+                bottom = start + offset + 1
+                best = (bottom - int(height[column]), int(left[column]), bottom, int(right[column]))
+
+    if best is None:
+        raise ValueError("Mask has no True pixel")
+    return best
+
+
+class _RotatedMask:
+    """Lazy view of a mask resampled on a pixel grid rotated by ``angle``."""
+
+    def __init__(self, mask, angle: float):
+        self.mask = mask
+        self.cos, self.sin = np.cos(angle), np.sin(angle)
+        rows, columns = mask.shape
+        corners = np.array([[0, 0], [columns, 0], [columns, rows], [0, rows]], dtype=float)
+        # Rotated-grid coordinates (u, v) of the mask corners
+        u = corners[:, 0] * self.cos + corners[:, 1] * self.sin
+        v = -corners[:, 0] * self.sin + corners[:, 1] * self.cos
+        self.origin = np.array([u.min(), v.min()])
+        self.shape = (int(np.ceil(v.max() - v.min())), int(np.ceil(u.max() - u.min())))
+
+    def to_pixels(self, u: np.ndarray, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert rotated-grid coordinates to source pixel coordinates (col, row)."""
+        u = u + self.origin[0]
+        v = v + self.origin[1]
+        return u * self.cos - v * self.sin, u * self.sin + v * self.cos
+
+    def __getitem__(self, rows: slice) -> np.ndarray:
+        start, stop, _ = rows.indices(self.shape[0])
+        # Sample the source at the corner lattice of the requested rotated rows
+        v, u = np.mgrid[start:stop + 1, 0:self.shape[1] + 1].astype(float)
+        col, row = self.to_pixels(u, v)
+        rows, columns = self.mask.shape
+        inside = (col >= 0) & (col <= columns) & (row >= 0) & (row <= rows)
+        col = np.floor(np.clip(col, 0, columns - 0.5)).astype(np.int64)
+        row = np.floor(np.clip(row, 0, rows - 0.5)).astype(np.int64)
+        # Point sampling keeps memory-mapped masks from loading whole row ranges
+        corners = np.asarray(self.mask[row, col], dtype=bool) & inside
+        return corners[:-1, :-1] & corners[1:, :-1] & corners[:-1, 1:] & corners[1:, 1:]
+
+
+def _to_world(transform: Sequence[float], col: np.ndarray, row: np.ndarray) -> np.ndarray:
+    """Apply an affine pixel-to-world transform."""
+    a, b, c, d, e, f = transform[:6]
+    return np.array([a * col + b * row + c, d * col + e * row + f], dtype=float)
+
+
+def find_max_rectangle_raster(mask, transform: Sequence[float] = None, angles: Sequence[float] = None,
+                              tile_rows: int = 1024) -> tuple:
+    """
+    Find the largest rectangle inside a boolean mask, in world coordinates.
+
+    Args:
+        mask: 2D boolean array (or row-sliceable object such as a memory map)
+            where True marks the inside of the shape
+        transform: Affine pixel-to-world transform (a, b, c, d, e, f)
+            (default: pixel coordinates)
+        angles: Optional rectangle orientations to try, in radians relative to
+            the pixel grid; 0 uses the exact axis-aligned search, other angles
+            resample the mask (default: axis-aligned only)
+        tile_rows: Number of mask rows processed at a time
+
+    Returns:
+        Tuple of (side_length, angle, point1, point2) in world coordinates, in
+        the same convention as ``find_max_rectangle_general``
+
+    Raises:
+        ValueError: If no rectangle is found
+    """
+    transform = IDENTITY if transform is None else tuple(transform)
+    best_area, best_corners = 0.0, None
+    for angle in (angles if angles is not None else [0.0]):
+        if angle == 0:
+            row0, col0, row1, col1 = largest_rectangle_in_mask(mask, tile_rows)
+            corners_col = np.array([col0, col1, col0], dtype=float)
+            corners_row = np.array([row0, row0, row1], dtype=float)
+        else:
+            rotated = _RotatedMask(mask, angle)
+            try:
+                row0, col0, row1, col1 = largest_rectangle_in_mask(rotated, tile_rows)
+            except ValueError:
+                continue
+            corners_col, corners_row = rotated.to_pixels(np.array([col0, col1, col0], dtype=float),
+                                                          np.array([row0, row0, row1], dtype=float))
+        area = float((row1 - row0) * (col1 - col0))
+        if area > best_area:
+            best_area = area
+            best_corners = _to_world(transform, corners_col, corners_row).T
+
+    if best_corners is None:
+        raise ValueError("No rectangle found")
+    point1, point2, point3 = best_corners
+    # Order the base so the rectangle extends to its left, as in the polygon engines
+    base, side_vector = point2 - point1, point3 - point1
+    if base[0] * side_vector[1] - base[1] * side_vector[0] < 0:
+        point1, point2 = point2, point1
+    side = float(np.hypot(*side_vector))
+    return side, azimuth(point1, point2) + (np.pi/2), point1, point2
@@ -0,0 +1,103 @@
+"""
+Continuous refinement of a sampled rectangle beyond the point-gap grid.
+
+The sampling engines lock the base of the rectangle to boundary samples and
+(in the general engine) its height to multiples of ``tiny_increment``. For a
+fixed orientation, ``find_max_rectangle_at_angle`` finds the exact best centre,
+width and height with the polygon as a hard constraint, so the only
+continuous variable left is the angle. Refinement therefore solves exactly
+at the candidate's own orientation and then runs a golden-section search on
+the angle in a bracket around it. The bracket is the angular resolution of
+the sample grid. Every evaluation is exact, so the refined area is never
+below the candidate's area.
+"""
+
+import math
+import time
+import numpy as np
+from shapely.geometry import Polygon
+from typing import NamedTuple, Sequence, Tuple
+from ..core.geometry_utils import azimuth
+from .fixed_orientation import find_max_rectangle_at_angle
+
+_GOLDEN = (math.sqrt(5) - 1) / 2
+
+
+def golden_section_search(function, low: float, high: float, tolerance: float) -> float:
+    """Maximize a function on [low, high] by golden-section search and return the best argument."""
+    inner_low = high - _GOLDEN * (high - low)
+    inner_high = low + _GOLDEN * (high - low)
+    value_low, value_high = function(inner_low), function(inner_high)
+    while high - low > tolerance:
+        if value_low >= value_high:
+            high, inner_high, value_high = inner_high, inner_low, value_low
+            inner_low = high - _GOLDEN * (high - low)
+            value_low = function(inner_low)
+        else:
+            low, inner_low, value_low = inner_low, inner_high, value_high
+            inner_high = low + _GOLDEN * (high - low)
+            value_high = function(inner_high)
+    return inner_low if value_low >= value_high else inner_high
+
+
+class RefinementReport(NamedTuple):
+    """How much the refinement stage improved a rectangle."""
+    initial_area: float
+    refined_area: float
+    gain: float
+    relative_gain: float
+    initial_angle: float
+    refined_angle: float
+    evaluations: int
+    seconds: float
+
+
+def refine_rectangle(polygon_coords: list, corners: Sequence[tuple], holes: Sequence[list] = None,
+                     point_gap: float = None, bracket: float = None,
+                     tolerance: float = 1e-6) -> Tuple[tuple, RefinementReport]:
+    """
+    Improve a rectangle with a continuous search over its angle, centre and size.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        corners: The candidate rectangle's four corners in plotting order
+        holes: Optional list of interior rings, each a list of (x, y) coordinates
+        point_gap: Sample gap that produced the candidate; sets the default bracket
+        bracket: Half-width of the angle search in radians (default: the angle
+            the point gap subtends over the candidate's shorter side, between
+            0.001 and pi/8)
+        tolerance: Angular tolerance of the search in radians
+
+    Returns:
+        Tuple of ((side_length, angle, point1, point2), RefinementReport); the
+        rectangle uses the same convention as ``find_max_rectangle_general``
+    """
+    start = time.perf_counter()
+    corners = np.asarray(corners, dtype=float)
+    width, height = math.dist(corners[0], corners[1]), math.dist(corners[1], corners[2])
+    initial_area = float(Polygon(corners).area)
+    initial_angle = float(np.mod(azimuth(corners[0], corners[1]), np.pi/2))
+    if bracket is None:
+        shorter = max(min(width, height), 1e-12)
+        bracket = float(np.clip(2 * (point_gap or 0.0) / shorter, 0.001, np.pi/8))
+
+    evaluations = 0
+    cache = {}
+
+    def area_at(angle: float) -> float:
+        nonlocal evaluations
+        if angle not in cache:
+            evaluations += 1
+            side, rectangle_angle, point1, point2 = find_max_rectangle_at_angle(polygon_coords, angle, holes)
+            cache[angle] = (side * math.dist(point1, point2), (side, rectangle_angle, point1, point2))
+        return cache[angle][0]
+
+    angle = golden_section_search(area_at, initial_angle - bracket, initial_angle + bracket, tolerance)
+    # The candidate's own orientation guards against a bracket that is not unimodal
+    best_angle = max((initial_angle, angle), key=area_at)
+    refined_area, rectangle = cache[best_angle]
+    report = RefinementReport(initial_area, refined_area, refined_area - initial_area,
+                              (refined_area - initial_area) / initial_area if initial_area > 0 else math.inf,
+                              initial_angle, float(np.mod(best_angle, np.pi/2)), evaluations,
+                              time.perf_counter() - start)
+    return rectangle, report
@@ -0,0 +1,171 @@
+"""
+Randomized search for large rectangles by adaptive importance sampling.
+
+Instead of sweeping all N^2 ordered pairs of boundary samples, base pairs
+are drawn in batches from a distribution over the samples of
+``split_into_points``. After every batch the distribution moves towards the
+endpoints of the batch's best (elite) pairs, smoothed along the boundary, as
+in the cross-entropy method; a share of every batch perturbs the best pair
+found so far and another share stays uniform so no region is starved. Each
+pair is evaluated like a base of the general engine: its chord must lie
+inside the polygon and its height is the exact sweep height from a
+``PolygonRayIndex``, rounded down to whole ``tiny_increment`` steps.
+
+The search stops when the best area has not grown by a relative
+``tolerance`` for ``patience`` batches, or at an evaluation or time budget.
+Runs are reproducible from their seed, and independent chains with spawned
+seeds run in separate worker processes.
+"""
+
+import math
+import time
+import numpy as np
+import shapely
+from concurrent.futures import ProcessPoolExecutor
+from shapely.geometry import Polygon
+from typing import NamedTuple, Tuple
+from ..core.geometry_utils import azimuth
+from ..core.polygon_processor import split_into_points, tiny_increment
+from ..core.ray_index import PolygonRayIndex
+
+
+class SamplingReport(NamedTuple):
+    """Progress of a sampling run."""
+    evaluations: int
+    batches: int
+    stalled: bool
+    seconds: float
+    history: np.ndarray  # (evaluations, best area) after every batch, shape (B, 2)
+
+
+def _circular_smooth(weights: np.ndarray, width: int) -> np.ndarray:
+    """Average weights over a window of 2 * width + 1 neighbouring samples around the ring."""
+    if width <= 0:
+        return weights
+    padded = np.concatenate((weights[-width:], weights, weights[:width]))
+    return np.convolve(padded, np.ones(2 * width + 1) / (2 * width + 1), mode='valid')
+
+
+def _sample_chain(polygon_coords: list, point_gap: float, seed, batch_size: int, elite_fraction: float,
+                  learning_rate: float, exploration: float, local_fraction: float, patience: int,
+                  tolerance: float, max_evaluations: int, max_seconds: float) -> tuple:
+    """Run one sampling chain and return (best, evaluations, batches, stalled, history) (worker entry point)."""
+    start = time.perf_counter()
+    polygon = Polygon(polygon_coords)
+    shapely.prepare(polygon)
+    index = PolygonRayIndex(polygon)
+    tiny_increment_value = tiny_increment(polygon, point_gap)
+    edge = split_into_points(polygon, point_gap)
+    count = len(edge)
+    rng = np.random.default_rng(seed)
+    width = max(1, count // 100)
+    probabilities = np.full(count, 1.0 / count)
+    max_evaluations = count * (count - 1) if max_evaluations is None else max_evaluations
+
+    best_area, best, best_pair = 0.0, None, None
+    evaluations = batches = stale = 0
+    history = []
+    while evaluations < max_evaluations and stale < patience:
+        size = min(batch_size, max_evaluations - evaluations)
+        mixture = (1 - exploration) * probabilities + exploration / count
+        first = rng.choice(count, size, p=mixture)
+        second = rng.choice(count, size, p=mixture)
+        if best_pair is not None:
+            # Perturb the best pair's endpoints by up to a few smoothing widths
+            local = rng.random(size) < local_fraction
+            shifts = np.rint(rng.normal(0.0, 2 * width, (2, int(local.sum())))).astype(int)
+            first[local] = (best_pair[0] + shifts[0]) % count
+            second[local] = (best_pair[1] + shifts[1]) % count
+        points1, points2 = edge[first], edge[second]
+
+        lengths = np.hypot(*(points2 - points1).T)
+        heights = index.sweep_heights(points1, points2)
+        areas = np.floor(heights / tiny_increment_value) * tiny_increment_value * lengths
+        todo = np.flatnonzero(areas > 0)
+        inside = shapely.contains(polygon, shapely.linestrings(np.stack((points1[todo], points2[todo]), axis=1)))
+        areas[todo[~inside]] = 0.0
+        evaluations += size
+        batches += 1
+
+        winner = int(np.argmax(areas))
+        if areas[winner] > best_area * (1 + tolerance):
+            stale = 0
+        else:
+            stale += 1
+        if areas[winner] > best_area:
+            best_area, best_pair = float(areas[winner]), (int(first[winner]), int(second[winner]))
+            best = (areas[winner] / lengths[winner], azimuth(points1[winner], points2[winner]) + np.pi/2,
+                    points1[winner], points2[winner])
+        history.append((evaluations, best_area))
+
+        # Move the distribution towards the endpoints of the batch's elite pairs
+        elite = np.argsort(areas)[-max(1, int(size * elite_fraction)):]
+        elite = elite[areas[elite] > 0]
+        if len(elite):
+            counts = np.bincount(np.concatenate((first[elite], second[elite])), minlength=count).astype(float)
+            target = _circular_smooth(counts, width)
+            probabilities = (1 - learning_rate) * probabilities + learning_rate * target / target.sum()
+        if max_seconds is not None and time.perf_counter() - start > max_seconds:
+            break
+    return best, evaluations, batches, stale >= patience, np.array(history, dtype=float).reshape(-1, 2)
+
+
+def find_max_rectangle_sampling(polygon_coords: list, point_gap: float = 0.026, seed: int = 0,
+                                batch_size: int = 512, elite_fraction: float = 0.05, learning_rate: float = 0.3,
+                                exploration: float = 0.1, local_fraction: float = 0.25, patience: int = 20,
+                                tolerance: float = 1e-4, max_evaluations: int = None, max_seconds: float = None,
+                                jobs: int = 1) -> Tuple[tuple, SamplingReport]:
+    """
+    Find a large inscribed rectangle from randomly drawn base pairs.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        point_gap: Distance between sampled points (default: 0.026)
+        seed: Seed of the random generator; the same seed and settings give the same result
+        batch_size: Pairs drawn between updates of the distribution
+        elite_fraction: Share of every batch whose endpoints the distribution moves towards
+        learning_rate: Weight of the elite endpoints in every update
+        exploration: Share of the distribution kept uniform over all samples
+        local_fraction: Share of every batch drawn around the best pair so far
+        patience: Batches without a relative gain of ``tolerance`` before the search stops
+        tolerance: Smallest relative gain that resets the stall counter
+        max_evaluations: Optional limit on the pairs evaluated by each chain
+            (default: the number of ordered pairs)
+        max_seconds: Optional wall-time limit of each chain
+        jobs: Number of independent chains, each in its own worker process
+            with a seed spawned from ``seed`` (1 runs in this process)
+
+    Returns:
+        Tuple of ((side_length, angle, point1, point2), SamplingReport); the
+        history holds the evaluations and best area of all chains together
+        after every batch, as if they ran in lockstep
+
+    Raises:
+        ValueError: If no rectangle is found
+    """
+    start = time.perf_counter()
+    settings = (batch_size, elite_fraction, learning_rate, exploration, local_fraction, patience, tolerance,
+                max_evaluations, max_seconds)
+    if jobs <= 1:
+        chains = [_sample_chain(polygon_coords, point_gap, seed, *settings)]
+    else:
+        seeds = np.random.SeedSequence(seed).spawn(jobs)
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chains = list(executor.map(_sample_chain, [polygon_coords] * jobs, [point_gap] * jobs, seeds,
+                                       *[[setting] * jobs for setting in settings]))
+
+    found = [chain for chain in chains if chain[0] is not None]
+    if not found:
+        raise ValueError("No rectangle found")
+    best = max(found, key=lambda chain: chain[0][0] * math.dist(chain[0][2], chain[0][3]))[0]
+
+    # Pad every chain's history with its final state and combine them batch by batch
+    length = max(len(chain[4]) for chain in chains)
+    padded = np.stack([np.concatenate((chain[4], np.repeat(chain[4][-1:], length - len(chain[4]), axis=0)))
+                       for chain in chains])
+    history = np.column_stack((padded[:, :, 0].sum(axis=0), padded[:, :, 1].max(axis=0)))
+    report = SamplingReport(evaluations=sum(chain[1] for chain in chains),
+                            batches=max(chain[2] for chain in chains),
+                            stalled=all(chain[3] for chain in chains),
+                            seconds=time.perf_counter() - start, history=history)
+    return best, report
@@ -0,0 +1,17 @@
+"""
+Batch processing of many polygons across worker processes.
+"""
+
+from .journal import JournalStatus, ResultJournal, journal_status
+from .runner import solve_many, solve_layer, solve_record, solve_corpus, ProgressBar
+
+__all__ = [
+    'solve_many',
+    'solve_layer',
+    'solve_record',
+    'solve_corpus',
+    'ProgressBar',
+    'ResultJournal',
+    'JournalStatus',
+    'journal_status'
+]
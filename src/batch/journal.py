@@ -0,0 +1,154 @@
+"""
+Append-only result journal that lets interrupted batch runs resume.
+
+A journal is a newline-delimited JSON file. Every run appends a session line
+(``{"session": started, "total": N}``) and then one result record per polygon
+as it completes, stamped with its completion time in ``finished``. Lines are
+flushed as they are written and synced to disk periodically, so a run that is
+killed loses at most the last sync interval and perhaps half a line; the
+half line is cut off when the journal is reopened. Reopening reads only the
+journal, so resuming costs time in proportion to the work already done.
+"""
+
+import json
+import os
+import time
+from typing import NamedTuple, Set
+
+
+class JournalStatus(NamedTuple):
+    """Progress of a journaled run as recorded in its journal."""
+    completed: int
+    failed: int
+    total: int
+    session_completed: int
+    elapsed: float
+    rate: float
+    remaining: int
+    eta: float
+    last_update: float
+
+
+def _read_lines(path: str) -> tuple:
+    """
+    Parse a journal and return its complete lines and the byte length they cover.
+
+    Only the final line may be incomplete, as left by a killed writer.
+    """
+    entries, length = [], 0
+    with open(path, 'rb') as fh:
+        for number, line in enumerate(fh):
+            try:
+                if not line.endswith(b'\n'):
+                    raise ValueError("incomplete line")
+                entries.append(json.loads(line))
+            except ValueError:
+                if fh.read(1):
+                    raise ValueError(f"Corrupt journal line {number + 1} in '{path}'")
+                break
+            length += len(line)
+    return entries, length
+
+
+class ResultJournal:
+    """Append-only NDJSON journal of result records, keyed by polygon id."""
+
+    def __init__(self, path: str, sync_interval: float = 1.0, retry_failed: bool = False):
+        """
+        Args:
+            path: Journal file; created if missing, resumed otherwise
+            sync_interval: Seconds between forced writes to disk
+            retry_failed: Treat polygons whose last record is an error as unfinished
+        """
+        self.path = path
+        self.sync_interval = sync_interval
+        self.completed: Set[str] = set()
+        self.failed: Set[str] = set()
+        if os.path.exists(path):
+            entries, length = _read_lines(path)
+            if length < os.path.getsize(path):
+                os.truncate(path, length)
+            for entry in entries:
+                if 'id' in entry:
+                    identifier = str(entry['id'])
+                    (self.failed.add if 'error' in entry else self.failed.discard)(identifier)
+                    self.completed.add(identifier)
+        if retry_failed:
+            self.completed -= self.failed
+        self._file = open(path, 'a', encoding='utf-8')
+        self._last_sync = time.monotonic()
+
+    def __contains__(self, identifier) -> bool:
+        return str(identifier) in self.completed
+
+    def __enter__(self) -> 'ResultJournal':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start_session(self, total: int = None) -> None:
+        """Record the start of a run over ``total`` polygons (skipped ones included)."""
+        self._write({'session': time.time(), 'total': total})
+        self.sync()
+
+    def append(self, record: dict) -> None:
+        """Record a finished polygon; the record must have an 'id' key."""
+        self._write(dict(record, finished=time.time()))
+        identifier = str(record['id'])
+        self.completed.add(identifier)
+        (self.failed.add if 'error' in record else self.failed.discard)(identifier)
+        if time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Force everything written so far to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close the journal."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def _write(self, entry: dict) -> None:
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+
+
+def journal_status(path: str, total: int = None) -> JournalStatus:
+    """
+    Summarize a journal: how much is done, how fast the latest session runs, and how long is left.
+
+    Args:
+        path: Journal file
+        total: Number of polygons in the run (default: from the latest session line)
+
+    Returns:
+        JournalStatus; the rate and estimate come from the latest session alone
+    """
+    entries, _ = _read_lines(path)
+    outcomes = {}
+    session_start, session_completed, session_total, last_update = None, 0, None, 0.0
+    for entry in entries:
+        if 'session' in entry:
+            session_start, session_completed = entry['session'], 0
+            session_total = entry.get('total', session_total)
+            last_update = max(last_update, entry['session'])
+        elif 'id' in entry:
+            outcomes[str(entry['id'])] = 'error' in entry
+            session_completed += 1
+            last_update = max(last_update, entry.get('finished', 0.0))
+
+    total = session_total if total is None else total
+    elapsed = last_update - session_start if session_start is not None else 0.0
+    rate = session_completed / elapsed if elapsed > 0 else 0.0
+    remaining = max(total - len(outcomes), 0) if total is not None else None
+    if remaining is None:
+        eta = None
+    else:
+        eta = remaining / rate if rate > 0 else (0.0 if remaining == 0 else float('inf'))
+    return JournalStatus(len(outcomes), sum(outcomes.values()), total, session_completed, elapsed, rate,
+                         remaining, eta, last_update)
@@ -0,0 +1,250 @@
+"""
+Parallel batch runner that solves many polygons and streams result records.
+"""
+
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Tuple
+from ..algorithms.engines import solve
+from ..core.tessellation import SharedBoundary
+from ..formats.corpus import (
+    PolygonCorpus, STATUS_DONE, STATUS_FAILED, create_results, open_results,
+)
+from .journal import ResultJournal
+
+
+def solve_record(task: Tuple[str, list, dict]) -> dict:
+    """
+    Solve one polygon and return a result record (worker entry point).
+    
+    Errors are reported in the record instead of aborting the batch.
+    
+    Args:
+        task: Tuple of (id, polygon_coords, solve keyword arguments)
+        
+    Returns:
+        Result dictionary with an 'id' key, and an 'error' key on failure
+    """
+    identifier, polygon_coords, options = task
+    try:
+        record = solve(polygon_coords, **options).to_record()
+    except Exception as error:
+        record = {'error': f"{type(error).__name__}: {error}"}
+    record['id'] = identifier
+    return record
+
+
+def _solve_chunk(tasks: List[Tuple[str, list, dict]]) -> List[dict]:
+    """Solve a chunk of polygons in one worker call."""
+    return [solve_record(task) for task in tasks]
+
+
+def _solve_tasks(tasks: Iterable[Tuple[str, list, dict]], jobs: int, chunk_size: int) -> Iterator[dict]:
+    """Solve tasks, optionally in worker processes, yielding records in input order."""
+    if jobs <= 1:
+        yield from map(solve_record, tasks)
+        return
+
+    chunks = iter(lambda: list(islice(tasks, chunk_size)), [])
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque(executor.submit(_solve_chunk, chunk) for chunk in islice(chunks, 4 * jobs))
+        while pending:
+            records = pending.popleft().result()
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(_solve_chunk, chunk))
+            yield from records
+
+
+def _journaled(records: Iterable[dict], journal: ResultJournal) -> Iterator[dict]:
+    """Append records to a journal as they pass through."""
+    for record in records:
+        journal.append(record)
+        yield record
+
+
+def solve_many(items: Iterable[Tuple[str, list]], jobs: int = 1, chunk_size: int = 16,
+               journal: ResultJournal = None, **options) -> Iterator[dict]:
+    """
+    Solve many polygons, optionally in worker processes, yielding records in input order.
+    
+    Only a bounded number of chunks is in flight at once, so arbitrarily long
+    inputs can be streamed.
+    
+    Args:
+        items: Iterable of (id, polygon_coords) pairs
+        jobs: Number of worker processes (1 solves in this process)
+        chunk_size: Number of polygons sent to a worker at a time
+        journal: Optional ``ResultJournal``; polygons it already holds are
+            skipped and every new record is appended to it
+        **options: Keyword arguments for ``engines.solve``
+        
+    Returns:
+        Iterator of result records
+    """
+    if journal is not None:
+        items = (item for item in items if item[0] not in journal)
+    records = _solve_tasks(((identifier, coords, options) for identifier, coords in items), jobs, chunk_size)
+    return records if journal is None else _journaled(records, journal)
+
+
+def solve_layer(items: Iterable[Tuple[str, list]], point_gap: float, jobs: int = 1, chunk_size: int = 16,
+                journal: ResultJournal = None, **options) -> Iterator[dict]:
+    """
+    Solve the polygons of a tessellated layer, sampling each shared boundary segment once.
+    
+    The whole layer is read to build a ``SharedBoundary`` edge table, and
+    every polygon is solved with its samples assembled from the table.
+    
+    Args:
+        items: Iterable of (id, polygon_coords) pairs
+        point_gap: Absolute distance between boundary samples, the same for every polygon
+        jobs: Number of worker processes (1 solves in this process)
+        chunk_size: Number of polygons sent to a worker at a time
+        journal: Optional ``ResultJournal``, as for ``solve_many``
+        **options: Further keyword arguments for ``engines.solve``
+        
+    Returns:
+        Iterator of result records
+        
+    Raises:
+        ValueError: If options would choose a different gap per polygon or simplify the polygons
+    """
+    if any(options.get(name) is not None for name in ('relative_gap', 'time_budget', 'target_error',
+                                                       'simplify_tolerance')):
+        raise ValueError("Shared sampling needs one absolute point gap and unsimplified polygons")
+    items = [item for item in items if journal is None or item[0] not in journal]
+    layer = SharedBoundary([coords for _, coords in items], point_gap)
+    tasks = ((identifier, coords, dict(options, point_gap=point_gap, samples=layer.samples(index)))
+             for index, (identifier, coords) in enumerate(items))
+    records = _solve_tasks(tasks, jobs, chunk_size)
+    return records if journal is None else _journaled(records, journal)
+
+
+def _solve_corpus_range(path: str, start: int, stop: int, options: dict) -> Tuple[int, int]:
+    """
+    Solve a slice of a corpus and write the rows of the results array (worker entry point).
+    
+    Args:
+        path: Corpus directory
+        start: First record index
+        stop: One past the last record index
+        options: Keyword arguments for ``engines.solve``
+    
+    Returns:
+        Tuple of (records solved, records failed)
+    """
+    corpus = PolygonCorpus(path)
+    results = open_results(path, mode='r+')
+    failures = 0
+    for index in range(start, stop):
+        began = time.perf_counter()
+        try:
+            result = solve(corpus.exterior_coords(index), **options)
+            results['area'][index] = result.area
+            results['corners'][index] = result.corners
+            results['status'][index] = STATUS_DONE
+        except Exception:
+            results['status'][index] = STATUS_FAILED
+            failures += 1
+        results['seconds'][index] = time.perf_counter() - began
+    results.flush()
+    return stop - start, failures
+
+
+def solve_corpus(path: str, jobs: int = 1, chunk_size: int = 256,
+                 progress: Callable[[int], None] = None, **options) -> Tuple[int, int]:
+    """
+    Solve every record of a corpus into its sibling results array.
+    
+    Workers receive only the corpus path and an index range; they map the
+    corpus and the results array themselves, so nothing is pickled or copied.
+    
+    Args:
+        path: Corpus directory
+        jobs: Number of worker processes (1 solves in this process)
+        chunk_size: Number of records per worker task
+        progress: Optional callback receiving the number of records completed
+        **options: Keyword arguments for ``engines.solve``
+    
+    Returns:
+        Tuple of (records solved, records failed)
+    """
+    count = len(PolygonCorpus(path))
+    create_results(path)
+    ranges = [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+    solved = failed = 0
+    
+    if jobs <= 1:
+        outcomes = (_solve_corpus_range(path, start, stop, options) for start, stop in ranges)
+        for done, failures in outcomes:
+            solved, failed = solved + done, failed + failures
+            if progress:
+                progress(done)
+        return solved, failed
+    
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_solve_corpus_range, path, start, stop, options) for start, stop in ranges]
+        for future in as_completed(futures):
+            done, failures = future.result()
+            solved, failed = solved + done, failed + failures
+            if progress:
+                progress(done)
+    return solved, failed
+
+
+class ProgressBar:
+    """Text progress bar with throughput, written to standard error."""
+
+    def __init__(self, total: int = None, width: int = 30, interval: float = 0.2, stream=None):
+        """
+        Args:
+            total: Expected number of items, if known
+            width: Width of the bar in characters
+            interval: Minimum number of seconds between redraws
+            stream: Output stream (default: standard error)
+        """
+        self.total = total
+        self.width = width
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.count = 0
+        self.start = time.perf_counter()
+        self._last_draw = 0.0
+        self._drawn_count = None
+
+    @property
+    def rate(self) -> float:
+        """Items completed per second so far."""
+        elapsed = time.perf_counter() - self.start
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def update(self, count: int = 1) -> None:
+        """Record completed items and redraw if the interval has passed."""
+        self.count += count
+        now = time.perf_counter()
+        if now - self._last_draw >= self.interval or self.count == self.total:
+            self._last_draw = now
+            self._draw()
+
+    def close(self) -> None:
+        """Draw the final state and end the line."""
+        if self._drawn_count != self.count:
+            self._draw()
+        self.stream.write('\n')
+        self.stream.flush()
+
+    def _draw(self) -> None:
+        self._drawn_count = self.count
+        rate = self.rate
+        if self.total:
+            filled = int(self.width * self.count / self.total)
+            remaining = (self.total - self.count) / rate if rate > 0 else float('inf')
+            line = (f"[{'#' * filled}{' ' * (self.width - filled)}] {self.count}/{self.total} "
+                    f"{rate:.1f} polygons/s ETA {remaining:.0f}s")
+        else:
+            line = f"{self.count} polygons {rate:.1f} polygons/s"
+        self.stream.write('\r' + line)
+        self.stream.flush()
@@ -0,0 +1,296 @@
+"""
+Command-line entry point (``lir``) for solving polygons in batch.
+"""
+
+import argparse
+import math
+import sys
+import time
+from typing import List
+from .algorithms.engines import ENGINES
+from .batch.journal import ResultJournal, journal_status
+from .batch.runner import ProgressBar, solve_corpus, solve_layer, solve_many
+from .core.constraints import RectangleConstraints
+from .formats.corpus import (
+    PolygonCorpus, corpus_from_file, corpus_from_geojson, corpus_from_wkb, is_corpus, results_path
+)
+from .formats.readers import FORMATS, read_polygons
+from .formats.results import OUTPUT_FORMATS, write_results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the ``lir`` command."""
+    parser = argparse.ArgumentParser(prog="lir", description="Find the largest interior rectangle of polygons.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve = commands.add_parser("solve", help="solve polygons from files or standard input")
+    solve.add_argument("inputs", nargs="*", default=["-"],
+                       help="input files ('-' for standard input) or a single packed corpus directory")
+    solve.add_argument("--format", choices=FORMATS, dest="input_format",
+                       help="input format (default: detected from the file extension, WKT for stdin)")
+    solve.add_argument("--engine", choices=sorted(ENGINES) + ["auto"], default="general",
+                       help="rectangle finder to use ('auto' picks one from the polygon's shape)")
+    gap = solve.add_mutually_exclusive_group()
+    gap.add_argument("--point-gap", type=float, help="absolute distance between boundary samples")
+    gap.add_argument("--relative-gap", type=float,
+                     help="distance between boundary samples as a fraction of the bounding-box diagonal")
+    solve.add_argument("--time-budget", type=float,
+                       help="without a gap, use the finest gap predicted to finish in this many seconds per polygon")
+    solve.add_argument("--target-error", type=float,
+                       help="without a gap, use the coarsest gap predicted to lose at most this fraction of the area")
+    solve.add_argument("--refine", action="store_true",
+                       help="polish the rectangle with a continuous search beyond the sample grid")
+    solve.add_argument("--symmetry", action="store_true",
+                       help="skip base pairs that a mirror or rotational symmetry of the polygon repeats")
+    solve.add_argument("--ray-index", action="store_true",
+                       help="index the polygon's edges so extensions only test nearby edges (large polygons)")
+    solve.add_argument("--distance-field", action="store_true",
+                       help="skip candidates a signed-distance grid shows cannot win (convex and general engines)")
+    solve.add_argument("--shared-edges", action="store_true",
+                       help="sample boundary segments shared by neighbouring polygons once (tessellated layers; "
+                            "needs --point-gap)")
+    solve.add_argument("--grid-size", type=float,
+                       help="grid spacing for the grid engine (default: a tenth of the point gap)")
+    solve.add_argument("--seed", type=int, help="random seed of the sampling engine (default: 0)")
+    solve.add_argument("--simplify", type=float, dest="simplify_tolerance",
+                       help="simplify polygons inward with this tolerance before solving")
+    solve.add_argument("--min-side", type=float, help="smallest allowed length of either rectangle side")
+    solve.add_argument("--max-aspect", type=float, help="largest allowed ratio of the long side to the short side")
+    solve.add_argument("--orientation", type=float,
+                       help="preferred direction of the rectangle sides, in degrees counter-clockwise from +x")
+    solve.add_argument("--orientation-tolerance", type=float, default=0.0,
+                       help="allowed deviation from --orientation, in degrees")
+    solve.add_argument("-j", "--jobs", type=int, default=1, help="number of worker processes")
+    solve.add_argument("-o", "--output", default="-", help="output file ('-' for standard output)")
+    solve.add_argument("--output-format", choices=OUTPUT_FORMATS, default="ndjson")
+    solve.add_argument("--journal",
+                       help="append results to this journal and skip polygons it already holds (resumable runs)")
+    solve.add_argument("--retry-failed", action="store_true",
+                       help="with --journal, solve polygons again whose journaled record is an error")
+    solve.add_argument("--no-progress", action="store_true", help="do not draw a progress bar")
+    solve.add_argument("--profile", action="store_true", help="print per-phase timings to standard error")
+
+    pack = commands.add_parser("pack", help="pack polygons into a memory-mapped corpus directory")
+    pack.add_argument("source", help="GeoJSON, hex WKB (.wkb, one per line) or any file geopandas can read")
+    pack.add_argument("-o", "--output", required=True, help="corpus directory to write")
+    pack.add_argument("--id-column", help="attribute column holding record ids (geopandas inputs)")
+
+    status = commands.add_parser("status", help="report progress, throughput and time left of a journaled run")
+    status.add_argument("journal", help="journal file written by 'solve --journal'")
+    status.add_argument("--total", type=int, help="number of polygons in the run (default: from the journal)")
+
+    serve = commands.add_parser("serve", help="run the local HTTP/JSON solving service")
+    serve.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("-j", "--jobs", type=int, default=2, help="number of worker processes")
+    serve.add_argument("--batch-window", type=float, default=0.005,
+                       help="seconds to collect requests into one batch")
+    serve.add_argument("--max-batch", type=int, default=32, help="largest batch sent to a worker")
+    serve.add_argument("--timeout", type=float, default=30.0, dest="default_timeout",
+                       help="default per-request deadline in seconds")
+    return parser
+
+
+def _print_profile(phases: dict, item_phases: dict, count: int, wall: float) -> None:
+    """Print wall-clock phases and per-polygon phases summed over all workers."""
+    stream = sys.stderr
+    stream.write("phase                 seconds\n")
+    for name, seconds in phases.items():
+        stream.write(f"{name:20s} {seconds:8.3f}\n")
+    for name, seconds in item_phases.items():
+        stream.write(f"  {name:18s} {seconds:8.3f}  ({seconds / max(count, 1) * 1000:.2f} ms/polygon)\n")
+    stream.write(f"{'total':20s} {wall:8.3f}  {count / wall if wall > 0 else 0:.1f} polygons/s\n")
+
+
+def _solve_options(args: argparse.Namespace) -> dict:
+    """Collect the ``engines.solve`` keyword arguments from the command line."""
+    options = {
+        'engine': args.engine,
+        'point_gap': args.point_gap,
+        'relative_gap': args.relative_gap,
+        'simplify_tolerance': args.simplify_tolerance,
+        'time_budget': args.time_budget,
+        'target_error': args.target_error,
+    }
+    if args.refine:
+        options['refine'] = True
+    if args.symmetry:
+        options['symmetry'] = True
+    if args.ray_index:
+        options['ray_index'] = True
+    if args.distance_field:
+        options['distance_field'] = True
+    if args.grid_size is not None:
+        options['grid_size'] = args.grid_size
+    if args.seed is not None:
+        options['seed'] = args.seed
+    if args.min_side is not None or args.max_aspect is not None or args.orientation is not None:
+        options['constraints'] = RectangleConstraints(
+            min_side=args.min_side or 0.0,
+            max_aspect=args.max_aspect,
+            orientation=None if args.orientation is None else math.radians(args.orientation),
+            orientation_tolerance=math.radians(args.orientation_tolerance),
+        )
+    return options
+
+
+def run_solve_corpus(args: argparse.Namespace) -> int:
+    """Solve a packed corpus into its sibling results array."""
+    path = args.inputs[0]
+    start = time.perf_counter()
+    progress = None if args.no_progress else ProgressBar(total=len(PolygonCorpus(path)))
+    solved, failures = solve_corpus(path, jobs=args.jobs, progress=progress.update if progress else None,
+                                    **_solve_options(args))
+    if progress:
+        progress.close()
+    wall = time.perf_counter() - start
+    sys.stderr.write(f"{solved} polygons solved into {results_path(path)}\n")
+    if args.profile:
+        _print_profile({'solve': wall}, {}, solved, wall)
+    if failures:
+        sys.stderr.write(f"{failures} of {solved} polygons failed\n")
+    return 1 if failures else 0
+
+
+def _corpus_items(corpus: PolygonCorpus, journal: ResultJournal = None):
+    """Iterate over a corpus, loading coordinates only for records the journal lacks."""
+    for index, identifier in enumerate(corpus.ids):
+        if journal is None or str(identifier) not in journal:
+            yield str(identifier), corpus.exterior_coords(index)
+
+
+def run_solve(args: argparse.Namespace) -> int:
+    """Run the ``solve`` command."""
+    if args.shared_edges and args.point_gap is None:
+        raise SystemExit("lir solve: --shared-edges needs --point-gap")
+    corpus = len(args.inputs) == 1 and is_corpus(args.inputs[0])
+    if corpus and not args.journal and not args.shared_edges:
+        return run_solve_corpus(args)
+    wall_start = time.perf_counter()
+    phases = {}
+    journal = ResultJournal(args.journal, retry_failed=args.retry_failed) if args.journal else None
+
+    start = time.perf_counter()
+    if corpus:
+        # Journaled and shared-edge corpus runs stream records instead of filling the results array
+        corpus = PolygonCorpus(args.inputs[0])
+        total = len(corpus)
+        items = _corpus_items(corpus, journal)
+        pending = total - (0 if journal is None else sum(str(identifier) in journal for identifier in corpus.ids))
+    else:
+        items = [item for path in args.inputs for item in read_polygons(path, args.input_format)]
+        total = len(items)
+        if journal is not None:
+            items = [item for item in items if item[0] not in journal]
+        pending = len(items)
+    phases['read'] = time.perf_counter() - start
+    if journal is not None:
+        journal.start_session(total)
+        if pending < total:
+            sys.stderr.write(f"resuming: {total - pending} of {total} polygons already in {args.journal}\n")
+
+    options = _solve_options(args)
+    progress = None if args.no_progress else ProgressBar(total=pending)
+    item_phases = {}
+    failures = 0
+
+    start = time.perf_counter()
+    if args.shared_edges:
+        options.pop('point_gap')
+        records = solve_layer(items, args.point_gap, jobs=args.jobs, journal=journal, **options)
+    else:
+        records = solve_many(items, jobs=args.jobs, journal=journal, **options)
+    records = write_results(records, args.output, args.output_format)
+    for record in records:
+        failures += 'error' in record
+        for name, seconds in record.get('timings', {}).items():
+            item_phases[name] = item_phases.get(name, 0.0) + seconds
+        if progress:
+            progress.update()
+    phases['solve and write'] = time.perf_counter() - start
+    if progress:
+        progress.close()
+    if journal is not None:
+        journal.close()
+
+    if args.profile:
+        _print_profile(phases, item_phases, pending, time.perf_counter() - wall_start)
+    if failures:
+        sys.stderr.write(f"{failures} of {pending} polygons failed\n")
+    return 1 if failures else 0
+
+
+def _format_duration(seconds: float) -> str:
+    """Format a duration as hours, minutes and seconds."""
+    if seconds is None or math.isinf(seconds):
+        return "unknown"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m {seconds:02d}s" if hours else f"{minutes}m {seconds:02d}s"
+
+
+def run_status(args: argparse.Namespace) -> int:
+    """Run the ``status`` command."""
+    status = journal_status(args.journal, args.total)
+    total = "?" if status.total is None else status.total
+    print(f"completed   {status.completed} of {total} polygons ({status.failed} failed)")
+    print(f"throughput  {status.rate:.1f} polygons/s over the latest session "
+          f"({status.session_completed} polygons in {_format_duration(status.elapsed)})")
+    if status.remaining is not None:
+        print(f"remaining   {status.remaining} polygons, about {_format_duration(status.eta)}")
+    if status.last_update:
+        print(f"last update {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(status.last_update))}")
+    return 0
+
+
+def run_pack(args: argparse.Namespace) -> int:
+    """Run the ``pack`` command."""
+    extension = args.source.lower().rsplit('.', 1)[-1]
+    if extension in ('geojson', 'json'):
+        count = corpus_from_geojson(args.source, args.output)
+    elif extension == 'wkb':
+        count = corpus_from_wkb(args.source, args.output)
+    else:
+        count = corpus_from_file(args.source, args.output, args.id_column)
+    sys.stderr.write(f"packed {count} polygons into {args.output}\n")
+    return 0
+
+
+def run_serve(args: argparse.Namespace) -> int:
+    """Run the ``serve`` command until interrupted."""
+    import asyncio
+    from .service.server import serve
+
+    sys.stderr.write(f"serving on http://{args.host}:{args.port}\n")
+    try:
+        asyncio.run(serve(args.host, args.port, jobs=args.jobs, batch_window=args.batch_window,
+                          max_batch=args.max_batch, default_timeout=args.default_timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Run the ``lir`` command.
+
+    Args:
+        argv: Command-line arguments (default: ``sys.argv[1:]``)
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    if args.command == "solve":
+        return run_solve(args)
+    if args.command == "pack":
+        return run_pack(args)
+    if args.command == "status":
+        return run_status(args)
+    if args.command == "serve":
+        return run_serve(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
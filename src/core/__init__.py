@@ -2,8 +2,17 @@
 Core utilities for geometric operations and polygon processing.
 """
 
+from .classification import ShapeClass, classify_polygon
+from .constraints import RectangleConstraints
 from .geometry_utils import azimuth, increment, sort_rectangle_coords
-from .polygon_processor import split_into_points, min_extension, tiny_increment
+from .polygon_processor import (
+    split_into_points, min_extension, tiny_increment, simplify_inward, signed_area, sweep_heights,
+    BoundarySamples, sample_boundary
+)
+from .ray_index import PolygonRayIndex
+from .distance_field import DistanceField, QuickRejectStats
+from .symmetry import Symmetry, detect_symmetries
+from .tessellation import SharedBoundary
 
 __all__ = [
     'azimuth',
@@ -11,5 +20,19 @@ __all__ = [
     'sort_rectangle_coords',
     'split_into_points',
     'min_extension',
-    'tiny_increment'
+    'tiny_increment',
+    'simplify_inward',
+    'signed_area',
+    'sweep_heights',
+    'BoundarySamples',
+    'sample_boundary',
+    'RectangleConstraints',
+    'ShapeClass',
+    'classify_polygon',
+    'Symmetry',
+    'detect_symmetries',
+    'PolygonRayIndex',
+    'DistanceField',
+    'QuickRejectStats',
+    'SharedBoundary'
 ] 
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Cheap shape classification used to pick an engine.
+"""
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from typing import NamedTuple
+from .polygon_processor import signed_area
+
+
+class ShapeClass(NamedTuple):
+    """
+    Shape properties of a polygon that decide which engine is fastest and correct.
+
+    Attributes:
+        kind: Most specific class, one of 'holes', 'rectilinear', 'convex',
+            'near_rectangular', 'star_shaped' or 'general'
+        convex: Every interior angle is at most 180 degrees
+        star_shaped: Some interior point sees the whole boundary
+        rectilinear: Every edge is parallel to one of two perpendicular directions
+        near_rectangular: Area is close to the area of the minimum rotated rectangle
+        has_holes: The polygon has interior rings
+        rectangularity: Area divided by the area of the minimum rotated rectangle
+        rectangle_angle: Direction of the minimum rotated rectangle, modulo pi/2
+        vertices: Number of vertices over all rings
+        rectilinear_angle: Direction of the edges modulo pi/2 if rectilinear, else None
+    """
+    kind: str
+    convex: bool
+    star_shaped: bool
+    rectilinear: bool
+    near_rectangular: bool
+    has_holes: bool
+    rectangularity: float
+    rectangle_angle: float
+    vertices: int
+    rectilinear_angle: float = None
+
+
+def _kernel_area(coords: np.ndarray) -> float:
+    """Area of the region that sees the whole ring (the intersection of the edges' inner half-planes)."""
+    starts = coords
+    ends = np.roll(coords, -1, axis=0)
+    directions = ends - starts
+    lengths = np.hypot(directions[:, 0], directions[:, 1])
+    keep = lengths > 0
+    starts, directions, lengths = starts[keep], directions[keep] / lengths[keep, None], lengths[keep]
+    reach = 4 * (np.ptp(coords, axis=0).max() + lengths.max())
+    # Inner side is on the left of a counter-clockwise ring
+    normals = np.stack((-directions[:, 1], directions[:, 0]), axis=1)
+    back, front = starts - directions * reach, starts + directions * reach
+    half_planes = shapely.polygons(np.stack((back, front, front + normals * reach, back + normals * reach), axis=1))
+    return float(shapely.intersection_all(half_planes).area)
+
+
+def classify_polygon(polygon: Polygon, near_rectangular: float = 0.9, tolerance: float = 1e-9,
+                     angle_tolerance: float = 1e-6) -> ShapeClass:
+    """
+    Classify a polygon with a few vectorized passes over its vertices.
+
+    The star-shaped test clips the edges' half-planes against each other and
+    only runs for concave polygons.
+
+    Args:
+        polygon: Shapely polygon object, with or without holes
+        near_rectangular: Rectangularity from which a polygon counts as near-rectangular
+        tolerance: Relative tolerance of the convexity and kernel tests
+        angle_tolerance: Allowed deviation of edge directions in radians for the rectilinear test
+
+    Returns:
+        ShapeClass of the polygon
+    """
+    coords = np.asarray(polygon.exterior.coords[:-1], dtype=float)
+    if signed_area(coords) < 0:
+        coords = coords[::-1]
+    edges = np.roll(coords, -1, axis=0) - coords
+    edges = edges[np.hypot(edges[:, 0], edges[:, 1]) > 0]
+    scale = np.hypot(edges[:, 0], edges[:, 1])
+
+    # Convex: no right turn between consecutive edges of the counter-clockwise ring
+    following = np.roll(edges, -1, axis=0)
+    turns = edges[:, 0] * following[:, 1] - edges[:, 1] * following[:, 0]
+    convex = bool(np.all(turns >= -tolerance * scale * np.roll(scale, -1)))
+
+    # Rectilinear: all edge directions agree modulo a quarter turn
+    directions = np.mod(np.arctan2(edges[:, 1], edges[:, 0]), np.pi/2)
+    deviation = np.mod(directions - directions[0] + np.pi/4, np.pi/2) - np.pi/4
+    rectilinear = bool(np.all(np.abs(deviation) <= angle_tolerance))
+    rectilinear_angle = float(directions[0]) if rectilinear else None
+
+    bounding_rectangle = polygon.minimum_rotated_rectangle
+    corners = np.asarray(bounding_rectangle.exterior.coords)
+    side = corners[1] - corners[0]
+    rectangle_area = bounding_rectangle.area
+    rectangularity = float(polygon.area / rectangle_area) if rectangle_area > 0 else 0.0
+    rectangle_angle = float(np.mod(np.arctan2(side[1], side[0]), np.pi/2))
+
+    has_holes = len(polygon.interiors) > 0
+    star_shaped = convex or _kernel_area(coords) > tolerance * polygon.area
+    is_near_rectangular = rectangularity >= near_rectangular
+
+    if has_holes:
+        kind = 'holes'
+    elif rectilinear:
+        kind = 'rectilinear'
+    elif convex:
+        kind = 'convex'
+    elif is_near_rectangular:
+        kind = 'near_rectangular'
+    elif star_shaped:
+        kind = 'star_shaped'
+    else:
+        kind = 'general'
+    vertices = sum(len(ring.coords) - 1 for ring in [polygon.exterior, *polygon.interiors])
+    return ShapeClass(kind, convex, star_shaped, rectilinear, is_near_rectangular, has_holes, rectangularity,
+                      rectangle_angle, vertices, rectilinear_angle)
@@ -0,0 +1,68 @@
+"""
+Constraints on the shape and orientation of the rectangles the finders may return.
+"""
+
+import numpy as np
+from typing import NamedTuple, Tuple
+
+
+class RectangleConstraints(NamedTuple):
+    """
+    Limits applied while searching, so constrained answers are not filtered out afterwards.
+
+    Attributes:
+        min_side: Smallest allowed length of either side
+        max_aspect: Largest allowed ratio of the longer side to the shorter side
+        orientation: Preferred direction of the rectangle's sides in radians
+            (for example the direction of a street); a rectangle matches when
+            either of its sides is within ``orientation_tolerance`` of it
+        orientation_tolerance: Allowed deviation from ``orientation`` in radians
+    """
+    min_side: float = 0.0
+    max_aspect: float = None
+    orientation: float = None
+    orientation_tolerance: float = 0.0
+
+
+def pair_mask(point1: np.ndarray, points2: np.ndarray, constraints: RectangleConstraints) -> np.ndarray:
+    """
+    Select the base segments from one point that can carry a rectangle meeting the constraints.
+
+    Only the base length and direction are used, so no geometry call is made.
+
+    Args:
+        point1: First base point
+        points2: Candidate second base points, shape (N, 2)
+        constraints: Rectangle constraints
+
+    Returns:
+        Boolean array of shape (N,)
+    """
+    delta = points2 - point1
+    lengths = np.hypot(delta[:, 0], delta[:, 1])
+    mask = (lengths > 0) & (lengths >= constraints.min_side)
+    if constraints.orientation is not None:
+        # Sides repeat every quarter turn, so compare directions modulo pi/2
+        deviation = np.mod(np.arctan2(delta[:, 1], delta[:, 0]) - constraints.orientation, np.pi/2)
+        mask &= np.minimum(deviation, np.pi/2 - deviation) <= constraints.orientation_tolerance
+    return mask
+
+
+def side_range(length: float, constraints: RectangleConstraints) -> Tuple[float, float]:
+    """
+    Allowed range of the swept side for a base of the given length.
+
+    Args:
+        length: Length of the base segment
+        constraints: Rectangle constraints
+
+    Returns:
+        Tuple of (shortest, longest) allowed side; the longest is infinite
+        without an aspect-ratio limit
+    """
+    shortest = constraints.min_side
+    longest = np.inf
+    if constraints.max_aspect is not None:
+        shortest = max(shortest, length / constraints.max_aspect)
+        longest = length * constraints.max_aspect
+    return shortest, longest
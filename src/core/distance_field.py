@@ -0,0 +1,184 @@
+"""
+Signed-distance grid of a polygon for cheap bounds on candidate rectangles.
+
+The signed distance to the boundary (positive inside) is 1-Lipschitz, so the
+value at the nearest grid node bounds the value anywhere: for a point q and a
+node g, ``d(g) - |q - g| <= d(q) <= d(g) + |q - g|``. A point whose upper
+bound is negative is certainly outside. A rectangle swept from a base contains
+the perpendicular rays through the base's end and middle points, so the first
+certainly outside point on any of them caps the height. Each base costs a
+fixed number of grid reads.
+
+The field cannot certify that a base's rectangle is inside, because the base
+ends on the boundary where the distance is zero. Its height guesses are
+instead checked with one containment test of the whole rectangle, after which
+a stepping sweep may skip the heights below.
+"""
+
+import math
+import numpy as np
+from shapely.geometry import Polygon
+from typing import NamedTuple, Sequence, Tuple
+
+
+class QuickRejectStats(NamedTuple):
+    """How often a distance field settled a candidate without GEOS."""
+    bases: int
+    rejected: int
+    starts_tried: int
+    starts_accepted: int
+    reject_rate: float
+    start_hit_rate: float
+
+
+class DistanceField:
+    """Signed distance to the polygon boundary on a regular grid, positive inside."""
+
+    def __init__(self, polygon: Polygon, cell_size: float, max_cells: int = 1_000_000,
+                 chunk_size: int = 4_000_000):
+        """
+        Args:
+            polygon: Shapely polygon object (holes are respected)
+            cell_size: Requested grid spacing; enlarged if the grid would exceed max_cells
+            max_cells: Largest number of grid nodes
+            chunk_size: Largest number of (node, edge) pairs evaluated at once
+        """
+        rings = [np.asarray(ring.coords, dtype=float) for ring in [polygon.exterior, *polygon.interiors]]
+        starts = np.concatenate([ring[:-1] for ring in rings])
+        ends = np.concatenate([ring[1:] for ring in rings])
+        low, high = np.asarray(polygon.bounds[:2]), np.asarray(polygon.bounds[2:])
+        span = np.maximum(high - low, 1e-12)
+        cell_size = max(cell_size, math.sqrt(np.prod(span) / max_cells))
+        shape = np.ceil(span / cell_size).astype(int) + 3
+        while np.prod(shape) > max_cells:
+            cell_size *= 1.05
+            shape = np.ceil(span / cell_size).astype(int) + 3
+        self.cell_size = float(cell_size)
+        self.origin = low - cell_size
+        self.shape = (int(shape[1]), int(shape[0]))
+
+        xs = self.origin[0] + cell_size * np.arange(shape[0])
+        ys = self.origin[1] + cell_size * np.arange(shape[1])
+        nodes = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2)
+        along = ends - starts
+        lengths = np.maximum(np.sum(along * along, axis=1), 1e-300)
+        values = np.empty(len(nodes))
+        step = max(chunk_size // len(starts), 1)
+        for chunk in range(0, len(nodes), step):
+            points = nodes[chunk:chunk + step, None, :]
+            relative = points - starts
+            fraction = np.clip(np.sum(relative * along, axis=2) / lengths, 0, 1)
+            offsets = relative - fraction[..., None] * along
+            distance = np.sqrt(np.min(np.sum(offsets * offsets, axis=2), axis=1))
+            # Even-odd rule: count edges crossed by a ray towards +x
+            px, py = points[..., 0], points[..., 1]
+            straddles = (starts[:, 1] > py) != (ends[:, 1] > py)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                crossing_x = starts[:, 0] + (py - starts[:, 1]) * along[:, 0] / along[:, 1]
+            inside = np.count_nonzero(straddles & (px < crossing_x), axis=1) % 2 == 1
+            values[chunk:chunk + step] = np.where(inside, distance, -distance)
+        self.values = values.reshape(self.shape)
+
+        self.bases = self.rejected = self.starts_tried = self.starts_accepted = 0
+
+    def bounds(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bound the signed distance at arbitrary points from their nearest grid nodes.
+
+        Args:
+            points: Query points, shape (..., 2)
+
+        Returns:
+            Tuple of (lower, upper) bounds, shape (...)
+        """
+        cells = np.rint((points - self.origin) / self.cell_size).astype(int)
+        column = np.clip(cells[..., 0], 0, self.shape[1] - 1)
+        row = np.clip(cells[..., 1], 0, self.shape[0] - 1)
+        nodes = self.origin + self.cell_size * np.stack((column, row), axis=-1)
+        offset = np.hypot(points[..., 0] - nodes[..., 0], points[..., 1] - nodes[..., 1])
+        value = self.values[row, column]
+        return value - offset, value + offset
+
+    def height_limits(self, point1: np.ndarray, points2: np.ndarray, directions: np.ndarray,
+                      max_height: float, middle: bool = True, steps: int = 64) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bound how far bases from one point can be swept, from a fixed number of grid reads each.
+
+        Args:
+            point1: First base point
+            points2: Second base points, shape (N, 2)
+            directions: Unit sweep direction of every base, shape (N, 2)
+            max_height: Height beyond which no sweep is followed
+            middle: Also read the ray through each base's midpoint; only valid
+                when the swept rectangle is known to lie inside the polygon
+            steps: Number of reads along each ray
+
+        Returns:
+            Tuple of (ceilings, guesses): heights no sweep can reach (max_height
+            where the rays never certainly leave the polygon), and a cheaper
+            estimate of where the sweep stops, from the node values alone
+        """
+        stride = max(self.cell_size, max_height / steps)
+        heights = stride * np.arange(1, int(min(steps, math.ceil(max_height / stride))) + 1)
+        anchors = [np.broadcast_to(point1, points2.shape), points2]
+        if middle:
+            anchors.append((point1 + points2) / 2)
+        ceilings = np.full(len(points2), float(max_height))
+        guesses = np.full(len(points2), float(max_height))
+        for anchor in anchors:
+            rays = anchor[:, None, :] + heights[None, :, None] * directions[:, None, :]
+            lower, upper = self.bounds(rays)
+            value = (lower + upper) / 2
+            outside = upper < 0
+            ceilings = np.minimum(ceilings, np.where(outside.any(axis=1), heights[np.argmax(outside, axis=1)], np.inf))
+            leaving = value < 0
+            guesses = np.minimum(guesses, np.where(leaving.any(axis=1), heights[np.argmax(leaving, axis=1)], np.inf))
+        return ceilings, np.maximum(guesses - stride, 0.0)
+
+    def chord_leaves(self, point1: np.ndarray, points2: np.ndarray,
+                     fractions: Sequence[float] = (0.25, 0.5, 0.75)) -> np.ndarray:
+        """
+        Find bases whose chord certainly leaves the polygon, so that no rectangle can stand on them.
+
+        Args:
+            point1: First base point
+            points2: Second base points, shape (N, 2)
+            fractions: Positions along the chord that are read
+
+        Returns:
+            Boolean array, True where a read point is certainly outside
+        """
+        chords = point1 + np.asarray(fractions)[None, :, None] * (points2 - point1)[:, None, :]
+        return np.any(self.bounds(chords)[1] < 0, axis=1)
+
+    def feasible_start(self, polygon: Polygon, point1: np.ndarray, point2: np.ndarray,
+                       direction: np.ndarray, height: float) -> float:
+        """
+        Check a guessed height with one containment test of the whole rectangle.
+
+        If the rectangle of the given height over the base lies inside the
+        polygon, so does every line swept below it, and a stepping sweep may
+        resume at that height.
+
+        Args:
+            polygon: Shapely polygon object
+            point1: First base point
+            point2: Second base point
+            direction: Unit sweep direction
+            height: Guessed height, e.g. from ``height_limits``
+
+        Returns:
+            The height if the rectangle is inside the polygon, 0.0 otherwise
+        """
+        self.starts_tried += 1
+        offset = direction * height
+        if not polygon.contains(Polygon([point1, point2, point2 + offset, point1 + offset])):
+            return 0.0
+        self.starts_accepted += 1
+        return height
+
+    def stats(self) -> QuickRejectStats:
+        """Counts and rates of candidates settled by the field so far."""
+        return QuickRejectStats(self.bases, self.rejected, self.starts_tried, self.starts_accepted,
+                                self.rejected / self.bases if self.bases else 0.0,
+                                self.starts_accepted / self.starts_tried if self.starts_tried else 0.0)
@@ -4,10 +4,20 @@ Polygon processing utilities for sampling and analyzing polygon boundaries.
 
 import numpy as np
 import math
+from typing import NamedTuple, Tuple
 from shapely.geometry import Polygon
 from .geometry_utils import azimuth, increment
 
 
+class SimplificationReport(NamedTuple):
+    """Summary of an inward simplification pass."""
+    original_vertices: int
+    simplified_vertices: int
+    vertices_removed: int
+    area_lost: float
+    tolerance: float
+
+
 def split_into_points(polygon: Polygon, point_gap: float) -> np.ndarray:
     """
     Split polygon boundary into evenly spaced points.
@@ -52,6 +62,117 @@ def split_into_points(polygon: Polygon, point_gap: float) -> np.ndarray:
     return edge_points
 
 
+class BoundarySamples(NamedTuple):
+    """
+    Boundary samples with the local geometry of the edges they lie on.
+    
+    Attributes:
+        points: Sample points, identical to ``split_into_points``, shape (N, 2)
+        edges: Index of the exterior edge each sample lies on and of the edge
+            ending at it; the two differ only for vertex samples, shape (N, 2)
+        normals: Unit inward normals of those two edges, shape (N, 2, 2)
+        reflex: True for vertex samples with an interior angle above pi, shape (N,)
+        clearance: Distance to the nearest boundary edge the sample does not lie on, shape (N,)
+    """
+    points: np.ndarray
+    edges: np.ndarray
+    normals: np.ndarray
+    reflex: np.ndarray
+    clearance: np.ndarray
+
+
+def sample_boundary(polygon: Polygon, point_gap: float, chunk_size: int = 4096,
+                    points: np.ndarray = None) -> BoundarySamples:
+    """
+    Split the polygon boundary like ``split_into_points`` and describe each sample's edges.
+    
+    Args:
+        polygon: Shapely polygon object
+        point_gap: Distance between consecutive points
+        chunk_size: Number of samples measured against all edges at once
+        points: Optional samples in the layout of ``split_into_points`` with the
+            same point gap (e.g. from ``SharedBoundary.samples``) to use instead
+        
+    Returns:
+        BoundarySamples
+        
+    Raises:
+        ValueError: If the given points do not follow that layout
+    """
+    coords = list(polygon.exterior.coords[:-1])
+    count = len(coords)
+    # split_into_points emits the first vertex, then each edge's inner points followed by its end vertex
+    on_edge, ending = [0], [count - 1]
+    for index, vertex1 in enumerate(coords):
+        inner = int(math.dist(vertex1, coords[(index + 1) % count]) // point_gap)
+        on_edge += [index] * inner + [(index + 1) % count]
+        ending += [index] * (inner + 1)
+    edges = np.stack((on_edge, ending), axis=1)
+    
+    ring = np.array(coords, dtype=float)
+    vectors = np.roll(ring, -1, axis=0) - ring
+    orientation = 1.0 if signed_area(ring) > 0 else -1.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inward = orientation * np.stack((-vectors[:, 1], vectors[:, 0]), axis=1) / \
+            np.hypot(vectors[:, 0], vectors[:, 1])[:, None]
+    turns = orientation * (vectors[ending, 0] * vectors[on_edge, 1] - vectors[ending, 1] * vectors[on_edge, 0])
+    reflex = (edges[:, 0] != edges[:, 1]) & (turns < 0)
+    
+    # Distance to every edge of every ring, leaving out the sample's own edges
+    if points is None:
+        points = split_into_points(polygon, point_gap)
+    elif len(points) != len(edges):
+        raise ValueError(f"Expected {len(edges)} samples for this polygon and point gap, got {len(points)}")
+    rings = [ring] + [np.array(interior.coords[:-1], dtype=float) for interior in polygon.interiors]
+    starts = np.concatenate(rings)
+    ends = np.concatenate([np.roll(part, -1, axis=0) for part in rings])
+    clearance = np.empty(len(points))
+    for chunk in range(0, len(points), chunk_size):
+        relative = points[chunk:chunk + chunk_size, None, :] - starts[None]
+        along = ends - starts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.clip(np.sum(relative * along, axis=2) / np.sum(along * along, axis=1), 0, 1)
+        offsets = relative - np.nan_to_num(fraction)[..., None] * along
+        distances = np.hypot(offsets[..., 0], offsets[..., 1])
+        rows = np.arange(len(distances))[:, None]
+        distances[rows, edges[chunk:chunk + chunk_size]] = np.inf
+        clearance[chunk:chunk + chunk_size] = distances.min(axis=1)
+    
+    return BoundarySamples(points, edges, inward[edges], reflex, clearance)
+
+
+def nudged_inside(samples: BoundarySamples, indices: np.ndarray, directions: np.ndarray,
+                  step: float) -> np.ndarray:
+    """
+    Decide from the inward normals whether samples moved by a small step lie strictly inside.
+    
+    Within its clearance a sample only sees the one or two edges it lies on,
+    so the moved point is inside exactly when the direction points into the
+    wedge those edges bound: ahead of both normals at a convex vertex, ahead
+    of either at a reflex one.
+    
+    Args:
+        samples: Output of ``sample_boundary``
+        indices: Indices of the samples to move, shape (M,)
+        directions: Unit directions to move them in, shape (M, 2)
+        step: Distance to move
+        
+    Returns:
+        Array with 1 where the moved point is inside, 0 where it is not, and -1
+        where the step reaches other edges or ends too close to an edge to
+        decide without a containment test
+    """
+    indices = np.asarray(indices)
+    points = samples.points[indices]
+    dots = np.einsum('mkj,mj->mk', samples.normals[indices], directions)
+    # Points this close to an edge are left to the containment test's own arithmetic
+    slack = 64 * np.finfo(float).eps * (np.abs(points).max(axis=1) + step)
+    decided = (samples.clearance[indices] > step + slack) & np.all(step * np.abs(dots) > slack[:, None], axis=1)
+    ahead = dots > 0
+    inside = np.where(samples.reflex[indices], ahead.any(axis=1), ahead.all(axis=1))
+    return np.where(decided, inside.astype(int), -1)
+
+
 def min_extension(polygon: Polygon) -> float:
     """
     Calculate the minimum extension distance that covers the entire polygon.
@@ -77,4 +198,163 @@ def tiny_increment(polygon: Polygon, point_gap: float) -> float:
     Returns:
         Tiny increment value
     """
-    return point_gap / min_extension(polygon) 
\ No newline at end of file
+    return point_gap / min_extension(polygon) 
+
+
+def _largest_part(geometry) -> Polygon:
+    """Return the largest polygon of a (possibly multi-part) geometry."""
+    if geometry.geom_type == 'MultiPolygon':
+        return max(geometry.geoms, key=lambda part: part.area)
+    if geometry.geom_type == 'Polygon':
+        return geometry
+    return Polygon()
+
+
+def simplify_inward(polygon: Polygon, tolerance: float) -> Tuple[Polygon, SimplificationReport]:
+    """
+    Simplify a polygon so that the result always lies inside the original.
+    
+    The boundary is first eroded by ``tolerance`` and the eroded shape is then
+    simplified with the same tolerance. Douglas-Peucker moves the boundary by
+    at most ``tolerance``, so the simplified shape stays within the original
+    and any rectangle inscribed in it is also inscribed in the original.
+    
+    Args:
+        polygon: Shapely polygon object
+        tolerance: Maximum boundary displacement allowed by the simplification
+        
+    Returns:
+        Tuple of (simplified polygon, SimplificationReport)
+    """
+    if tolerance <= 0:
+        raise ValueError("Simplification tolerance must be positive")
+    
+    original_vertices = len(polygon.exterior.coords) - 1
+    simplified = polygon
+    
+    # Mitred erosion keeps straight runs straight; fall back to the exact
+    # (rounded) erosion if the mitred shape pokes outside the original
+    for join_style in ('mitre', 'round'):
+        eroded = _largest_part(polygon.buffer(-tolerance, join_style=join_style))
+        if eroded.is_empty:
+            break
+        candidate = _largest_part(eroded.simplify(tolerance, preserve_topology=True))
+        if not candidate.is_empty and polygon.covers(candidate):
+            simplified = candidate
+            break
+    
+    simplified_vertices = len(simplified.exterior.coords) - 1
+    report = SimplificationReport(
+        original_vertices=original_vertices,
+        simplified_vertices=simplified_vertices,
+        vertices_removed=original_vertices - simplified_vertices,
+        area_lost=polygon.area - simplified.area,
+        tolerance=tolerance,
+    )
+    return simplified, report
+
+
+def signed_area(coords: np.ndarray) -> float:
+    """
+    Calculate the signed area of a ring (positive for counter-clockwise rings).
+    
+    Args:
+        coords: Ring coordinates without the closing point, shape (E, 2)
+        
+    Returns:
+        Signed area
+    """
+    x, y = coords[:, 0], coords[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def blocking_heights(points1: np.ndarray, points2: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                     inward: np.ndarray) -> np.ndarray:
+    """
+    Compute the height at which each edge blocks the sweep of each base segment.
+
+    All arguments broadcast against each other over their leading axes, so
+    this serves both every pair against every edge and flat lists of
+    (pair, edge) rows.
+
+    Args:
+        points1: First base points, shape (..., 2)
+        points2: Second base points, shape (..., 2)
+        starts: Edge start points, shape (..., 2)
+        ends: Edge end points, shape (..., 2)
+        inward: Edge normals pointing into the polygon, shape (..., 2)
+
+    Returns:
+        Array of blocking heights (infinite where the edge does not block)
+    """
+    base = points2 - points1
+    length = np.hypot(base[..., 0], base[..., 1])
+    u = base / length[..., None]
+    n = np.stack((-u[..., 1], u[..., 0]), axis=-1)
+    eps = 1e-9 * np.maximum(length, 1.0)
+
+    # Edge endpoints in the (along base, perpendicular) frame of every pair
+    rel_a = starts - points1
+    rel_b = ends - points1
+    s_a = np.sum(rel_a * u, axis=-1)
+    s_b = np.sum(rel_b * u, axis=-1)
+    t_a = np.sum(rel_a * n, axis=-1)
+    t_b = np.sum(rel_b * n, axis=-1)
+
+    # Clip every edge to the strip 0 <= s <= L
+    ds = s_b - s_a
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lam0 = np.where(np.abs(ds) > 0, (0 - s_a) / ds, -np.inf)
+        lam1 = np.where(np.abs(ds) > 0, (length - s_a) / ds, np.inf)
+    lam_lo = np.clip(np.minimum(lam0, lam1), 0, 1)
+    lam_hi = np.clip(np.maximum(lam0, lam1), 0, 1)
+    # Pieces must reach the open strip; edges parallel to the strip sides only touch, and
+    # edges leaving a base endpoint outwards can be clipped to a rounding-sized sliver
+    in_strip = ((lam_hi - lam_lo) * np.abs(ds) > eps) & (np.abs(ds) > eps)
+    t_lo = t_a + lam_lo * (t_b - t_a)
+    t_hi = t_a + lam_hi * (t_b - t_a)
+    t_min = np.minimum(t_lo, t_hi)
+    t_max = np.maximum(t_lo, t_hi)
+
+    # Pieces above the base block at their lowest point, pieces reaching the
+    # base from above block immediately, and pieces lying on the base block
+    # only when the polygon interior is on the other side
+    on_base = (np.abs(t_min) <= eps) & (np.abs(t_max) <= eps)
+    outward = np.sum(inward * n, axis=-1) < 0
+    blocking = np.where(t_min > eps, t_min, np.where(t_max > eps, 0.0, np.inf))
+    blocking = np.where(on_base, np.where(outward, 0.0, np.inf), blocking)
+    return np.where(in_strip, blocking, np.inf)
+
+
+def sweep_heights(points1: np.ndarray, points2: np.ndarray, coords: np.ndarray,
+                  chunk_size: int = 4096) -> np.ndarray:
+    """
+    Compute how far each base segment can be swept to its left inside the polygon.
+
+    This is the continuous limit of the stepping sweep in
+    ``general_algorithm.extend_perpendicular``: the lowest boundary point above
+    the base and strictly between the two perpendiculars through its endpoints.
+
+    Args:
+        points1: Array of first base points, shape (P, 2)
+        points2: Array of second base points, shape (P, 2)
+        coords: Polygon ring without its closing point, shape (E, 2)
+        chunk_size: Number of pairs processed at once
+
+    Returns:
+        Array of sweep heights, shape (P,)
+    """
+    starts = coords
+    ends = np.roll(coords, -1, axis=0)
+    edge_vectors = ends - starts
+    # Inward normals of the edges from the ring orientation
+    orientation = 1.0 if signed_area(coords) > 0 else -1.0
+    inward = orientation * np.stack((-edge_vectors[:, 1], edge_vectors[:, 0]), axis=1)
+
+    heights = np.empty(len(points1))
+    for chunk in range(0, len(points1), chunk_size):
+        p1 = points1[chunk:chunk + chunk_size, None, :]
+        p2 = points2[chunk:chunk + chunk_size, None, :]
+        heights[chunk:chunk + chunk_size] = blocking_heights(p1, p2, starts[None], ends[None], inward[None]).min(axis=1)
+
+    return heights
@@ -0,0 +1,233 @@
+"""
+Uniform-grid edge index for ray shooting and sweep queries against a polygon.
+
+Every boundary edge, holes included, is registered in the grid cells its
+bounding box overlaps. A ray walks the grid cell by cell (DDA traversal)
+and only tests the edges of the cells it passes, so its cost grows with the
+number of cells crossed (about the square root of the edge count) rather
+than with the edge count. A sweep of a base segment examines bands of
+doubling height, so only edges near the base are tested. All queries are
+batched over NumPy arrays.
+"""
+
+import math
+import numpy as np
+from shapely.geometry import Polygon
+from .polygon_processor import blocking_heights, signed_area
+
+
+class PolygonRayIndex:
+    """
+    Grid of edge buckets built once per polygon.
+
+    Attributes:
+        starts: Edge start points, shape (E, 2)
+        ends: Edge end points, shape (E, 2)
+        inward: Edge normals pointing into the polygon, shape (E, 2)
+        origin: Lower-left corner of the grid
+        cell_size: Side length of the square cells
+        shape: Number of cells as (columns, rows)
+    """
+
+    def __init__(self, polygon: Polygon, edges_per_cell: float = 4.0):
+        """
+        Build the index.
+
+        Args:
+            polygon: Shapely polygon object, with or without holes
+            edges_per_cell: Average number of edges per cell the grid is sized for
+        """
+        starts, ends, inward = [], [], []
+        for ring, interior in [(polygon.exterior, False)] + [(ring, True) for ring in polygon.interiors]:
+            coords = np.asarray(ring.coords[:-1], dtype=float)
+            vectors = np.roll(coords, -1, axis=0) - coords
+            # The polygon lies left of a counter-clockwise exterior and right of a counter-clockwise hole
+            orientation = (1.0 if signed_area(coords) > 0 else -1.0) * (-1.0 if interior else 1.0)
+            starts.append(coords)
+            ends.append(coords + vectors)
+            inward.append(orientation * np.stack((-vectors[:, 1], vectors[:, 0]), axis=1))
+        self.starts = np.concatenate(starts)
+        self.ends = np.concatenate(ends)
+        self.inward = np.concatenate(inward)
+
+        min_x, min_y, max_x, max_y = polygon.bounds
+        width, height = max(max_x - min_x, 1e-12), max(max_y - min_y, 1e-12)
+        cells = max(len(self.starts) / edges_per_cell, 1.0)
+        self.cell_size = math.sqrt(width * height / cells)
+        self.shape = (max(int(math.ceil(width / self.cell_size)), 1), max(int(math.ceil(height / self.cell_size)), 1))
+        self.origin = np.array([min_x, min_y])
+
+        # Register every edge in the cells its (slightly grown) bounding box overlaps
+        slack = 1e-9 * self.cell_size
+        low = self._cell(np.minimum(self.starts, self.ends) - slack)
+        high = self._cell(np.maximum(self.starts, self.ends) + slack)
+        cell_ids, edge_ids = self._cells_in_boxes(low, high)
+        order = np.argsort(cell_ids, kind='stable')
+        self._bucket_edges = edge_ids[order]
+        self._offsets = np.searchsorted(cell_ids[order], np.arange(self.shape[0] * self.shape[1] + 1))
+
+    def _cell(self, points: np.ndarray) -> np.ndarray:
+        """Column and row of the cell holding each point, clamped to the grid."""
+        cells = np.floor((points - self.origin) / self.cell_size).astype(int)
+        return np.clip(cells, 0, np.array(self.shape) - 1)
+
+    def _cells_in_boxes(self, low: np.ndarray, high: np.ndarray) -> tuple:
+        """Flat cell ids of every cell in each box of cells, with the index of the box."""
+        columns = high[:, 0] - low[:, 0] + 1
+        counts = columns * (high[:, 1] - low[:, 1] + 1)
+        boxes = np.repeat(np.arange(len(low)), counts)
+        position = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        x = low[boxes, 0] + position % columns[boxes]
+        y = low[boxes, 1] + position // columns[boxes]
+        return y * self.shape[0] + x, boxes
+
+    def _gather(self, cells: np.ndarray) -> tuple:
+        """Edges of each cell as flat (row, edge) arrays, where row indexes ``cells``."""
+        counts = self._offsets[cells + 1] - self._offsets[cells]
+        rows = np.repeat(np.arange(len(cells)), counts)
+        position = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return rows, self._bucket_edges[self._offsets[cells][rows] + position]
+
+    def first_hit(self, origins: np.ndarray, directions: np.ndarray, min_distance: float = 0.0) -> np.ndarray:
+        """
+        Find the distance from each origin to the first boundary crossing along its direction.
+
+        Edges parallel to a ray are never hit, and a ray through a vertex hits
+        it.
+
+        Args:
+            origins: Ray origins, shape (R, 2)
+            directions: Ray directions (any length), shape (R, 2)
+            min_distance: Hits at or closer than this distance are ignored, so
+                rays may start on the boundary
+
+        Returns:
+            Array of distances along the unit directions, infinite if nothing is hit
+        """
+        origins = np.atleast_2d(np.asarray(origins, dtype=float))
+        directions = np.atleast_2d(np.asarray(directions, dtype=float))
+        directions = directions / np.hypot(directions[:, 0], directions[:, 1])[:, None]
+        hits = np.full(len(origins), np.inf)
+
+        # Clip every ray to the grid and start at its first cell
+        grid_low, grid_high = self.origin, self.origin + np.array(self.shape) * self.cell_size
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inverse = 1.0 / directions
+            near = np.where(np.isfinite(inverse), np.minimum((grid_low - origins) * inverse,
+                                                             (grid_high - origins) * inverse), -np.inf)
+            far = np.where(np.isfinite(inverse), np.maximum((grid_low - origins) * inverse,
+                                                            (grid_high - origins) * inverse), np.inf)
+        inside = (origins >= grid_low) & (origins <= grid_high)
+        near = np.where(np.isfinite(inverse) | inside, near, np.inf)
+        far = np.where(np.isfinite(inverse) | inside, far, -np.inf)
+        enter = np.maximum(np.maximum(near[:, 0], near[:, 1]), min_distance)
+        leave = np.minimum(far[:, 0], far[:, 1])
+        active = np.flatnonzero(enter <= leave)
+        if len(active) == 0:
+            return hits
+
+        cells = self._cell(origins[active] + enter[active, None] * directions[active])
+        step = np.where(directions[active] >= 0, 1, -1)
+        with np.errstate(divide='ignore'):
+            boundary = self.origin + (cells + (step > 0)) * self.cell_size
+            next_cross = np.where(directions[active] != 0,
+                                  (boundary - origins[active]) * inverse[active], np.inf)
+            delta = np.where(directions[active] != 0, self.cell_size * np.abs(inverse[active]), np.inf)
+
+        while len(active):
+            exit_distance = np.minimum(next_cross[:, 0], next_cross[:, 1])
+            rows, edges = self._gather(cells[:, 1] * self.shape[0] + cells[:, 0])
+            rays = active[rows]
+            edge_vectors = self.ends[edges] - self.starts[edges]
+            offset = self.starts[edges] - origins[rays]
+            denominator = directions[rays, 0] * edge_vectors[:, 1] - directions[rays, 1] * edge_vectors[:, 0]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                distance = (offset[:, 0] * edge_vectors[:, 1] - offset[:, 1] * edge_vectors[:, 0]) / denominator
+                along = (offset[:, 0] * directions[rays, 1] - offset[:, 1] * directions[rays, 0]) / denominator
+            # Only hits inside the current cell are final; later ones are found in their own cell
+            valid = ((denominator != 0) & (along >= 0) & (along <= 1) & (distance > min_distance) &
+                     (distance <= exit_distance[rows] * (1 + 1e-12) + 1e-12 * self.cell_size))
+            np.minimum.at(hits, rays[valid], distance[valid])
+
+            axis = (next_cross[:, 1] < next_cross[:, 0]).astype(int)
+            moving = np.arange(len(active))
+            cells[moving, axis] += step[moving, axis]
+            next_cross[moving, axis] += delta[moving, axis]
+            keep = (np.isinf(hits[active]) & np.all((cells >= 0) & (cells < np.array(self.shape)), axis=1))
+            active, cells, step, next_cross, delta = active[keep], cells[keep], step[keep], next_cross[keep], delta[keep]
+        return hits
+
+    def sweep_heights(self, points1: np.ndarray, points2: np.ndarray, min_area: float = 0.0) -> np.ndarray:
+        """
+        Compute how far each base segment can be swept to its left inside the polygon.
+
+        Gives the same heights as ``polygon_processor.sweep_heights`` (holes
+        included) but tests only the edges in bands of doubling height above
+        each base.
+
+        Args:
+            points1: Array of first base points, shape (P, 2)
+            points2: Array of second base points, shape (P, 2)
+            min_area: Pairs found unable to carry a rectangle larger than this
+                stop early; their height is then only an upper bound
+
+        Returns:
+            Array of sweep heights, shape (P,)
+        """
+        points1 = np.atleast_2d(np.asarray(points1, dtype=float))
+        points2 = np.atleast_2d(np.asarray(points2, dtype=float))
+        base = points2 - points1
+        length = np.hypot(base[:, 0], base[:, 1])
+        normal = np.stack((-base[:, 1], base[:, 0]), axis=1) / np.where(length > 0, length, 1.0)[:, None]
+        # A base of zero length carries no rectangle
+        heights = np.where(length > 0, np.inf, 0.0)
+        reach = self.cell_size * math.hypot(*self.shape)
+        pending = np.flatnonzero(length > 0)
+        # Start at the height a base needs to beat min_area
+        band = np.maximum(self.cell_size, min_area / np.where(length > 0, length, np.inf))
+        if min_area > 0 and len(pending):
+            # Any subset of edges bounds the height from above, so first try the cells on the
+            # perpendicular through each base's midpoint and drop the bases that cannot win
+            counts = np.ceil(band[pending] / (self.cell_size / 2)).astype(int) + 1
+            rows = np.repeat(pending, counts)
+            steps = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            probes = (points1[rows] + points2[rows]) / 2 + normal[rows] * (steps * self.cell_size / 2)[:, None]
+            cells = self._cell(probes)
+            keys = np.unique(rows * (self.shape[0] * self.shape[1]) + cells[:, 1] * self.shape[0] + cells[:, 0])
+            cell_rows, edges = self._gather(keys % (self.shape[0] * self.shape[1]))
+            pairs = keys[cell_rows] // (self.shape[0] * self.shape[1])
+            bound = np.full(len(points1), np.inf)
+            np.minimum.at(bound, pairs, blocking_heights(points1[pairs], points2[pairs], self.starts[edges],
+                                                         self.ends[edges], self.inward[edges]))
+            losing = bound[pending] * length[pending] <= min_area
+            heights[pending[losing]] = bound[pending[losing]]
+            pending = pending[~losing]
+        while len(pending):
+            # Edges below the band's top and behind the base are all in the band's cells
+            p1, p2, top = points1[pending], points2[pending], band[pending, None]
+            corners = np.stack((p1 - normal[pending] * self.cell_size, p2 - normal[pending] * self.cell_size,
+                                p1 + normal[pending] * top, p2 + normal[pending] * top))
+            cell_ids, boxes = self._cells_in_boxes(self._cell(corners.min(axis=0)), self._cell(corners.max(axis=0)))
+            # Of the bounding box, keep the cells that can overlap the (rotated) band
+            centres = self.origin + (np.stack((cell_ids % self.shape[0], cell_ids // self.shape[0]), axis=1) + 0.5) \
+                * self.cell_size
+            relative = centres - p1[boxes]
+            along = np.sum(relative * (p2 - p1)[boxes], axis=1) / length[pending][boxes]
+            across = np.sum(relative * normal[pending][boxes], axis=1)
+            radius = self.cell_size * math.sqrt(0.5)
+            near = ((along >= -radius) & (along <= length[pending][boxes] + radius) &
+                    (across >= -self.cell_size - radius) & (across <= top[boxes, 0] + radius))
+            cell_ids, boxes = cell_ids[near], boxes[near]
+            rows, edges = self._gather(cell_ids)
+            pairs = pending[boxes[rows]]
+            blocking = blocking_heights(points1[pairs], points2[pairs], self.starts[edges], self.ends[edges],
+                                        self.inward[edges])
+            found = np.full(len(points1), np.inf)
+            np.minimum.at(found, pairs, blocking)
+            # A height inside the band is exact; beyond it a nearer edge may lie outside the band's cells
+            done = ((found[pending] <= band[pending]) | (band[pending] >= reach) |
+                    (found[pending] * length[pending] <= min_area))
+            heights[pending[done]] = found[pending[done]]
+            pending = pending[~done]
+            band[pending] *= 2
+        return heights
@@ -0,0 +1,198 @@
+"""
+Mirror and rotational symmetries of a polygon and their action on boundary samples.
+
+A symmetry of the vertex ring maps every candidate base pair to a congruent
+pair with the same rectangle area. The finders keep their usual samples and
+skip a pair whenever a symmetry maps it onto another pair of samples that is
+evaluated anyway, so the answer is the same as without symmetry.
+"""
+
+import math
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from typing import List, NamedTuple, Tuple
+
+
+class Symmetry(NamedTuple):
+    """
+    Isometry that maps a polygon's vertex ring onto itself.
+
+    Attributes:
+        kind: 'rotation' or 'reflection'
+        angle: Rotation angle, or direction of the mirror axis, in radians
+        center: Fixed point of the rotation, or a point on the mirror axis
+        vertex: Index of the vertex that the first vertex is mapped to
+    """
+    kind: str
+    angle: float
+    center: Tuple[float, float]
+    vertex: int
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Linear part of the isometry as a 2x2 array."""
+        if self.kind == 'rotation':
+            cos, sin = math.cos(self.angle), math.sin(self.angle)
+            return np.array([[cos, -sin], [sin, cos]])
+        cos, sin = math.cos(2 * self.angle), math.sin(2 * self.angle)
+        return np.array([[cos, sin], [sin, -cos]])
+
+    def apply(self, points: np.ndarray) -> np.ndarray:
+        """Map points of shape (N, 2) through the isometry."""
+        center = np.asarray(self.center, dtype=float)
+        return (np.asarray(points, dtype=float) - center) @ self.matrix.T + center
+
+
+class SymmetricSamples(NamedTuple):
+    """
+    Boundary samples together with where a polygon's symmetries map them.
+
+    Attributes:
+        points: Sample points in boundary order, shape (N, 2)
+        permutations: Index of each sample's image under every symmetry, or -1, shape (G, N)
+        reflections: Whether each symmetry reverses orientation, shape (G,)
+    """
+    points: np.ndarray
+    permutations: np.ndarray
+    reflections: np.ndarray
+
+
+def _ring(polygon_coords: list) -> np.ndarray:
+    """Vertex ring without the closing vertex and without zero-length edges."""
+    coords = np.asarray(polygon_coords, dtype=float)
+    if len(coords) > 1 and np.all(coords[0] == coords[-1]):
+        coords = coords[:-1]
+    keep = np.any(coords != np.roll(coords, -1, axis=0), axis=1)
+    return coords[keep]
+
+
+def detect_symmetries(polygon_coords: list, tolerance: float = 1e-9) -> List[Symmetry]:
+    """
+    Find the rotations and reflections that map a polygon's vertex ring onto itself.
+
+    Every symmetry fixes the centroid and maps vertices to vertices, so each
+    candidate is fixed by where it sends the vertex farthest from the
+    centroid. Only the ring is examined, so a redundant collinear vertex on
+    one side hides a symmetry rather than inventing one.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        tolerance: Allowed vertex mismatch as a fraction of the bounding-box diagonal
+
+    Returns:
+        List of Symmetry, without the identity
+    """
+    coords = _ring(polygon_coords)
+    count = len(coords)
+    centroid = Polygon(coords).centroid
+    center = np.array([centroid.x, centroid.y])
+    offsets = coords - center
+    slack = tolerance * math.hypot(*np.ptp(coords, axis=0))
+    radii = np.hypot(offsets[:, 0], offsets[:, 1])
+    reference = int(np.argmax(radii))
+    indices = np.arange(count)
+
+    symmetries = []
+    for target in np.flatnonzero(np.abs(radii - radii[reference]) <= slack):
+        # Orientation-preserving: shift the ring
+        rotation = math.atan2(offsets[target, 1], offsets[target, 0]) - \
+            math.atan2(offsets[reference, 1], offsets[reference, 0])
+        candidate = Symmetry('rotation', float(np.mod(rotation, 2 * np.pi)), tuple(center),
+                             int((target - reference) % count))
+        if candidate.vertex and np.all(np.hypot(*(candidate.apply(coords) -
+                                                  coords[(indices + candidate.vertex) % count]).T) <= slack):
+            symmetries.append(candidate)
+
+        # Orientation-reversing: flip the ring; the axis bisects the reference and its image
+        bisector = offsets[reference] / radii[reference] + offsets[target] / radii[target]
+        if np.hypot(*bisector) <= 1e-12:
+            bisector = np.array([-offsets[reference, 1], offsets[reference, 0]])
+        axis = float(np.mod(math.atan2(bisector[1], bisector[0]), np.pi))
+        candidate = Symmetry('reflection', axis, tuple(center), int((reference + target) % count))
+        if np.all(np.hypot(*(candidate.apply(coords) - coords[(candidate.vertex - indices) % count]).T) <= slack):
+            symmetries.append(candidate)
+    return symmetries
+
+
+def sample_orbits(points: np.ndarray, symmetries: List[Symmetry], tolerance: float = 1e-9) -> SymmetricSamples:
+    """
+    Match the images of boundary samples under a polygon's symmetries to the samples.
+
+    The samples are used as given, so a finder keeps exactly the pairs of a
+    run without symmetry and only skips the ones it can map onto others.
+    Samples whose image is not itself a sample, for instance on an edge
+    whose length is not a multiple of the point gap, are left unmatched.
+
+    Args:
+        points: Boundary samples, shape (N, 2), e.g. from ``split_into_points``
+        symmetries: Output of ``detect_symmetries`` for the sampled polygon
+        tolerance: Allowed image mismatch as a fraction of the bounding-box diagonal
+
+    Returns:
+        SymmetricSamples; unmatched images are -1 in the permutations
+    """
+    points = np.asarray(points, dtype=float)
+    slack = tolerance * math.hypot(*np.ptp(points, axis=0))
+    tree = shapely.STRtree(shapely.points(points))
+    permutations = np.full((len(symmetries), len(points)), -1, dtype=int)
+    for row, symmetry in zip(permutations, symmetries):
+        found, matches = tree.query_nearest(shapely.points(symmetry.apply(points)), max_distance=slack,
+                                            all_matches=False)
+        row[found] = matches
+    reflections = np.array([symmetry.kind == 'reflection' for symmetry in symmetries], dtype=bool)
+    return SymmetricSamples(points, permutations, reflections)
+
+
+def canonical_pair_mask(index: int, samples: SymmetricSamples, ordered: bool = True) -> np.ndarray:
+    """
+    Select the base pairs from one sample that represent their orbit under the symmetries.
+
+    A pair is skipped when a symmetry maps it onto a pair of samples that
+    comes earlier in lexicographic index order. That pair has the same
+    rectangle area and is either kept or skipped for an even earlier one, so
+    every area is still evaluated at least once.
+
+    Args:
+        index: Index of the first base point
+        samples: Output of ``sample_orbits``
+        ordered: True if the rectangle lies on a fixed side of point1 -> point2
+            (the general engine), so a reflection also swaps the two points;
+            False if the side is found from the polygon (the convex engine)
+
+    Returns:
+        Boolean array over the samples, True for second points to evaluate
+    """
+    others = np.arange(len(samples.points))
+    keep = np.ones(len(others), dtype=bool)
+    for permutation, reflection in zip(samples.permutations, samples.reflections):
+        if ordered and reflection:
+            first, second = permutation[others], permutation[index]
+        else:
+            first, second = permutation[index], permutation[others]
+        matched = (first >= 0) & (second >= 0)
+        keep &= ~matched | (index < first) | ((index == first) & (others <= second))
+    return keep
+
+
+def orbit_pairs(index: int, other: int, samples: SymmetricSamples, ordered: bool = True) -> List[Tuple[int, int]]:
+    """
+    List the images of one base pair that are pairs of samples.
+
+    Args:
+        index: Index of the first base point
+        other: Index of the second base point
+        samples: Output of ``sample_orbits``
+        ordered: As in ``canonical_pair_mask``
+
+    Returns:
+        Distinct (first, second) index pairs other than the pair itself
+    """
+    pairs = []
+    for permutation, reflection in zip(samples.permutations, samples.reflections):
+        first, second = int(permutation[index]), int(permutation[other])
+        if ordered and reflection:
+            first, second = second, first
+        if first >= 0 and second >= 0 and (first, second) != (index, other) and (first, second) not in pairs:
+            pairs.append((first, second))
+    return pairs
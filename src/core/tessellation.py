@@ -0,0 +1,85 @@
+"""
+Boundary sampling shared across the polygons of a tessellated layer.
+
+In parcel and building layers neighbouring polygons share boundary
+segments. ``SharedBoundary`` keys every segment by its two end vertices,
+samples it once in a canonical direction, and assembles each polygon's
+samples from references into that table, reversing the segments a polygon
+runs along the other way. Segments are matched on exact vertex coordinates,
+as neighbours cut from the same source layer have them; a vertex of one
+polygon lying inside a neighbour's edge (a T-junction) leaves both segments
+unshared.
+"""
+
+import math
+import numpy as np
+from shapely.geometry import Polygon
+from typing import List, Sequence
+from .geometry_utils import azimuth, increment
+
+
+class SharedBoundary:
+    """Edge table of a polygon layer with the samples of every distinct segment."""
+
+    def __init__(self, rings: Sequence[list], point_gap: float):
+        """
+        Args:
+            rings: Exterior coordinates of every polygon, as passed to the finders
+            point_gap: Distance between consecutive points
+        """
+        self.point_gap = point_gap
+        self.segments: List[np.ndarray] = []
+        self._keys = {}
+        self._polygons = []
+        uses = []
+        for coords in rings:
+            ring = [tuple(map(float, point)) for point in Polygon(coords).exterior.coords[:-1]]
+            segments, reversed_ = [], []
+            for start, end in zip(ring, ring[1:] + ring[:1]):
+                key = (start, end) if start <= end else (end, start)
+                if key not in self._keys:
+                    self._keys[key] = len(self.segments)
+                    self.segments.append(self._sample(*key))
+                    uses.append(0)
+                uses[self._keys[key]] += 1
+                segments.append(self._keys[key])
+                reversed_.append(key[0] != start)
+            self._polygons.append((np.array(ring, dtype=float), segments, reversed_))
+        self.uses = np.array(uses, dtype=int)
+
+    def _sample(self, start: tuple, end: tuple) -> np.ndarray:
+        """Points every ``point_gap`` from start towards end, without the end vertices."""
+        count = int(math.dist(start, end) // self.point_gap)
+        step = increment(azimuth(start, end), self.point_gap)
+        return np.asarray(start, dtype=float) + np.arange(1, count + 1)[:, None] * step
+
+    def __len__(self) -> int:
+        return len(self._polygons)
+
+    @property
+    def shared_segments(self) -> int:
+        """Number of segments that more than one polygon runs along."""
+        return int(np.count_nonzero(self.uses > 1))
+
+    def samples(self, index: int) -> np.ndarray:
+        """
+        Assemble one polygon's boundary samples from the edge table.
+
+        The layout is that of ``split_into_points``: the first vertex, then
+        each edge's inner points followed by its end vertex. Inner points of
+        a segment the polygon runs along backwards are spaced from its other
+        end, so they may sit up to one gap away from the ones
+        ``split_into_points`` would give.
+
+        Args:
+            index: Position of the polygon in the layer
+
+        Returns:
+            Array of points along the polygon boundary
+        """
+        ring, segments, reversed_ = self._polygons[index]
+        parts = [ring[:1]]
+        for position, (segment, backwards) in enumerate(zip(segments, reversed_)):
+            parts.append(self.segments[segment][::-1] if backwards else self.segments[segment])
+            parts.append(ring[(position + 1) % len(ring)][None])
+        return np.concatenate(parts)
@@ -0,0 +1,27 @@
+"""
+Reference answers and accuracy-versus-speed evaluation of the engines.
+"""
+
+from .shapes import CorpusPolygon, generate_corpus, POLYGON_CLASSES
+from .oracle import ReferenceAnswer, reference_rectangle, cached_reference
+from .pareto import (
+    EvaluationRecord, SettingSummary, rectangle_contained, evaluate_engines, pareto_front, summarize, format_table,
+    plot_pareto
+)
+
+__all__ = [
+    'CorpusPolygon',
+    'generate_corpus',
+    'POLYGON_CLASSES',
+    'ReferenceAnswer',
+    'reference_rectangle',
+    'cached_reference',
+    'EvaluationRecord',
+    'SettingSummary',
+    'rectangle_contained',
+    'evaluate_engines',
+    'pareto_front',
+    'summarize',
+    'format_table',
+    'plot_pareto'
+]
@@ -0,0 +1,121 @@
+"""
+High-accuracy reference answers for judging the engines.
+
+For a fixed orientation, ``find_max_rectangle_at_angle`` is exact, so the true
+optimum is the maximum of a one-dimensional function of the angle over a
+quarter turn. The oracle scans that function on a fine grid of angles, adds
+every edge direction (optima often have a side flush with an edge) and,
+optionally, the angle found by the general engine at a very fine gap. It
+then refines the best local maxima with a golden-section search. Answers are
+cached on disk, keyed by the polygon and the oracle settings.
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+import numpy as np
+from typing import List, NamedTuple
+from ..algorithms.engines import solve
+from ..algorithms.fixed_orientation import find_max_rectangle_at_angle
+from ..algorithms.general_algorithm import find_final_rectangle
+from ..algorithms.refinement import golden_section_search
+from ..core.geometry_utils import azimuth, sort_rectangle_coords
+
+# Bump when the oracle changes, so cached answers are recomputed
+ORACLE_VERSION = 1
+
+
+class ReferenceAnswer(NamedTuple):
+    """Reference rectangle of one polygon."""
+    area: float
+    angle: float
+    corners: List[tuple]
+    seconds: float
+
+
+def _area_at(polygon_coords: list, angle: float) -> float:
+    """Exact largest rectangle area at one orientation."""
+    side, _, point1, point2 = find_max_rectangle_at_angle(polygon_coords, angle)
+    return side * math.dist(point1, point2)
+
+
+def reference_rectangle(polygon_coords: list, angles: int = 180, refine: int = 3, tolerance: float = 1e-7,
+                        seed_relative_gap: float = None) -> ReferenceAnswer:
+    """
+    Compute a high-accuracy maximum inscribed rectangle.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        angles: Number of evenly spaced orientations scanned over a quarter turn
+        refine: Number of local maxima refined by golden-section search
+        tolerance: Angular tolerance of the refinement in radians
+        seed_relative_gap: If given, also try the orientation the general engine
+            finds with this relative gap (slow for small gaps)
+
+    Returns:
+        ReferenceAnswer with corners in plotting order
+    """
+    start = time.perf_counter()
+    coords = np.asarray(polygon_coords, dtype=float)
+    step = (np.pi/2) / angles
+    scan = np.arange(angles) * step
+    scan_areas = np.array([_area_at(polygon_coords, angle) for angle in scan])
+
+    # Extra candidates: edge directions and the engine's own orientation
+    edges = np.roll(coords, -1, axis=0) - coords
+    candidates = list(np.mod(np.arctan2(edges[:, 1], edges[:, 0]), np.pi/2))
+    if seed_relative_gap is not None:
+        corners = solve(polygon_coords, 'general', relative_gap=seed_relative_gap).corners
+        candidates.append(np.mod(azimuth(corners[0], corners[1]), np.pi/2))
+    best_area, best_angle = max(zip(scan_areas, scan))
+    for angle in candidates:
+        area = _area_at(polygon_coords, angle)
+        if area > best_area:
+            best_area, best_angle = area, angle
+
+    # Refine around the largest local maxima of the periodic scan
+    is_peak = (scan_areas >= np.roll(scan_areas, 1)) & (scan_areas >= np.roll(scan_areas, -1))
+    peaks = np.flatnonzero(is_peak)
+    for peak in peaks[np.argsort(-scan_areas[peaks])][:refine]:
+        angle = golden_section_search(lambda value: _area_at(polygon_coords, value),
+                                scan[peak] - step, scan[peak] + step, tolerance)
+        area = _area_at(polygon_coords, angle)
+        if area > best_area:
+            best_area, best_angle = area, angle
+
+    side, rectangle_angle, point1, point2 = find_max_rectangle_at_angle(polygon_coords, best_angle)
+    corners = sort_rectangle_coords(list(find_final_rectangle(side, rectangle_angle, point1, point2)))
+    return ReferenceAnswer(float(best_area), float(np.mod(best_angle, np.pi/2)),
+                           [tuple(map(float, corner)) for corner in corners], time.perf_counter() - start)
+
+
+def cached_reference(polygon_coords: list, cache_dir: str, **options) -> ReferenceAnswer:
+    """
+    Return the reference answer of a polygon, computing it only on a cache miss.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        cache_dir: Directory holding one JSON file per polygon and setting
+        **options: Keyword arguments of ``reference_rectangle``
+
+    Returns:
+        ReferenceAnswer; ``seconds`` is the time of the original computation
+    """
+    key = json.dumps({'coords': [[float(x), float(y)] for x, y in polygon_coords],
+                      'options': options, 'version': ORACLE_VERSION}, sort_keys=True)
+    path = os.path.join(cache_dir, hashlib.sha256(key.encode()).hexdigest() + '.json')
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as handle:
+            record = json.load(handle)
+        return ReferenceAnswer(record['area'], record['angle'], [tuple(corner) for corner in record['corners']],
+                               record['seconds'])
+
+    answer = reference_rectangle(polygon_coords, **options)
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as handle:
+        json.dump(answer._asdict(), handle)
+    os.replace(temporary, path)
+    return answer
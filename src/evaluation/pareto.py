@@ -0,0 +1,209 @@
+"""
+Accuracy-versus-speed sweeps of the engines against reference answers.
+
+Every engine in ``engines.ENGINES`` is run over a sweep of relative point
+gaps on every corpus polygon, so engines registered later are picked up
+without changes here. Each result is checked for containment and compared
+with the polygon's reference area. Settings are then summarized per polygon
+class, and the ones no other setting beats on both median wall time and mean
+relative error form the Pareto front.
+"""
+
+import time
+import numpy as np
+from shapely.geometry import Polygon
+from typing import Dict, List, NamedTuple, Sequence
+from ..algorithms.engines import ENGINES, solve
+from .oracle import ReferenceAnswer
+from .shapes import CorpusPolygon
+
+DEFAULT_RELATIVE_GAPS = (0.1, 0.05, 0.025, 0.0125)
+
+
+class EvaluationRecord(NamedTuple):
+    """Result of one engine setting on one polygon."""
+    polygon_id: str
+    polygon_class: str
+    engine: str
+    relative_gap: float
+    area: float
+    seconds: float
+    relative_error: float
+    contained: bool
+    error: str = None
+
+
+class SettingSummary(NamedTuple):
+    """Aggregate of one engine setting over the polygons of one class."""
+    polygon_class: str
+    engine: str
+    relative_gap: float
+    polygons: int
+    median_seconds: float
+    mean_error: float
+    max_error: float
+    not_contained: int
+    failures: int
+    pareto: bool
+
+
+def rectangle_contained(polygon_coords: list, corners: Sequence[tuple], tolerance: float = 1e-9) -> bool:
+    """
+    Check that a rectangle lies inside a polygon.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        corners: The rectangle's four corners in plotting order
+        tolerance: Allowed overshoot as a fraction of the polygon's bounding-box diagonal
+
+    Returns:
+        True if the polygon, grown by the tolerance, covers the rectangle
+    """
+    polygon = Polygon(polygon_coords)
+    min_x, min_y, max_x, max_y = polygon.bounds
+    slack = tolerance * np.hypot(max_x - min_x, max_y - min_y)
+    return polygon.buffer(slack).covers(Polygon(corners))
+
+
+def evaluate_engines(corpus: List[CorpusPolygon], references: Dict[str, ReferenceAnswer],
+                     engines: Sequence[str] = None,
+                     relative_gaps: Sequence[float] = DEFAULT_RELATIVE_GAPS) -> List[EvaluationRecord]:
+    """
+    Run every engine setting on every polygon and score it.
+
+    Args:
+        corpus: Polygons to solve
+        references: Reference answer of every polygon, keyed by polygon id
+        engines: Engine names (default: every engine in ``ENGINES``)
+        relative_gaps: Point gaps as fractions of the bounding-box diagonal
+
+    Returns:
+        List of EvaluationRecord; an engine that raises gets a record with
+        zero area and the error message
+    """
+    records = []
+    for item in corpus:
+        reference = references[item.polygon_id].area
+        for engine in engines or sorted(ENGINES):
+            for relative_gap in relative_gaps:
+                start = time.perf_counter()
+                try:
+                    result = solve(item.coords, engine, relative_gap=relative_gap)
+                except Exception as error:
+                    records.append(EvaluationRecord(item.polygon_id, item.polygon_class, engine, relative_gap, 0.0,
+                                                    time.perf_counter() - start, 1.0, True, str(error)))
+                    continue
+                seconds = time.perf_counter() - start
+                records.append(EvaluationRecord(
+                    item.polygon_id, item.polygon_class, engine, relative_gap, result.area, seconds,
+                    (reference - result.area) / reference, rectangle_contained(item.coords, result.corners)))
+    return records
+
+
+def pareto_front(seconds: Sequence[float], errors: Sequence[float]) -> np.ndarray:
+    """
+    Find the points that no other point beats on both time and error.
+
+    Args:
+        seconds: Wall time of each point
+        errors: Error of each point
+
+    Returns:
+        Boolean array, True for points on the front
+    """
+    seconds = np.asarray(seconds, dtype=float)
+    errors = np.asarray(errors, dtype=float)
+    dominated = ((seconds[None, :] <= seconds[:, None]) & (errors[None, :] <= errors[:, None]) &
+                 ((seconds[None, :] < seconds[:, None]) | (errors[None, :] < errors[:, None])))
+    return ~dominated.any(axis=1)
+
+
+def summarize(records: List[EvaluationRecord]) -> List[SettingSummary]:
+    """
+    Aggregate records per class and engine setting and mark the Pareto front.
+
+    Settings that returned a rectangle outside some polygon count as failing
+    and never join the front.
+
+    Args:
+        records: Output of ``evaluate_engines``
+
+    Returns:
+        List of SettingSummary, grouped by class and sorted by median time
+    """
+    groups = {}
+    for record in records:
+        groups.setdefault((record.polygon_class, record.engine, record.relative_gap), []).append(record)
+
+    rows = []
+    for (polygon_class, engine, relative_gap), group in groups.items():
+        errors = np.array([record.relative_error for record in group])
+        rows.append(SettingSummary(
+            polygon_class, engine, relative_gap, len(group),
+            float(np.median([record.seconds for record in group])), float(errors.mean()), float(errors.max()),
+            sum(not record.contained for record in group), sum(record.error is not None for record in group), False))
+
+    summary = []
+    for polygon_class in sorted({row.polygon_class for row in rows}):
+        class_rows = sorted((row for row in rows if row.polygon_class == polygon_class),
+                            key=lambda row: row.median_seconds)
+        valid = [row for row in class_rows if row.not_contained == 0 and row.failures == 0]
+        front = pareto_front([row.median_seconds for row in valid], [row.mean_error for row in valid])
+        on_front = {id(row) for row, flag in zip(valid, front) if flag}
+        summary.extend(row._replace(pareto=id(row) in on_front) for row in class_rows)
+    return summary
+
+
+def format_table(summary: List[SettingSummary]) -> str:
+    """Render a summary as a Markdown table, one section per class."""
+    lines = []
+    for polygon_class in dict.fromkeys(row.polygon_class for row in summary):
+        lines += [f"### {polygon_class}", "",
+                  "| engine | relative gap | median s | mean error | max error | not contained | failed | Pareto |",
+                  "|---|---|---|---|---|---|---|---|"]
+        for row in summary:
+            if row.polygon_class == polygon_class:
+                lines.append(f"| {row.engine} | {row.relative_gap:g} | {row.median_seconds:.4f} | "
+                             f"{row.mean_error:.2%} | {row.max_error:.2%} | {row.not_contained} | {row.failures} | "
+                             f"{'*' if row.pareto else ''} |")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def plot_pareto(summary: List[SettingSummary], output_file: str) -> None:
+    """
+    Plot mean relative error against median wall time, one panel per class.
+
+    Settings that failed or returned a rectangle outside a polygon are left
+    out. Requires the optional matplotlib dependency.
+
+    Args:
+        summary: Output of ``summarize``
+        output_file: Image file to write
+    """
+    # Imported here so the evaluation tools work without the plotting extra
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import NullFormatter
+
+    classes = list(dict.fromkeys(row.polygon_class for row in summary))
+    figure = Figure(figsize=(4.5 * len(classes), 4))
+    axes = figure.subplots(1, len(classes), squeeze=False)
+    for axis, polygon_class in zip(axes[0], classes):
+        rows = [row for row in summary if row.polygon_class == polygon_class]
+        # Settings that failed or left the polygon have meaningless errors; they are counted, not drawn
+        excluded = sum(row.not_contained > 0 or row.failures > 0 for row in rows)
+        valid = [row for row in rows if row.not_contained == 0 and row.failures == 0]
+        for engine in dict.fromkeys(row.engine for row in valid):
+            points = sorted((row.median_seconds, max(row.mean_error, 1e-6)) for row in valid if row.engine == engine)
+            axis.plot([point[0] for point in points], [point[1] for point in points], 'o-', label=engine)
+        front = sorted((row.median_seconds, max(row.mean_error, 1e-6)) for row in rows if row.pareto)
+        axis.plot([point[0] for point in front], [point[1] for point in front], 'k--', linewidth=1, label='Pareto front')
+        axis.set_xscale('log')
+        axis.set_yscale('log')
+        axis.xaxis.set_minor_formatter(NullFormatter())
+        axis.set_title(polygon_class + (f" ({excluded} invalid settings not shown)" if excluded else ""))
+        axis.set_xlabel('median wall time (s)')
+        axis.set_ylabel('mean relative area error')
+        axis.legend(fontsize=8)
+    figure.tight_layout()
+    figure.savefig(output_file, dpi=120)
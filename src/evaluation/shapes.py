@@ -0,0 +1,91 @@
+"""
+Seeded polygon corpus for accuracy and speed evaluation.
+
+Every class stresses a different part of the engines: convex shapes are the
+convex engine's home ground, stars and rectilinear shapes are concave with
+many blocking vertices, and elongated shapes have optima at angles far from
+the axes. The same seed always produces the same corpus.
+"""
+
+import zlib
+import numpy as np
+import shapely
+from shapely import affinity
+from shapely.geometry import Polygon
+from shapely.geometry.polygon import orient
+from typing import List, NamedTuple
+
+
+class CorpusPolygon(NamedTuple):
+    """One polygon of the evaluation corpus."""
+    polygon_id: str
+    polygon_class: str
+    coords: List[tuple]
+
+
+def _convex(rng: np.random.Generator) -> Polygon:
+    """Convex hull of random points in the unit disc."""
+    angles = rng.uniform(0, 2 * np.pi, 24)
+    radii = np.sqrt(rng.uniform(0.2, 1.0, 24))
+    return shapely.MultiPoint(np.column_stack((radii * np.cos(angles), radii * np.sin(angles)))).convex_hull
+
+
+def _star(rng: np.random.Generator) -> Polygon:
+    """Star-shaped polygon with random radii around the origin."""
+    count = int(rng.integers(8, 20))
+    angles = np.sort(rng.uniform(0, 2 * np.pi, count))
+    radii = rng.uniform(0.4, 1.0, count)
+    return Polygon(np.column_stack((radii * np.cos(angles), radii * np.sin(angles))))
+
+
+def _rectilinear(rng: np.random.Generator) -> Polygon:
+    """Union of random axis-aligned boxes on a coarse grid, rotated by a random angle."""
+    boxes = []
+    for _ in range(int(rng.integers(3, 6))):
+        x0, y0 = rng.integers(0, 6, 2)
+        width, height = rng.integers(2, 5, 2)
+        boxes.append(shapely.box(x0, y0, x0 + width, y0 + height))
+    union = shapely.union_all(boxes)
+    if union.geom_type == 'MultiPolygon':
+        union = max(union.geoms, key=lambda part: part.area)
+    # Fill holes; the engines search the exterior ring only
+    polygon = Polygon(union.exterior).simplify(0)
+    return affinity.scale(affinity.rotate(polygon, rng.uniform(0, 90), origin='centroid'), 0.25, 0.25)
+
+
+def _elongated(rng: np.random.Generator) -> Polygon:
+    """Convex shape stretched several times along a random direction."""
+    polygon = affinity.scale(_convex(rng), rng.uniform(3, 6), 1.0)
+    return affinity.rotate(polygon, rng.uniform(0, 180), origin='centroid')
+
+
+POLYGON_CLASSES = {
+    'convex': _convex,
+    'star': _star,
+    'rectilinear': _rectilinear,
+    'elongated': _elongated,
+}
+
+
+def generate_corpus(per_class: int = 8, seed: int = 0, classes: List[str] = None) -> List[CorpusPolygon]:
+    """
+    Generate a reproducible set of polygons from each class.
+
+    Args:
+        per_class: Number of polygons per class
+        seed: Seed of the generator
+        classes: Names from ``POLYGON_CLASSES`` (default: all of them)
+
+    Returns:
+        List of CorpusPolygon with counter-clockwise rings without closing point
+    """
+    corpus = []
+    for name in classes or POLYGON_CLASSES:
+        # One stream per class name, so adding a class does not change the others
+        rng = np.random.default_rng([seed, zlib.crc32(name.encode())])
+        for index in range(per_class):
+            polygon = orient(POLYGON_CLASSES[name](rng))
+            coords = [tuple(map(float, point)) for point in polygon.exterior.coords[:-1]]
+            corpus.append(CorpusPolygon(f"{name}-{index:03d}", name, coords))
+    return corpus
+
@@ -0,0 +1,17 @@
+"""
+Readers and writers for polygon inputs and rectangle results.
+"""
+
+from .readers import read_polygons
+from .results import write_results
+from .corpus import PolygonCorpus, write_corpus, open_results
+from .exporters import export_results
+
+__all__ = [
+    'read_polygons',
+    'write_results',
+    'PolygonCorpus',
+    'write_corpus',
+    'open_results',
+    'export_results'
+]
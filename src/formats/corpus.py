@@ -0,0 +1,263 @@
+"""
+Packed, memory-mapped polygon corpus for zero-copy batch processing.
+
+A corpus is a directory of ``.npy`` arrays that can be opened with
+``np.load(..., mmap_mode='r')``:
+
+- ``coords.npy``: float64 array of shape (V, 2) with every vertex of every ring
+- ``ring_offsets.npy``: int64 array of shape (R + 1,); ring r is
+  ``coords[ring_offsets[r]:ring_offsets[r + 1]]`` without a closing point
+- ``part_offsets.npy``: int64 array of shape (P + 1,); part p owns rings
+  ``part_offsets[p]:part_offsets[p + 1]``, the first being its exterior
+- ``record_offsets.npy``: int64 array of shape (N + 1,); record i owns parts
+  ``record_offsets[i]:record_offsets[i + 1]``
+- ``ids.npy``: fixed-width unicode array of shape (N,)
+- ``meta.json``: format name, version and record count
+
+Workers slice their share of records straight out of the mapped arrays and
+write into a sibling ``results.npy`` structured array of ``RESULT_DTYPE``.
+"""
+
+import json
+import os
+import numpy as np
+from typing import Iterable, Iterator, List, Tuple
+from shapely import wkb
+from shapely.geometry import MultiPolygon, Polygon, shape
+
+CORPUS_FORMAT = 'lir-corpus'
+CORPUS_VERSION = 1
+
+RESULT_DTYPE = np.dtype([
+    ('area', 'f8'),
+    ('corners', 'f8', (4, 2)),
+    ('status', 'i1'),
+    ('seconds', 'f8'),
+])
+
+# Values of the 'status' field of a result row
+STATUS_PENDING = 0
+STATUS_DONE = 1
+STATUS_FAILED = 2
+
+_ARRAYS = ('coords', 'ring_offsets', 'part_offsets', 'record_offsets', 'ids')
+
+
+def _polygon_parts(geometry) -> List[Polygon]:
+    """Return the polygon parts of a geometry or of a bare coordinate list."""
+    if isinstance(geometry, (list, tuple, np.ndarray)):
+        geometry = Polygon(geometry)
+    if isinstance(geometry, Polygon):
+        return [geometry]
+    if isinstance(geometry, MultiPolygon):
+        return list(geometry.geoms)
+    raise ValueError(f"Expected a polygon, got {geometry.geom_type}")
+
+
+def is_corpus(path: str) -> bool:
+    """Check whether a path is a corpus directory."""
+    meta = os.path.join(path, 'meta.json')
+    if not os.path.isfile(meta):
+        return False
+    with open(meta, 'r', encoding='utf-8') as fh:
+        return json.load(fh).get('format') == CORPUS_FORMAT
+
+
+def write_corpus(path: str, items: Iterable[Tuple[str, object]]) -> int:
+    """
+    Pack polygons into a corpus directory.
+
+    Args:
+        path: Output directory (created if needed)
+        items: Iterable of (id, geometry) pairs; geometries may be shapely
+            Polygons, MultiPolygons or lists of (x, y) coordinates
+
+    Returns:
+        Number of records written
+    """
+    coords, ring_offsets, part_offsets, record_offsets, ids = [], [0], [0], [0], []
+    vertex_count = 0
+    for identifier, geometry in items:
+        for part in _polygon_parts(geometry):
+            for ring in [part.exterior, *part.interiors]:
+                ring_coords = np.asarray(ring.coords, dtype=float)[:-1, :2]
+                coords.append(ring_coords)
+                vertex_count += len(ring_coords)
+                ring_offsets.append(vertex_count)
+            part_offsets.append(len(ring_offsets) - 1)
+        record_offsets.append(len(part_offsets) - 1)
+        ids.append(str(identifier))
+
+    os.makedirs(path, exist_ok=True)
+    arrays = {
+        'coords': np.concatenate(coords) if coords else np.empty((0, 2)),
+        'ring_offsets': np.asarray(ring_offsets, dtype=np.int64),
+        'part_offsets': np.asarray(part_offsets, dtype=np.int64),
+        'record_offsets': np.asarray(record_offsets, dtype=np.int64),
+        'ids': np.asarray(ids, dtype=str) if ids else np.empty(0, dtype='<U1'),
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f'{name}.npy'), array)
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as fh:
+        json.dump({'format': CORPUS_FORMAT, 'version': CORPUS_VERSION, 'count': len(ids)}, fh)
+    return len(ids)
+
+
+def corpus_from_geojson(source: str, path: str) -> int:
+    """
+    Pack a GeoJSON FeatureCollection into a corpus.
+
+    Args:
+        source: GeoJSON file path
+        path: Output corpus directory
+
+    Returns:
+        Number of records written
+    """
+    with open(source, 'r', encoding='utf-8') as fh:
+        data = json.load(fh)
+    features = data['features'] if data.get('type') == 'FeatureCollection' else [data]
+    items = (
+        (feature.get('id', (feature.get('properties') or {}).get('id', number)), shape(feature['geometry']))
+        for number, feature in enumerate(features)
+    )
+    return write_corpus(path, items)
+
+
+def corpus_from_wkb(source: str, path: str) -> int:
+    """
+    Pack hex-encoded WKB geometries, one per line (optionally ``id<TAB>hex``), into a corpus.
+
+    Args:
+        source: Text file of hex WKB lines
+        path: Output corpus directory
+
+    Returns:
+        Number of records written
+    """
+    def items():
+        with open(source, 'r', encoding='utf-8') as fh:
+            for number, line in enumerate(fh):
+                line = line.strip()
+                if line:
+                    identifier, _, data = line.rpartition('\t')
+                    yield identifier or str(number), wkb.loads(data, hex=True)
+    return write_corpus(path, items())
+
+
+def corpus_from_file(source: str, path: str, id_column: str = None) -> int:
+    """
+    Pack any vector file geopandas can read (shapefile, GeoPackage, ...) into a corpus.
+
+    Args:
+        source: Vector file path
+        path: Output corpus directory
+        id_column: Column holding record ids (default: the row index)
+
+    Returns:
+        Number of records written
+    """
+    import geopandas
+
+    frame = geopandas.read_file(source)
+    identifiers = frame[id_column] if id_column else frame.index
+    return write_corpus(path, zip(identifiers, frame.geometry))
+
+
+class PolygonCorpus:
+    """Read-only, memory-mapped view of a corpus directory."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Corpus directory written by ``write_corpus``
+        """
+        if not is_corpus(path):
+            raise ValueError(f"'{path}' is not a polygon corpus")
+        self.path = path
+        for name in _ARRAYS:
+            setattr(self, name, np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r'))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def rings(self, index: int) -> List[List[np.ndarray]]:
+        """
+        Return the rings of a record as views into the mapped coordinates.
+
+        Args:
+            index: Record index
+
+        Returns:
+            List of parts, each a list of rings (exterior first)
+        """
+        parts = []
+        for part in range(self.record_offsets[index], self.record_offsets[index + 1]):
+            parts.append([
+                self.coords[self.ring_offsets[ring]:self.ring_offsets[ring + 1]]
+                for ring in range(self.part_offsets[part], self.part_offsets[part + 1])
+            ])
+        return parts
+
+    def geometry(self, index: int):
+        """Return a record as a shapely Polygon or MultiPolygon."""
+        polygons = [Polygon(rings[0], rings[1:]) for rings in self.rings(index)]
+        return polygons[0] if len(polygons) == 1 else MultiPolygon(polygons)
+
+    def exterior_coords(self, index: int) -> List[Tuple[float, float]]:
+        """Return the exterior ring of the largest part of a record, as the engines expect."""
+        parts = self.rings(index)
+        if len(parts) > 1:
+            parts = [max(parts, key=lambda rings: abs(Polygon(rings[0]).area))]
+        return [(float(x), float(y)) for x, y in parts[0][0]]
+
+    def items(self, start: int = 0, stop: int = None) -> Iterator[Tuple[str, list]]:
+        """
+        Iterate over (id, polygon_coords) pairs of a slice of records.
+
+        Args:
+            start: First record index
+            stop: One past the last record index (default: the end)
+
+        Returns:
+            Iterator of (id, polygon_coords) pairs
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for index in range(start, stop):
+            yield str(self.ids[index]), self.exterior_coords(index)
+
+
+def results_path(path: str) -> str:
+    """Return the path of the results array next to a corpus."""
+    return os.path.join(path, 'results.npy')
+
+
+def create_results(path: str) -> np.memmap:
+    """
+    Create (or reset) the results array of a corpus, with every row pending.
+
+    Args:
+        path: Corpus directory
+
+    Returns:
+        Writable memory-mapped structured array of ``RESULT_DTYPE``
+    """
+    count = len(PolygonCorpus(path))
+    results = np.lib.format.open_memmap(results_path(path), mode='w+', dtype=RESULT_DTYPE, shape=(count,))
+    results['status'] = STATUS_PENDING
+    results.flush()
+    return results
+
+
+def open_results(path: str, mode: str = 'r') -> np.memmap:
+    """
+    Open the results array of a corpus.
+
+    Args:
+        path: Corpus directory
+        mode: 'r' for read-only or 'r+' for workers writing their share
+
+    Returns:
+        Memory-mapped structured array of ``RESULT_DTYPE``
+    """
+    return np.load(results_path(path), mmap_mode=mode)
@@ -0,0 +1,194 @@
+"""
+Vector exporters for polygon/rectangle results that need no plotting library.
+
+Results are streamed to SVG, GeoJSON FeatureCollections or hex WKB lines,
+either into one file or into a directory of tiles holding a fixed number of
+results each. Rectangle corners are put in ring order with
+``sort_rectangle_coords``, and coordinates are written as given (world
+coordinates), so overlays line up with the source layer.
+"""
+
+import json
+import os
+import struct
+from itertools import chain, count, islice
+from typing import Iterable, Iterator, List, Sequence, Tuple
+import numpy as np
+from ..core.geometry_utils import sort_rectangle_coords
+
+EXPORT_FORMATS = {'svg': 'svg', 'geojson': 'geojson', 'json': 'geojson', 'wkb': 'wkb'}
+
+SVG_STYLE = (".polygon{fill:none;stroke:#d62728}"
+             ".rectangle{fill:#1f77b4;fill-opacity:0.15;stroke:#1f77b4}"
+             "path{stroke-width:1;vector-effect:non-scaling-stroke}")
+
+
+def _rings(polygon_coords: list, rectangle_coords: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the polygon ring and the rectangle ring in corner order, both without closing point."""
+    polygon = np.asarray(polygon_coords, dtype=float)
+    if len(polygon) > 1 and np.all(polygon[0] == polygon[-1]):
+        polygon = polygon[:-1]
+    rectangle = np.asarray(sort_rectangle_coords([np.asarray(corner, dtype=float) for corner in rectangle_coords]),
+                           dtype=float)
+    return polygon, rectangle
+
+
+def _xml_escape(text: str) -> str:
+    """Escape text for an XML attribute."""
+    return (text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            .replace('"', '&quot;'))
+
+
+def _svg_path(ring: np.ndarray, name: str) -> str:
+    """SVG path of a closed ring, with y pointing up."""
+    points = ' L'.join(f"{x!r} {-y!r}" for x, y in ring.tolist())
+    return f'<path class="{name}" d="M{points} Z"/>'
+
+
+def write_svg(items: Iterable[Tuple[str, list, Sequence]], path: str) -> int:
+    """
+    Write results as one SVG drawing in world coordinates.
+
+    Args:
+        items: Iterable of (id, polygon_coords, rectangle_coords)
+        path: Output file path
+
+    Returns:
+        Number of results written
+    """
+    groups = []
+    low, high = np.full(2, np.inf), np.full(2, -np.inf)
+    for identifier, polygon_coords, rectangle_coords in items:
+        polygon, rectangle = _rings(polygon_coords, rectangle_coords)
+        low, high = np.minimum(low, polygon.min(axis=0)), np.maximum(high, polygon.max(axis=0))
+        groups.append(f'<g id="{_xml_escape(str(identifier))}">{_svg_path(polygon, "polygon")}'
+                      f'{_svg_path(rectangle, "rectangle")}</g>\n')
+    if not groups:
+        low, high = np.zeros(2), np.ones(2)
+    span = np.maximum(high - low, 1e-12)
+    view_box = ' '.join(repr(float(value)) for value in (low[0], -high[1], span[0], span[1]))
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{view_box}">\n'
+                 f'<style>{SVG_STYLE}</style>\n')
+        fh.writelines(groups)
+        fh.write('</svg>\n')
+    return len(groups)
+
+
+def write_geojson(items: Iterable[Tuple[str, list, Sequence]], path: str) -> int:
+    """
+    Write results as a GeoJSON FeatureCollection, streaming one feature at a time.
+
+    Every result gives two features with the same ``id`` property, told apart
+    by ``role`` ('polygon' or 'rectangle'); the rectangle also carries its area.
+
+    Args:
+        items: Iterable of (id, polygon_coords, rectangle_coords)
+        path: Output file path
+
+    Returns:
+        Number of results written
+    """
+    written = 0
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write('{"type": "FeatureCollection", "features": [\n')
+        for identifier, polygon_coords, rectangle_coords in items:
+            polygon, rectangle = _rings(polygon_coords, rectangle_coords)
+            (ax, ay), (bx, by) = rectangle[1] - rectangle[0], rectangle[3] - rectangle[0]
+            area = abs(float(ax * by - ay * bx))
+            for role, ring, properties in (('polygon', polygon, {}), ('rectangle', rectangle, {'area': area})):
+                closed = np.concatenate((ring, ring[:1])).tolist()
+                feature = {'type': 'Feature', 'properties': {'id': identifier, 'role': role, **properties},
+                           'geometry': {'type': 'Polygon', 'coordinates': [closed]}}
+                fh.write((',\n' if written or role == 'rectangle' else '') + json.dumps(feature))
+            written += 1
+        fh.write('\n]}\n')
+    return written
+
+
+def _wkb_polygon(ring: np.ndarray) -> bytes:
+    """Little-endian WKB of a polygon with one closed ring."""
+    closed = np.concatenate((ring, ring[:1]))
+    return struct.pack('<BIII', 1, 3, 1, len(closed)) + closed.astype('<f8').tobytes()
+
+
+def write_wkb(items: Iterable[Tuple[str, list, Sequence]], path: str) -> int:
+    """
+    Write results as hex WKB lines (``id<TAB>hex``), one geometry collection of polygon and rectangle per result.
+
+    Args:
+        items: Iterable of (id, polygon_coords, rectangle_coords)
+        path: Output file path
+
+    Returns:
+        Number of results written
+    """
+    written = 0
+    with open(path, 'w', encoding='utf-8') as fh:
+        for identifier, polygon_coords, rectangle_coords in items:
+            polygon, rectangle = _rings(polygon_coords, rectangle_coords)
+            data = struct.pack('<BII', 1, 7, 2) + _wkb_polygon(polygon) + _wkb_polygon(rectangle)
+            fh.write(f"{identifier}\t{data.hex()}\n")
+            written += 1
+    return written
+
+
+_WRITERS = {
+    'svg': write_svg,
+    'geojson': write_geojson,
+    'wkb': write_wkb,
+}
+
+
+def export_results(results: Iterable[Tuple[list, Sequence]], path: str, export_format: str = None,
+                   ids: Iterable[str] = None, tile_size: int = None) -> List[str]:
+    """
+    Export (polygon_coords, rectangle_coords) results to vector files.
+
+    Args:
+        results: Iterable of (polygon_coords, rectangle_coords) pairs
+        path: Output file, or output directory when tiling
+        export_format: 'svg', 'geojson' or 'wkb' (default: from the file
+            extension, and required when tiling)
+        ids: Optional id of every result (default: its position)
+        tile_size: Optional number of results per file; tiles are written to
+            ``path`` as ``tile_00000.<format>``, ``tile_00001.<format>``, ...
+
+    Returns:
+        List of written file paths
+
+    Raises:
+        ValueError: If the format is unknown or cannot be determined
+    """
+    if export_format is None and tile_size is None:
+        export_format = os.path.splitext(path)[1].lstrip('.').lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{export_format}', expected one of {sorted(EXPORT_FORMATS)}")
+    export_format = EXPORT_FORMATS[export_format]
+    writer = _WRITERS[export_format]
+    items = ((str(identifier), polygon, rectangle) for identifier, (polygon, rectangle)
+             in zip(count() if ids is None else ids, results))
+
+    if tile_size is None:
+        writer(items, path)
+        return [path]
+
+    os.makedirs(path, exist_ok=True)
+    written = []
+    for tile in count():
+        chunk = _peek(islice(items, tile_size))
+        if chunk is None:
+            break
+        tile_path = os.path.join(path, f"tile_{tile:05d}.{export_format}")
+        writer(chunk, tile_path)
+        written.append(tile_path)
+    return written
+
+
+def _peek(iterator: Iterator) -> Iterator:
+    """Return the iterator unchanged, or None if it is exhausted."""
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return None
+    return chain([first], iterator)
@@ -0,0 +1,128 @@
+"""
+Readers for polygon inputs in WKT, GeoJSON and CSV formats.
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+from typing import Iterator, List, Tuple
+from shapely import wkt
+from shapely.geometry import shape
+
+FORMATS = ('wkt', 'geojson', 'csv')
+
+_EXTENSIONS = {
+    '.wkt': 'wkt',
+    '.txt': 'wkt',
+    '.geojson': 'geojson',
+    '.json': 'geojson',
+    '.csv': 'csv',
+}
+
+
+def detect_format(path: str) -> str:
+    """
+    Guess the input format from a file extension.
+    
+    Args:
+        path: File path, or '-' for standard input
+        
+    Returns:
+        One of ``FORMATS``
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(f"Cannot detect the format of '{path}', pass it explicitly")
+    return _EXTENSIONS[extension]
+
+
+def exterior_coords(geometry) -> List[Tuple[float, float]]:
+    """
+    Return the exterior ring of a polygonal geometry as a list of coordinates.
+    
+    Multi-part geometries are reduced to their largest part; the current
+    engines only use the exterior ring, so holes are dropped.
+    
+    Args:
+        geometry: Shapely Polygon or MultiPolygon
+        
+    Returns:
+        List of (x, y) coordinates without the closing point
+    """
+    if geometry.geom_type == 'MultiPolygon':
+        geometry = max(geometry.geoms, key=lambda part: part.area)
+    if geometry.geom_type != 'Polygon':
+        raise ValueError(f"Expected a polygon, got {geometry.geom_type}")
+    return [(float(x), float(y)) for x, y in geometry.exterior.coords[:-1]]
+
+
+def _read_wkt(text: str) -> Iterator[Tuple[str, list]]:
+    """One WKT geometry per line, optionally prefixed by an id and a tab."""
+    for number, line in enumerate(text.splitlines()):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        identifier, _, geometry = line.rpartition('\t')
+        yield identifier or str(number), exterior_coords(wkt.loads(geometry))
+
+
+def _read_geojson(text: str) -> Iterator[Tuple[str, list]]:
+    """A FeatureCollection, a single Feature or a bare geometry."""
+    data = json.loads(text)
+    if data.get('type') == 'FeatureCollection':
+        features = data['features']
+    elif data.get('type') == 'Feature':
+        features = [data]
+    else:
+        features = [{'geometry': data}]
+    for number, feature in enumerate(features):
+        identifier = feature.get('id', (feature.get('properties') or {}).get('id', number))
+        yield str(identifier), exterior_coords(shape(feature['geometry']))
+
+
+def _read_csv(text: str) -> Iterator[Tuple[str, list]]:
+    """Vertex rows with x and y columns, grouped into polygons by an optional id column."""
+    reader = csv.DictReader(io.StringIO(text))
+    fields = [name.lower() for name in reader.fieldnames or []]
+    if 'x' not in fields or 'y' not in fields:
+        raise ValueError("CSV input needs 'x' and 'y' columns")
+    polygons = {}
+    for row in reader:
+        row = {key.lower(): value for key, value in row.items()}
+        polygons.setdefault(row.get('id', '0'), []).append((float(row['x']), float(row['y'])))
+    for identifier, coords in polygons.items():
+        if coords[0] == coords[-1]:
+            coords = coords[:-1]
+        yield identifier, coords
+
+
+_READERS = {
+    'wkt': _read_wkt,
+    'geojson': _read_geojson,
+    'csv': _read_csv,
+}
+
+
+def read_polygons(path: str, input_format: str = None) -> Iterator[Tuple[str, list]]:
+    """
+    Read polygons from a file or standard input.
+    
+    Args:
+        path: File path, or '-' for standard input
+        input_format: One of ``FORMATS``; detected from the extension when omitted
+        
+    Returns:
+        Iterator of (id, polygon_coords) pairs
+    """
+    if input_format is None:
+        input_format = 'wkt' if path == '-' else detect_format(path)
+    if input_format not in _READERS:
+        raise ValueError(f"Unknown input format '{input_format}', expected one of {list(FORMATS)}")
+    if path == '-':
+        text = sys.stdin.read()
+    else:
+        with open(path, 'r', encoding='utf-8') as fh:
+            text = fh.read()
+    return _READERS[input_format](text)
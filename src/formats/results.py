@@ -0,0 +1,86 @@
+"""
+Writers for rectangle results in NDJSON and Parquet formats.
+"""
+
+import json
+import sys
+from typing import Iterable, Iterator
+
+OUTPUT_FORMATS = ('ndjson', 'parquet')
+
+
+def write_ndjson(records: Iterable[dict], path: str) -> Iterator[dict]:
+    """
+    Write result records as newline-delimited JSON while passing them through.
+    
+    Args:
+        records: Iterable of result dictionaries
+        path: Output file path, or '-' for standard output
+        
+    Returns:
+        Iterator over the records, yielded after each one is written
+    """
+    fh = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8')
+    try:
+        for record in records:
+            fh.write(json.dumps(record) + '\n')
+            yield record
+    finally:
+        fh.flush()
+        if fh is not sys.stdout:
+            fh.close()
+
+
+def write_parquet(records: Iterable[dict], path: str) -> Iterator[dict]:
+    """
+    Write result records to a Parquet file with one column per corner coordinate.
+    
+    Requires pyarrow. Records are buffered and written when the input is exhausted.
+    
+    Args:
+        records: Iterable of result dictionaries
+        path: Output file path
+        
+    Returns:
+        Iterator over the records
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError("Parquet output requires pyarrow; install it with `pip install pyarrow`") from error
+    if path == '-':
+        raise ValueError("Parquet output needs a file path")
+
+    columns = {name: [] for name in ('id', 'area', 'engine', 'point_gap', 'error')}
+    for corner in range(4):
+        columns[f'x{corner}'] = []
+        columns[f'y{corner}'] = []
+    for record in records:
+        for name in ('id', 'area', 'engine', 'point_gap', 'error'):
+            columns[name].append(record.get(name))
+        corners = record.get('corners') or [[None, None]] * 4
+        for corner, (x, y) in enumerate(corners):
+            columns[f'x{corner}'].append(x)
+            columns[f'y{corner}'].append(y)
+        yield record
+    pq.write_table(pa.table(columns), path)
+
+
+def write_results(records: Iterable[dict], path: str, output_format: str = 'ndjson') -> Iterator[dict]:
+    """
+    Write result records in the requested format while passing them through.
+    
+    Args:
+        records: Iterable of result dictionaries
+        path: Output file path, or '-' for standard output
+        output_format: One of ``OUTPUT_FORMATS``
+        
+    Returns:
+        Iterator over the records
+    """
+    if output_format == 'ndjson':
+        return write_ndjson(records, path)
+    if output_format == 'parquet':
+        return write_parquet(records, path)
+    raise ValueError(f"Unknown output format '{output_format}', expected one of {list(OUTPUT_FORMATS)}")
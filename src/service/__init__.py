@@ -0,0 +1,12 @@
+"""
+Optional local HTTP/JSON solving service with micro-batching and deduplication.
+"""
+
+from .server import SolverService, ServiceOverloaded, canonical_polygon, serve
+
+__all__ = [
+    'SolverService',
+    'ServiceOverloaded',
+    'canonical_polygon',
+    'serve'
+]
@@ -0,0 +1,369 @@
+"""
+Local asyncio HTTP/JSON service that solves polygons with micro-batching.
+
+Requests arriving within a short window are grouped into one batch and sent to
+a bounded process pool. Identical polygons (same canonical ring and options)
+that are queued or being solved at the same time share a single solve. Every
+request carries a deadline, and queue depth, batch sizes and latencies are
+exposed on ``GET /metrics``.
+
+Endpoints:
+    POST /solve: ``{"polygon": [[x, y], ...], "engine": ..., "point_gap": ...,
+    "relative_gap": ..., "simplify_tolerance": ..., "constraints": {"min_side": ...,
+    "max_aspect": ..., "orientation": ..., "orientation_tolerance": ...}, "timeout": seconds}``
+    GET /metrics: service counters and latency percentiles
+    GET /health: ``{"status": "ok"}``
+
+Only the standard library is used; nothing outside the machine is contacted.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+from ..batch.runner import solve_record
+from ..core.constraints import RectangleConstraints
+
+# Request fields forwarded to ``engines.solve``
+SOLVE_OPTIONS = ('engine', 'point_gap', 'relative_gap', 'simplify_tolerance', 'grid_size', 'time_budget', 'target_error',
+                 'refine', 'symmetry', 'ray_index', 'distance_field', 'seed')
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+            503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+
+class ServiceOverloaded(Exception):
+    """Raised when the request queue is full."""
+
+
+def canonical_polygon(polygon_coords: list, decimals: int = 9) -> Tuple[str, list]:
+    """
+    Put a ring in canonical form and hash it.
+
+    The closing point is dropped, coordinates are rounded, the ring is oriented
+    counter-clockwise and rotated to start at its lowest vertex, so the same
+    footprint always gives the same key and the same samples.
+
+    Args:
+        polygon_coords: List of (x, y) coordinates defining the polygon
+        decimals: Number of decimals kept when rounding coordinates
+
+    Returns:
+        Tuple of (hex digest, canonical coordinate list)
+    """
+    ring = np.round(np.asarray(polygon_coords, dtype=float)[:, :2], decimals) + 0.0
+    if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+        ring = ring[:-1]
+    x, y = ring[:, 0], ring[:, 1]
+    if np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y) < 0:
+        ring = ring[::-1]
+    start = np.lexsort((ring[:, 0], ring[:, 1]))[0]
+    ring = np.roll(ring, -start, axis=0)
+    return hashlib.sha256(ring.tobytes()).hexdigest(), [tuple(point) for point in ring.tolist()]
+
+
+def _warm_up() -> None:
+    """Import the solver in a worker process."""
+    from ..algorithms import engines  # noqa: F401
+
+
+def _solve_batch(tasks: List[Tuple[str, list, dict]]) -> List[dict]:
+    """Solve one micro-batch in a worker process."""
+    return [solve_record(task) for task in tasks]
+
+
+class _Pending:
+    """A queued solve shared by every request for the same key."""
+
+    __slots__ = ('key', 'polygon', 'options', 'future', 'deadline')
+
+    def __init__(self, key: str, polygon: list, options: dict, future: asyncio.Future, deadline: float):
+        self.key = key
+        self.polygon = polygon
+        self.options = options
+        self.future = future
+        self.deadline = deadline
+
+
+class SolverService:
+    """Micro-batching, deduplicating front end over a bounded process pool."""
+
+    def __init__(self, jobs: int = 2, batch_window: float = 0.005, max_batch: int = 32,
+                 max_queue: int = 10000, default_timeout: float = 30.0, latency_window: int = 10000):
+        """
+        Args:
+            jobs: Number of worker processes
+            batch_window: Seconds to wait for more requests after the first one of a batch
+            max_batch: Largest number of distinct polygons sent to a worker at once
+            max_queue: Largest number of distinct polygons waiting for a worker
+            default_timeout: Deadline in seconds for requests that do not set one
+            latency_window: Number of recent latencies kept for the percentiles
+        """
+        self.jobs = jobs
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+        self._executor = None
+        self._queue = None
+        self._inflight: Dict[str, _Pending] = {}
+        self._slots = None
+        self._batcher = None
+        self._latencies = deque(maxlen=latency_window)
+        self._counters = dict.fromkeys(
+            ('requests', 'solved', 'deduplicated', 'timeouts', 'expired', 'errors', 'rejected', 'batches'), 0)
+        self._batch_sizes = deque(maxlen=1000)
+
+    async def start(self) -> None:
+        """Start the worker pool and the batching loop."""
+        self._executor = ProcessPoolExecutor(max_workers=self.jobs)
+        # Fork every worker now, before any client socket is open, so that no
+        # worker inherits (and keeps alive) a connection
+        warm_up = [self._executor.submit(_warm_up) for _ in range(self.jobs)]
+        await asyncio.gather(*map(asyncio.wrap_future, warm_up))
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.jobs)
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+    async def stop(self) -> None:
+        """Stop the batching loop and shut the worker pool down."""
+        if self._batcher:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def solve(self, polygon_coords: list, timeout: float = None, **options) -> dict:
+        """
+        Solve a polygon, sharing the work with identical requests in flight.
+
+        Args:
+            polygon_coords: List of (x, y) coordinates defining the polygon
+            timeout: Deadline in seconds (default: ``default_timeout``)
+            **options: Keyword arguments for ``engines.solve``
+
+        Returns:
+            Result record as produced by the batch runner
+
+        Raises:
+            asyncio.TimeoutError: If the deadline passes first
+            ServiceOverloaded: If the queue is full
+        """
+        began = time.perf_counter()
+        timeout = self.default_timeout if timeout is None else timeout
+        deadline = began + timeout
+        self._counters['requests'] += 1
+
+        digest, polygon = canonical_polygon(polygon_coords)
+        options = {name: value for name, value in options.items() if value is not None}
+        key = f"{digest}:{json.dumps(options, sort_keys=True)}"
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._counters['deduplicated'] += 1
+            pending.deadline = max(pending.deadline, deadline)
+        else:
+            if self._queue.qsize() >= self.max_queue:
+                self._counters['rejected'] += 1
+                raise ServiceOverloaded("Request queue is full")
+            pending = _Pending(key, polygon, options, asyncio.get_running_loop().create_future(), deadline)
+            self._inflight[key] = pending
+            self._queue.put_nowait(pending)
+
+        try:
+            # shield: one waiter timing out must not cancel the shared solve
+            record = await asyncio.wait_for(asyncio.shield(pending.future), timeout)
+        except asyncio.TimeoutError:
+            self._counters['timeouts'] += 1
+            raise
+        self._latencies.append(time.perf_counter() - began)
+        return record
+
+    async def _batch_loop(self) -> None:
+        """Collect queued solves into micro-batches and dispatch them to the pool."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            window_end = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = window_end - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Drop solves whose every waiter has already given up
+            now = time.perf_counter()
+            live = []
+            for pending in batch:
+                if pending.deadline <= now:
+                    self._counters['expired'] += 1
+                    self._finish(pending, error=asyncio.TimeoutError())
+                else:
+                    live.append(pending)
+            if not live:
+                continue
+
+            await self._slots.acquire()
+            self._counters['batches'] += 1
+            self._batch_sizes.append(len(live))
+            tasks = [(pending.key, pending.polygon, pending.options) for pending in live]
+            future = loop.run_in_executor(self._executor, _solve_batch, tasks)
+            future.add_done_callback(lambda done, live=live: self._complete(live, done))
+
+    def _complete(self, batch: List[_Pending], done: asyncio.Future) -> None:
+        """Resolve the requests of a finished batch."""
+        self._slots.release()
+        if done.cancelled() or done.exception() is not None:
+            error = RuntimeError("Worker failed") if done.cancelled() else done.exception()
+            for pending in batch:
+                self._counters['errors'] += 1
+                self._finish(pending, error=error)
+            return
+        for pending, record in zip(batch, done.result()):
+            record.pop('id', None)
+            self._counters['errors' if 'error' in record else 'solved'] += 1
+            self._finish(pending, record=record)
+
+    def _finish(self, pending: _Pending, record: dict = None, error: BaseException = None) -> None:
+        """Remove a solve from the in-flight table and wake its waiters."""
+        self._inflight.pop(pending.key, None)
+        if pending.future.done():
+            return
+        if error is not None:
+            pending.future.set_exception(error)
+            # Avoid "exception was never retrieved" when every waiter has left
+            pending.future.exception()
+        else:
+            pending.future.set_result(record)
+
+    def metrics(self) -> dict:
+        """
+        Return service counters, queue depth and latency percentiles.
+
+        Returns:
+            Dictionary of metric name to value; latencies are in milliseconds
+        """
+        latencies = np.asarray(self._latencies, dtype=float) * 1000
+        metrics = dict(self._counters)
+        metrics['queue_depth'] = self._queue.qsize() if self._queue else 0
+        metrics['in_flight'] = len(self._inflight)
+        metrics['mean_batch_size'] = float(np.mean(self._batch_sizes)) if self._batch_sizes else 0.0
+        for name, quantile in (('p50', 50), ('p90', 90), ('p99', 99)):
+            metrics[f'latency_{name}_ms'] = float(np.percentile(latencies, quantile)) if len(latencies) else 0.0
+        return metrics
+
+
+def _response(status: int, payload: dict, keep_alive: bool) -> bytes:
+    """Encode a JSON HTTP/1.1 response."""
+    body = json.dumps(payload).encode()
+    head = (f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + body
+
+
+async def _handle_request(service: SolverService, method: str, target: str, body: bytes) -> Tuple[int, dict]:
+    """Route one HTTP request and return (status, payload)."""
+    if method == 'GET' and target == '/health':
+        return 200, {'status': 'ok'}
+    if method == 'GET' and target == '/metrics':
+        return 200, service.metrics()
+    if method != 'POST' or target != '/solve':
+        return 404, {'error': f"No route for {method} {target}"}
+
+    try:
+        request = json.loads(body)
+        polygon = request['polygon']
+        timeout = request.get('timeout')
+        options = {name: request[name] for name in SOLVE_OPTIONS if name in request}
+        if request.get('constraints'):
+            options['constraints'] = RectangleConstraints(**request['constraints'])
+    except (ValueError, KeyError, TypeError) as error:
+        return 400, {'error': f"Invalid request: {error}"}
+    try:
+        record = await service.solve(polygon, timeout=timeout, **options)
+    except asyncio.TimeoutError:
+        return 504, {'error': "Deadline exceeded"}
+    except ServiceOverloaded as error:
+        return 503, {'error': str(error)}
+    except (ValueError, TypeError, IndexError) as error:
+        return 400, {'error': f"Invalid polygon: {error}"}
+    return (400 if 'error' in record else 200), record
+
+
+async def _handle_connection(service: SolverService, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter, max_body: int) -> None:
+    """Serve HTTP/1.1 requests on one connection until the client closes it."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, target, version = request_line.decode('latin-1').split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get('content-length', 0))
+            keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+            if length > max_body:
+                writer.write(_response(413, {'error': "Request body too large"}, False))
+                await writer.drain()
+                break
+            body = await reader.readexactly(length) if length else b''
+
+            status, payload = await _handle_request(service, method, target, body)
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8080, max_body: int = 16 * 1024 * 1024,
+                ready: asyncio.Event = None, **service_options) -> None:
+    """
+    Run the HTTP service until cancelled.
+
+    Args:
+        host: Interface to listen on (default: loopback only)
+        port: TCP port (0 picks a free port)
+        max_body: Largest accepted request body in bytes
+        ready: Optional event set once the server is listening; the bound port
+            is then available as ``ready.port``
+        **service_options: Keyword arguments for ``SolverService``
+    """
+    async with SolverService(**service_options) as service:
+        server = await asyncio.start_server(
+            lambda reader, writer: _handle_connection(service, reader, writer, max_body), host, port)
+        async with server:
+            if ready is not None:
+                ready.port = server.sockets[0].getsockname()[1]
+                ready.service = service
+                ready.set()
+            await server.serve_forever()
@@ -1,10 +1,23 @@
 """
 Visualization utilities for polygons and rectangles.
+
+Plotting is an optional extra: install it with ``pip install max-inscribed-rectangle[plot]``.
 """
 
+try:
+    import matplotlib  # noqa: F401
+except ImportError as error:
+    raise ImportError(
+        "Plotting requires matplotlib; install it with "
+        "`pip install max-inscribed-rectangle[plot]`"
+    ) from error
+
 from .plotter import plot_polygon_with_rectangle, plot_random_polygon
+from .batch_renderer import render_batch, render_page
 
 __all__ = [
     'plot_polygon_with_rectangle',
-    'plot_random_polygon'
+    'plot_random_polygon',
+    'render_batch',
+    'render_page'
 ] 
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+Batch rendering of many polygon/rectangle results without global pyplot state.
+"""
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Sequence, Tuple
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.collections import LineCollection, PolyCollection
+from ..core.geometry_utils import sort_rectangle_coords
+
+
+def _layout_page(results: Sequence[Tuple[list, list]], columns: int, rows: int, margin: float) -> tuple:
+    """
+    Scale every result of a page into its own grid cell.
+
+    Args:
+        results: Sequence of (polygon_coords, rectangle_coords) pairs
+        columns: Number of cells per row
+        rows: Number of rows per page
+        margin: Fraction of each cell left empty around the drawing
+
+    Returns:
+        Tuple of (polygons, rectangles) in page coordinates, where each cell is a
+        unit square and row 0 is at the top
+    """
+    polygons, rectangles = [], []
+    for index, (polygon_coords, rectangle_coords) in enumerate(results):
+        polygon = np.asarray(polygon_coords, dtype=float)
+        rectangle = np.asarray(sort_rectangle_coords(list(rectangle_coords)), dtype=float)
+        low = polygon.min(axis=0)
+        span = max(float(np.max(polygon.max(axis=0) - low)), 1e-12)
+        scale = (1 - 2 * margin) / span
+        offset = np.array([index % columns, rows - 1 - index // columns]) + margin
+        polygons.append((polygon - low) * scale + offset)
+        rectangles.append((rectangle - low) * scale + offset)
+    return polygons, rectangles
+
+
+def render_page(results: Sequence[Tuple[list, list]], columns: int = 4, rows: int = 4,
+                labels: bool = False, titles: Sequence[str] = None,
+                figsize: Tuple[float, float] = (11, 8.5)) -> Figure:
+    """
+    Draw one page of results as a grid on a standalone figure.
+
+    Args:
+        results: Up to columns * rows (polygon_coords, rectangle_coords) pairs
+        columns: Number of cells per row
+        rows: Number of rows per page
+        labels: Whether to label polygon vertices with their index
+        titles: Optional caption for every cell
+        figsize: Page size in inches
+
+    Returns:
+        Matplotlib figure with an Agg canvas attached
+    """
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    axes = figure.add_axes((0, 0, 1, 1))
+    axes.set_xlim(0, columns)
+    axes.set_ylim(0, rows)
+    axes.set_aspect("equal")
+    axes.set_axis_off()
+
+    polygons, rectangles = _layout_page(results, columns, rows, margin=0.08)
+    axes.add_collection(PolyCollection(polygons, closed=True, facecolors="none",
+                                       edgecolors="red", linewidths=0.6))
+    axes.add_collection(PolyCollection(rectangles, closed=True, facecolors=(0, 0, 1, 0.15),
+                                       edgecolors="blue", linewidths=0.6))
+
+    # Cell borders
+    grid = [[(x, 0), (x, rows)] for x in range(columns + 1)] + [[(0, y), (columns, y)] for y in range(rows + 1)]
+    axes.add_collection(LineCollection(grid, colors="0.85", linewidths=0.5))
+
+    if labels:
+        for cell in polygons:
+            for i, (x, y) in enumerate(cell):
+                axes.text(x, y, str(i), horizontalalignment="center", verticalalignment="center",
+                          fontsize=4, color='red')
+    if titles is not None:
+        for index, title in enumerate(titles[:len(results)]):
+            axes.text(index % columns + 0.5, rows - index // columns - 0.04, str(title),
+                      horizontalalignment="center", verticalalignment="top", fontsize=6)
+    return figure
+
+
+def _render_png_page(args: tuple) -> str:
+    """Render one page to a PNG file (worker entry point)."""
+    results, output_file, columns, rows, labels, titles, figsize, dpi = args
+    figure = render_page(results, columns, rows, labels, titles, figsize)
+    figure.savefig(output_file, dpi=dpi)
+    return output_file
+
+
+def render_batch(results: Iterable[Tuple[list, list]], output: str, columns: int = 4, rows: int = 4,
+                 labels: bool = False, titles: Sequence[str] = None, dpi: int = 100,
+                 figsize: Tuple[float, float] = (11, 8.5), jobs: int = 1) -> List[str]:
+    """
+    Render many results as grid pages.
+
+    A path ending in ``.pdf`` produces a single multi-page PDF. Any other path is
+    treated as a directory that receives one ``page_NNNN.png`` file per page,
+    rendered in ``jobs`` worker processes.
+
+    Args:
+        results: Iterable of (polygon_coords, rectangle_coords) pairs
+        output: PDF file path or output directory for PNG pages
+        columns: Number of cells per row
+        rows: Number of rows per page
+        labels: Whether to label polygon vertices with their index
+        titles: Optional caption for every result
+        dpi: Resolution of PNG pages
+        figsize: Page size in inches
+        jobs: Number of worker processes for PNG pages
+
+    Returns:
+        List of written file paths
+    """
+    results = list(results)
+    per_page = columns * rows
+    pages = [
+        (results[start:start + per_page],
+         None if titles is None else list(titles[start:start + per_page]))
+        for start in range(0, len(results), per_page)
+    ]
+
+    if output.lower().endswith('.pdf'):
+        with PdfPages(output) as pdf:
+            for page_results, page_titles in pages:
+                pdf.savefig(render_page(page_results, columns, rows, labels, page_titles, figsize))
+        return [output]
+
+    os.makedirs(output, exist_ok=True)
+    tasks = [
+        (page_results, os.path.join(output, f"page_{number:04d}.png"), columns, rows, labels, page_titles, figsize, dpi)
+        for number, (page_results, page_titles) in enumerate(pages)
+    ]
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(_render_png_page, tasks))
+    return [_render_png_page(task) for task in tasks]
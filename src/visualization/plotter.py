@@ -57,14 +57,19 @@ def plot_polygon_with_rectangle(polygon_coords: List[Tuple[float, float]],
 
 def plot_random_polygon(polygon_coords: List[Tuple[float, float]], 
                        rectangle_coords: List[np.ndarray], 
-                       output_file: str) -> None:
+                       output_file: str,
+                       show_plot: bool = True) -> None:
     """
     Plot a random polygon with its maximum inscribed rectangle (legacy function).
     
+    For many results, ``formats.exporters.export_results`` writes vector
+    overlays without matplotlib.
+    
     Args:
         polygon_coords: List of (x, y) coordinates defining the polygon
         rectangle_coords: List of 4 rectangle corner coordinates
         output_file: File path to save the plot
+        show_plot: Whether to display the plot
     """
     plt.figure()
     plt.gca().set_aspect("equal")
@@ -85,4 +90,8 @@ def plot_random_polygon(polygon_coords: List[Tuple[float, float]],
     plt.plot(rect_xs, rect_ys, "b-", linewidth=0.2)
     
     plt.savefig(output_file, dpi=300)
-    plt.show() 
\ No newline at end of file
+    
+    if show_plot:
+        plt.show()
+    else:
+        plt.close()
@@ -2,11 +2,26 @@
 Tests for the maximum inscribed rectangle algorithms.
 """
 
+import time
 import pytest
 import numpy as np
-from shapely.geometry import Polygon
+from shapely.geometry import Point, Polygon, box
+from shapely.ops import unary_union
 from src.algorithms.convex_algorithm import find_max_rectangle_convex
-from src.algorithms.general_algorithm import find_max_rectangle_general
+from src.algorithms.engines import find_max_rectangle, solve
+from src.algorithms.cost_model import calibrate, estimate_cost, plan_schedule, tune_point_gap
+from src.algorithms.general_algorithm import find_max_rectangle_general, find_final_rectangle
+from src.algorithms.fixed_orientation import find_max_rectangle_at_angle
+from src.algorithms.incremental import IncrementalGeneralSolver
+from src.algorithms.multi_rectangle import find_top_k_rectangles
+from src.algorithms.orientation_profile import RectangleOrientationProfile
+from src.algorithms.sampling_algorithm import find_max_rectangle_sampling
+from src.core.classification import classify_polygon
+from src.core.constraints import RectangleConstraints
+from src.core.distance_field import DistanceField
+from src.core.symmetry import detect_symmetries, sample_orbits
+from src.core.geometry_utils import azimuth, sort_rectangle_coords
+from src.core.polygon_processor import split_into_points
 
 
 def test_convex_algorithm_square():
@@ -72,4 +87,338 @@ def test_polygon_validation():
         find_max_rectangle_convex(invalid_polygon)
     
     with pytest.raises(Exception):
-        find_max_rectangle_general(invalid_polygon) 
\ No newline at end of file
+        find_max_rectangle_general(invalid_polygon) 
+
+
+def test_incremental_solver_matches_general():
+    """Test that the incremental solver starts from the same answer as the general algorithm."""
+    l_shape = [(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)]
+
+    solver = IncrementalGeneralSolver(l_shape, point_gap=0.1)
+    side, angle, point1, point2 = solver.best()
+    expected = find_max_rectangle_general(l_shape, point_gap=0.1)
+
+    assert side * np.linalg.norm(point2 - point1) == pytest.approx(
+        expected[0] * np.linalg.norm(expected[3] - expected[2]), rel=0.02)
+
+
+def test_incremental_solver_edits():
+    """Test that edits give the same answer as re-solving from scratch."""
+    l_shape = [(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)]
+    solver = IncrementalGeneralSolver(l_shape, point_gap=0.1)
+
+    solver.move_vertex(3, (1.5, 1.5))
+    solver.insert_vertex(1, (1, -0.5))
+    side, angle, point1, point2 = solver.delete_vertex(5)
+
+    fresh = IncrementalGeneralSolver(solver.vertices, point_gap=0.1)
+    fresh_side, _, fresh_point1, fresh_point2 = fresh.best()
+    assert len(solver.vertices) == 6
+    assert side * np.linalg.norm(point2 - point1) == pytest.approx(
+        fresh_side * np.linalg.norm(fresh_point2 - fresh_point1), rel=0.05)
+
+    with pytest.raises(ValueError):
+        solver.move_vertex(0, (3, 3))
+
+    # Long sessions keep only a bounded share of slots from removed edges
+    for step in range(10):
+        solver.move_vertex(2, (2.0 + 0.1 * (step % 2), 1.0))
+    assert len(solver._points) <= 2 * np.count_nonzero(solver._alive)
+    side, angle, point1, point2 = solver.best()
+    fresh_side, _, fresh_point1, fresh_point2 = IncrementalGeneralSolver(solver.vertices, point_gap=0.1).best()
+    assert side * np.linalg.norm(point2 - point1) == pytest.approx(
+        fresh_side * np.linalg.norm(fresh_point2 - fresh_point1), rel=0.05)
+
+
+def test_top_k_rectangles_non_overlapping():
+    """Test that a greedy packing of an L-shape fills both arms without overlaps."""
+    l_shape = [(0, 0), (3, 0), (3, 1), (1, 1), (1, 3), (0, 3)]
+    polygon = Polygon(l_shape).buffer(1e-9)
+
+    results = find_top_k_rectangles(l_shape, 3, point_gap=0.1)
+    rectangles = [Polygon(sort_rectangle_coords(list(find_final_rectangle(*result)))) for result in results]
+
+    areas = [rectangle.area for rectangle in rectangles]
+    assert areas == sorted(areas, reverse=True)
+    assert sum(areas) > 4.5
+    assert all(polygon.covers(rectangle) for rectangle in rectangles)
+    for i, first in enumerate(rectangles):
+        for second in rectangles[i + 1:]:
+            assert first.intersection(second).area < 1e-9
+
+    overlapping = find_top_k_rectangles(l_shape, 3, non_overlapping=False, point_gap=0.1)
+    assert len(overlapping) == 3
+    assert overlapping[0][0] == results[0][0]
+
+
+def test_top_k_rectangles_overlapping_are_distinct():
+    """Test that the k largest rectangles do not repeat one rectangle reached from several bases."""
+    l_shape = [(0, 0), (3, 0), (3, 1), (1, 1), (1, 3), (0, 3)]
+    results = find_top_k_rectangles(l_shape, 4, non_overlapping=False, point_gap=0.1)
+    rectangles = [Polygon(sort_rectangle_coords(list(find_final_rectangle(*result)))) for result in results]
+
+    areas = [rectangle.area for rectangle in rectangles]
+    assert len(results) == 4
+    assert areas == sorted(areas, reverse=True)
+    for i, first in enumerate(rectangles):
+        for second in rectangles[i + 1:]:
+            assert first.symmetric_difference(second).area > 1e-3
+
+
+def test_general_algorithm_constraints():
+    """Test that aspect-ratio, orientation and minimum-side constraints are applied during the search."""
+    strip = [(0, 0), (4, 0), (4, 1), (0, 1)]
+
+    # Unconstrained the answer is the whole 4:1 strip; capped sweeps still find a 2:1 rectangle
+    side, angle, point1, point2 = find_max_rectangle_general(strip, point_gap=0.1,
+                                                             constraints=RectangleConstraints(max_aspect=2.0))
+    base = np.linalg.norm(point2 - point1)
+    assert max(side, base) / min(side, base) <= 2.0 + 1e-9
+    assert side * base == pytest.approx(2.0, abs=0.1)
+
+    window = RectangleConstraints(orientation=np.radians(30), orientation_tolerance=np.radians(5))
+    side, angle, point1, point2 = find_max_rectangle_general(strip, point_gap=0.1, constraints=window)
+    deviation = np.mod(azimuth(point1, point2) - np.radians(30), np.pi/2)
+    assert min(deviation, np.pi/2 - deviation) <= np.radians(5)
+
+    with pytest.raises(ValueError):
+        find_max_rectangle_general(strip, point_gap=0.1, constraints=RectangleConstraints(min_side=2.0))
+
+
+def test_fixed_orientation_exact():
+    """Test exact fixed-angle answers on shapes with known optima, including a hole."""
+    cases = [
+        ([(0, 0), (4, 0), (0, 2)], None, 0.0, 2.0),                        # right triangle: half the legs
+        ([(1, 0), (0, 1), (-1, 0), (0, -1)], None, 0.0, 1.0),              # diamond, axis-aligned
+        ([(1, 0), (0, 1), (-1, 0), (0, -1)], None, np.pi/4, 2.0),          # diamond, aligned to its sides
+        ([(0, 0), (10, 0), (10, 10), (0, 10)], [[(4, 4), (6, 4), (6, 6), (4, 6)]], 0.0, 40.0),
+    ]
+    for coords, holes, angle, expected in cases:
+        side, rectangle_angle, point1, point2 = find_max_rectangle_at_angle(coords, angle, holes)
+        rectangle = Polygon(sort_rectangle_coords(list(find_final_rectangle(side, rectangle_angle, point1, point2))))
+
+        assert rectangle.area == pytest.approx(expected)
+        assert azimuth(point1, point2) == pytest.approx(angle)
+        assert Polygon(coords, holes).buffer(1e-9).covers(rectangle)
+
+
+def test_cost_model_predicts_convex_runtime():
+    """Test that the convex engine's predicted runtime is close to the measured one."""
+    ellipse = [(5 * np.cos(angle), 3 * np.sin(angle)) for angle in np.linspace(0, 2 * np.pi, 41)[:-1]]
+    estimate = estimate_cost(ellipse, 0.5, 'convex')
+
+    measured = []
+    for _ in range(3):
+        start = time.perf_counter()
+        find_max_rectangle_convex(ellipse, 0.5)
+        measured.append(time.perf_counter() - start)
+
+    # Timing is noisy, so only a factor of 2 either way is asserted
+    assert min(measured) / 2 < estimate.seconds < min(measured) * 2
+
+
+def test_cost_model_tuning():
+    """Test that predictions are available before solving and that tuned gaps respect their targets."""
+    l_shape = [(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)]
+    calibration = calibrate(l_shape, 'general')
+    coarse = estimate_cost(l_shape, 0.2, 'general', calibration)
+    fine = estimate_cost(l_shape, 0.05, 'general', calibration)
+
+    assert coarse.samples == len(split_into_points(Polygon(l_shape), 0.2))
+    assert 0 < coarse.seconds < fine.seconds
+    assert fine.relative_error < coarse.relative_error
+
+    budgeted = tune_point_gap(l_shape, 'general', time_budget=0.05, calibration=calibration)
+    assert budgeted.seconds <= 0.05 < estimate_cost(l_shape, 0.9 * budgeted.point_gap, 'general', calibration).seconds
+    accurate = tune_point_gap(l_shape, 'general', target_error=0.05, calibration=calibration)
+    assert accurate.relative_error == pytest.approx(0.05)
+    assert tune_point_gap(l_shape, 'general', time_budget=0.05, target_error=0.05, calibration=calibration) == budgeted
+
+    schedule = plan_schedule(l_shape, 0.05, 'general', levels=3, calibration=calibration)
+    assert [estimate.point_gap for estimate in schedule] == pytest.approx([4 * schedule[-1].point_gap,
+                                                                           2 * schedule[-1].point_gap,
+                                                                           schedule[-1].point_gap])
+    assert sum(estimate.seconds for estimate in schedule) <= 0.05
+    assert schedule[-1].point_gap > budgeted.point_gap
+
+
+def test_find_max_rectangle_dispatch():
+    """Test shape classification and that each class is sent to an engine that is correct for it."""
+    cases = [
+        (Polygon([(0, 0), (4, 0), (4, 4), (0, 4)], [[(1, 1), (2, 1), (2, 2), (1, 2)]]), 'holes', 'orientations', 8.0),
+        (Polygon([(0, 0), (3, 0), (3, 3), (2, 3), (2, 1), (1, 1), (1, 3), (0, 3)]), 'rectilinear', 'orientations', 3.0),
+        (Polygon([(0, 0), (10, 0), (10, 5), (5.5, 5), (5, 4.8), (4.5, 5), (0, 5)]), 'near_rectangular',
+         'orientations', 48.0),
+        (Polygon([(0, 0), (2, 0), (2, 1), (1, 1.2), (0, 2)]), 'star_shaped', 'orientations', None),
+        (Polygon([(2, 0), (1, 2), (-1, 2), (-2, 0), (-1, -2), (1, -2)]), 'convex', 'convex', None),
+    ]
+    for polygon, kind, engine, expected in cases:
+        assert classify_polygon(polygon).kind == kind
+        result = find_max_rectangle(polygon, relative_gap=0.05)
+
+        assert (result.shape_class, result.engine) == (kind, engine)
+        assert 'classify' in result.timings
+        assert polygon.buffer(1e-9).covers(Polygon(result.corners))
+        if expected is not None:
+            assert result.area == pytest.approx(expected)
+
+    shape = classify_polygon(Polygon([(0, 0), (2, 0), (2, 1), (1, 1.2), (0, 2)]))
+    assert shape.star_shaped and not shape.convex and not shape.rectilinear
+
+    # A staircase traced from a raster mask holds a much larger tilted rectangle than an axis-aligned one
+    staircase = unary_union([box(step, step, step + 3, step + 3) for step in range(13)])
+    result = find_max_rectangle(staircase, relative_gap=0.05)
+    assert classify_polygon(staircase).rectilinear and result.engine == 'orientations'
+    assert result.area == pytest.approx(52.0, rel=1e-6)
+
+
+def test_refinement_beyond_sample_grid():
+    """Test that refinement recovers the area a coarse sample grid misses and reports the gain."""
+    angle = 0.35
+    rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+    rectangle = [tuple(rotation @ corner) for corner in np.array([(0, 0), (4, 0), (4, 2), (0, 2)])]
+
+    coarse = solve(rectangle, 'general', relative_gap=0.1)
+    refined = solve(rectangle, 'general', relative_gap=0.1, refine=True)
+    assert coarse.area < 7.9
+    assert refined.area == pytest.approx(8.0, rel=1e-6)
+    assert refined.refinement.initial_area == pytest.approx(coarse.area)
+    assert refined.refinement.gain == pytest.approx(refined.area - coarse.area)
+    assert refined.refinement.refined_angle == pytest.approx(angle, abs=1e-5)
+    assert Polygon(rectangle).buffer(1e-9).covers(Polygon(refined.corners))
+    assert 'refine' in refined.timings and 'refinement' in refined.to_record()
+
+
+def test_symmetry_fundamental_domain():
+    """Test symmetry detection and that restricting pairs to one orbit keeps the answer."""
+    cross = [(1, 0), (2, 0), (2, 1), (3, 1), (3, 2), (2, 2), (2, 3), (1, 3), (1, 2), (0, 2), (0, 1), (1, 1)]
+    symmetries = detect_symmetries(cross)
+    assert sorted(symmetry.kind for symmetry in symmetries) == ['reflection'] * 4 + ['rotation'] * 3
+    assert [symmetry.kind for symmetry in detect_symmetries([(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)])] == \
+        ['reflection']
+    assert detect_symmetries([(0, 0), (3, 0), (3, 1), (1, 2), (0, 2)]) == []
+
+    samples = sample_orbits(split_into_points(Polygon(cross), 0.1), symmetries)
+    assert np.all(samples.permutations >= 0)
+    for symmetry, permutation in zip(symmetries, samples.permutations):
+        assert np.allclose(symmetry.apply(samples.points), samples.points[permutation])
+
+    # The plain samples are kept, so the answer only moves by rounding in the sweep
+    pinwheel = [tuple(np.array([[np.cos(turn), -np.sin(turn)], [np.sin(turn), np.cos(turn)]]) @ point)
+                for turn in np.arange(4) * np.pi/2 for point in [(1, -1), (1.5, -1), (1.5, -0.3)]]
+    plain = find_max_rectangle_general(pinwheel, 0.1)
+    reduced = find_max_rectangle_general(pinwheel, 0.1, symmetry=True)
+    assert reduced[0] * np.linalg.norm(reduced[2] - reduced[3]) == pytest.approx(
+        plain[0] * np.linalg.norm(plain[2] - plain[3]), rel=0.02)
+
+    side, angle, point1, point2 = find_max_rectangle_general(cross, 0.1, symmetry=True)
+    assert side * np.linalg.norm(point2 - point1) == pytest.approx(3.0, rel=0.02)
+
+
+def test_symmetry_keeps_mirror_symmetric_answers():
+    """Test that skipping mirrored pairs never finds less area than a run without symmetry."""
+    l_shape = [(0, 0), (3, 0), (3, 1), (1, 1), (1, 3), (0, 3)]
+    u_shape = [(0, 0), (3, 0), (3, 3), (2, 3), (2, 1), (1, 1), (1, 3), (0, 3)]
+    hexagon = [(np.cos(turn), np.sin(turn)) for turn in np.arange(6) * np.pi/3 + np.pi/6]
+    for coords, engine, relative_gap, ray_index in ((l_shape, 'general', 0.1, False), (u_shape, 'general', 0.1, False),
+                                                    (u_shape, 'general', 0.05, True),
+                                                    (hexagon, 'general', 0.05, False), (hexagon, 'general', 0.1, True),
+                                                    (hexagon, 'convex', 0.05, False)):
+        plain = solve(coords, engine, relative_gap=relative_gap, ray_index=ray_index)
+        reduced = solve(coords, engine, relative_gap=relative_gap, ray_index=ray_index, symmetry=True)
+        # Symmetric runs sweep with the edge index and count heights a rounding error short of a step as the step
+        assert reduced.area >= plain.area - 1e-9
+
+
+def test_symmetry_with_orientation_constraint():
+    """Test that symmetry does not skip pairs whose mirrored image an orientation window rules out."""
+    hexagon = [(np.cos(turn), np.sin(turn)) for turn in np.arange(6) * np.pi/3]
+    for engine in ('general', 'convex'):
+        for orientation in (0.0, 0.1, np.radians(30)):
+            window = RectangleConstraints(orientation=orientation, orientation_tolerance=np.radians(3))
+            plain = solve(hexagon, engine, relative_gap=0.05, constraints=window)
+            reduced = solve(hexagon, engine, relative_gap=0.05, constraints=window, symmetry=True)
+            assert reduced.area == pytest.approx(plain.area)
+            first, second = np.asarray(reduced.corners[:2])
+            deviation = np.mod(azimuth(first, second) - orientation, np.pi/2)
+            assert min(deviation, np.pi/2 - deviation) <= np.radians(3) + 1e-9
+
+
+def test_ray_index_engines_agree():
+    """Test that both engines give the same rectangle with and without the edge index."""
+    hexagon = [(2, 0), (4, 1), (4, 3), (2, 4), (0, 3), (0, 1)]
+    star = [(0, 0), (2, 1), (4, 0), (3, 2), (4, 4), (2, 3), (0, 4), (1, 2)]
+    for engine, coords in (('convex', hexagon), ('general', star)):
+        plain = solve(coords, engine, relative_gap=0.05)
+        indexed = solve(coords, engine, relative_gap=0.05, ray_index=True)
+        assert indexed.area == pytest.approx(plain.area)
+        assert np.allclose(indexed.corners, plain.corners)
+
+
+def test_distance_field_rejects_without_changing_results():
+    """Test that distance-field quick rejects skip most bases and keep both engines' rectangles."""
+    hexagon = [(2, 0), (4, 1), (4, 3), (2, 4), (0, 3), (0, 1)]
+    star = [(0, 0), (2, 1), (4, 0), (3, 2), (4, 4), (2, 3), (0, 4), (1, 2)]
+    for engine, coords in (('convex', hexagon), ('general', star)):
+        plain = solve(coords, engine, relative_gap=0.05)
+        screened = solve(coords, engine, relative_gap=0.05, distance_field=True)
+        assert screened.area == pytest.approx(plain.area)
+        assert np.allclose(screened.corners, plain.corners)
+        assert screened.quick_reject.rejected > 0.5 * screened.quick_reject.bases
+        assert 'quick_reject' in screened.to_record()
+
+    # The star's centre is bounded around its true distance, and a point in its notch is certainly outside
+    field = DistanceField(Polygon(star), 0.3)
+    lower, upper = field.bounds(np.array([[2.0, 2.0], [3.6, 2.0]]))
+    assert lower[0] <= Polygon(star).exterior.distance(Point(2, 2)) <= upper[0]
+    assert upper[1] < 0
+
+
+def test_orientation_profile_range_queries(tmp_path):
+    """Test that profile queries return the best sampled orientation in range and survive saving."""
+    # A 4 x 1 bar rotated by 0.3 rad: only orientations near 0.3 fit the whole bar
+    rotation = np.array([[np.cos(0.3), -np.sin(0.3)], [np.sin(0.3), np.cos(0.3)]])
+    bar = [tuple(rotation @ corner) for corner in np.array([(0, 0), (4, 0), (4, 1), (0, 1)], dtype=float)]
+    profile = RectangleOrientationProfile(bar, resolution=np.pi / 90)
+
+    # The bar's own direction is a critical angle, so it is sampled exactly
+    assert profile.best().area == pytest.approx(4.0)
+    assert profile.best().angle == pytest.approx(0.3)
+    assert profile.best_within(0.3 + np.pi / 2, 0.01).area == pytest.approx(4.0)
+
+    # Away from it the answer is the best grid angle in the range
+    match = profile.best_within(1.0, 0.1)
+    in_range = np.abs(profile.angles - 1.0) <= 0.1
+    assert match.area == pytest.approx(profile.areas[in_range].max())
+    assert match.area < 4.0
+    assert Polygon(bar).buffer(1e-9).contains(Polygon(match.corners))
+
+    path = str(tmp_path / "bar_profile.npz")
+    profile.save(path)
+    loaded = RectangleOrientationProfile.load(path)
+    assert loaded.best_within(1.0, 0.1).area == match.area
+    assert RectangleOrientationProfile(bar, resolution=np.pi / 90, jobs=2).areas.tolist() == profile.areas.tolist()
+
+
+def test_sampling_engine_is_seeded_and_stalls():
+    """Test that the sampling engine reproduces runs from its seed and stops once the best area stalls."""
+    l_shape = [(0, 0), (4, 0), (4, 1), (1, 1), (1, 4), (0, 4)]
+    exhaustive = find_max_rectangle_general(l_shape, 0.1, ray_index=True)
+    (side, angle, point1, point2), report = find_max_rectangle_sampling(l_shape, 0.1, seed=3)
+    again, repeated = find_max_rectangle_sampling(l_shape, 0.1, seed=3)
+
+    assert again[0] == side and np.allclose(again[2:], (point1, point2))
+    assert np.array_equal(report.history, repeated.history)
+    assert report.stalled and report.evaluations < len(split_into_points(Polygon(l_shape), 0.1)) ** 2
+    # The history only grows and ends at the returned rectangle
+    assert np.all(np.diff(report.history[:, 1]) >= 0)
+    assert report.history[-1, 1] == pytest.approx(side * np.linalg.norm(point2 - point1))
+    assert side * np.linalg.norm(point2 - point1) == pytest.approx(
+        exhaustive[0] * np.linalg.norm(exhaustive[3] - exhaustive[2]), rel=0.05)
+
+    result = solve(l_shape, 'sampling', point_gap=0.1, seed=3, patience=5)
+    assert result.sampling.stalled and result.sampling.batches < report.batches
+    assert result.to_record()['sampling']['history'][-1][1] == pytest.approx(result.area)
+    assert solve(l_shape, 'sampling', point_gap=0.1, seed=3).area == pytest.approx(report.history[-1, 1])
+    with pytest.raises(ValueError):
+        solve(l_shape, 'sampling', point_gap=0.1, ray_index=True)
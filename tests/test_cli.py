@@ -0,0 +1,99 @@
+"""
+Tests for the input readers, the batch runner and the command-line entry point.
+"""
+
+import json
+import pytest
+from src.algorithms.engines import solve
+from src.batch.runner import solve_many
+from src.cli import main
+from src.formats.readers import read_polygons
+
+SQUARE_WKT = "POLYGON ((0 0, 1 0, 1 1, 0 1, 0 0))"
+
+
+def test_read_polygons_formats(tmp_path):
+    """Test that WKT, GeoJSON and CSV inputs give the same polygon."""
+    (tmp_path / "a.wkt").write_text(f"square\t{SQUARE_WKT}\n")
+    (tmp_path / "a.geojson").write_text(json.dumps({
+        "type": "FeatureCollection",
+        "features": [{"type": "Feature", "id": "square", "properties": {},
+                      "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]}}],
+    }))
+    (tmp_path / "a.csv").write_text("id,x,y\nsquare,0,0\nsquare,1,0\nsquare,1,1\nsquare,0,1\n")
+
+    expected = [("square", [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)])]
+    for name in ("a.wkt", "a.geojson", "a.csv"):
+        assert list(read_polygons(str(tmp_path / name))) == expected
+
+    with pytest.raises(ValueError):
+        read_polygons(str(tmp_path / "a.shp"))
+
+
+def test_solve_many_parallel_keeps_order():
+    """Test that worker processes return records in input order and report errors."""
+    square = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    items = [("a", square), ("bad", [(0, 0), (1, 0)]), ("b", square)]
+
+    records = list(solve_many(items, jobs=2, chunk_size=1, engine="general", point_gap=0.1))
+
+    assert [record["id"] for record in records] == ["a", "bad", "b"]
+    assert "error" in records[1]
+    assert records[0]["area"] == pytest.approx(records[2]["area"])
+
+
+def test_engines_reject_unsupported_options():
+    """Test that options an engine would ignore raise instead of being dropped."""
+    square = [(0, 0), (1, 0), (1, 1), (0, 1)]
+
+    with pytest.raises(ValueError, match="seed"):
+        solve(square, "grid", point_gap=0.1, seed=1)
+    with pytest.raises(ValueError, match="grid_size"):
+        solve(square, "general", point_gap=0.1, grid_size=0.1)
+
+    records = list(solve_many([("a", square)], engine="convex", point_gap=0.1, seed=1))
+    assert records[0]["error"].startswith("ValueError")
+
+
+def test_cli_solve_writes_ndjson(tmp_path, capsys):
+    """Test that the solve command writes one NDJSON record per polygon."""
+    source = tmp_path / "input.wkt"
+    source.write_text(f"{SQUARE_WKT}\n{SQUARE_WKT}\n")
+    output = tmp_path / "out.ndjson"
+
+    code = main(["solve", str(source), "--point-gap", "0.1", "-o", str(output), "--no-progress", "--profile"])
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert code == 0
+    assert len(records) == 2
+    assert records[0]["area"] > 0.8
+    assert len(records[0]["corners"]) == 4
+    assert "search" in capsys.readouterr().err
+
+
+def test_cli_journal_resumes_interrupted_run(tmp_path, capsys):
+    """Test that a journaled run skips polygons already journaled and cuts off a torn last line."""
+    source = tmp_path / "input.wkt"
+    source.write_text("".join(f"p{index}\t{SQUARE_WKT}\n" for index in range(4)))
+    journal = tmp_path / "run.journal"
+    first = tmp_path / "first.ndjson"
+
+    # An interrupted run: two polygons journaled, then half a record
+    main(["solve", str(source), "--point-gap", "0.1", "-o", str(first), "--no-progress", "--journal", str(journal)])
+    lines = journal.read_text().splitlines(keepends=True)
+    journal.write_text("".join(lines[:3]) + lines[3][:20])
+
+    output = tmp_path / "second.ndjson"
+    code = main(["solve", str(source), "--point-gap", "0.1", "-o", str(output), "--no-progress",
+                 "--journal", str(journal)])
+
+    assert code == 0
+    assert [json.loads(line)["id"] for line in output.read_text().splitlines()] == ["p2", "p3"]
+    entries = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert sorted(entry["id"] for entry in entries if "id" in entry) == ["p0", "p1", "p2", "p3"]
+
+    capsys.readouterr()
+    assert main(["status", str(journal)]) == 0
+    report = capsys.readouterr().out
+    assert "completed   4 of 4 polygons (0 failed)" in report
+    assert "remaining   0 polygons" in report
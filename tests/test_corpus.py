@@ -0,0 +1,54 @@
+"""
+Tests for the packed, memory-mapped polygon corpus.
+"""
+
+import numpy as np
+from shapely.geometry import MultiPolygon, Polygon
+from src.algorithms.engines import solve
+from src.batch.runner import solve_corpus
+from src.cli import main
+from src.formats.corpus import (
+    PolygonCorpus, STATUS_DONE, STATUS_FAILED, open_results, write_corpus,
+)
+
+SQUARE = [(0, 0), (1, 0), (1, 1), (0, 1)]
+
+
+def test_corpus_round_trip(tmp_path):
+    """Test that holes and multipart records survive packing and are read as memory maps."""
+    with_hole = Polygon([(0, 0), (4, 0), (4, 4), (0, 4)], [[(1, 1), (2, 1), (2, 2), (1, 2)]])
+    multipart = MultiPolygon([Polygon(SQUARE), Polygon([(5, 5), (8, 5), (8, 8), (5, 8)])])
+    path = str(tmp_path / "corpus")
+
+    assert write_corpus(path, [("square", SQUARE), ("hole", with_hole), ("multi", multipart)]) == 3
+    corpus = PolygonCorpus(path)
+
+    assert len(corpus) == 3
+    assert isinstance(corpus.coords, np.memmap)
+    assert list(corpus.items())[0] == ("square", [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)])
+    assert corpus.geometry(1).equals(with_hole)
+    assert corpus.geometry(2).equals(multipart)
+    # The engines get the exterior of the largest part
+    assert Polygon(corpus.exterior_coords(2)).area == 9
+
+
+def test_solve_corpus_fills_results(tmp_path, capsys):
+    """Test that parallel workers write every row of the results array."""
+    path = str(tmp_path / "corpus")
+    write_corpus(path, [(str(i), SQUARE) for i in range(5)] + [("bad", [(0, 0), (1, 0), (2, 0)])])
+
+    solved, failed = solve_corpus(path, jobs=2, chunk_size=2, engine="general", point_gap=0.1)
+    results = open_results(path)
+
+    assert (solved, failed) == (6, 1)
+    assert list(results["status"]) == [STATUS_DONE] * 5 + [STATUS_FAILED]
+    assert np.allclose(results["area"][:5], solve(SQUARE, engine="general", point_gap=0.1).area)
+
+    # The command line solves a corpus directory in place
+    assert main(["solve", path, "--point-gap", "0.1", "--no-progress"]) == 1
+    assert list(open_results(path)["status"]) == [STATUS_DONE] * 5 + [STATUS_FAILED]
+
+    # The progress bar knows the corpus size up front
+    capsys.readouterr()
+    main(["solve", path, "--point-gap", "0.1"])
+    assert "6/6" in capsys.readouterr().err
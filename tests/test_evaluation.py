@@ -0,0 +1,38 @@
+"""
+Tests for the reference oracle and the engine evaluation tools.
+"""
+
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+from src.evaluation import (
+    cached_reference, evaluate_engines, generate_corpus, pareto_front, rectangle_contained, summarize
+)
+
+
+def test_oracle_and_containment(tmp_path):
+    """Test that the seeded corpus is reproducible, the oracle is cached and beats the engines."""
+    corpus = generate_corpus(per_class=1, seed=3, classes=['star', 'rectilinear'])
+    assert corpus == generate_corpus(per_class=1, seed=3, classes=['star', 'rectilinear'])
+
+    references = {item.polygon_id: cached_reference(item.coords, str(tmp_path), angles=24) for item in corpus}
+    assert len(list(tmp_path.iterdir())) == len(corpus)
+    for item in corpus:
+        assert cached_reference(item.coords, str(tmp_path), angles=24) == references[item.polygon_id]
+        assert rectangle_contained(item.coords, references[item.polygon_id].corners)
+
+    records = evaluate_engines(corpus, references, engines=['general'], relative_gaps=[0.1])
+    assert all(record.contained and record.relative_error > -1e-6 for record in records)
+    assert [row.pareto for row in summarize(records)] == [True, True]
+
+    square = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    assert not rectangle_contained(square, [(0.5, 0.5), (1.5, 0.5), (1.5, 1), (0.5, 1)])
+    assert references[corpus[0].polygon_id].area == pytest.approx(
+        Polygon(references[corpus[0].polygon_id].corners).area)
+
+
+def test_pareto_front():
+    """Test that dominated settings are excluded and ties on one axis are kept only if better on the other."""
+    seconds = [1.0, 2.0, 2.0, 3.0, 0.5]
+    errors = [0.10, 0.05, 0.06, 0.05, 0.20]
+    assert np.array_equal(pareto_front(seconds, errors), [True, True, False, False, True])
@@ -0,0 +1,45 @@
+"""
+Tests for lazy package imports.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(statement):
+    """Run an import statement in a fresh interpreter and return the loaded module names."""
+    output = subprocess.run(
+        [sys.executable, "-c", f"import json, sys\n{statement}\nprint(json.dumps(sorted(sys.modules)))"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    return set(json.loads(output))
+
+
+def test_import_package_is_lightweight():
+    """Test that importing the package loads no solver or plotting dependencies."""
+    modules = loaded_modules("import src")
+
+    assert "matplotlib" not in modules
+    assert "shapely" not in modules
+
+
+def test_solver_path_skips_matplotlib():
+    """Test that the solvers can be used without importing matplotlib."""
+    modules = loaded_modules("from src import find_max_rectangle_general, find_max_rectangle_convex")
+
+    assert "src.algorithms.general_algorithm" in modules
+    assert "matplotlib" not in modules
+    assert "matplotlib" not in loaded_modules("from src.formats.exporters import export_results")
+
+
+def test_lazy_attributes_resolve():
+    """Test that lazily imported names resolve to the real objects."""
+    import src
+    from src.visualization.plotter import plot_polygon_with_rectangle
+
+    assert src.plot_polygon_with_rectangle is plot_polygon_with_rectangle
+    assert "find_max_rectangle_general" in dir(src)
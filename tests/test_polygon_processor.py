@@ -0,0 +1,142 @@
+"""
+Tests for polygon processing utilities.
+"""
+
+import pytest
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from src.core.geometry_utils import sort_rectangle_coords
+from src.core.geometry_utils import azimuth
+from src.core.polygon_processor import (
+    sample_boundary, simplify_inward, split_into_points, sweep_heights, tiny_increment
+)
+from src.core.ray_index import PolygonRayIndex
+from src.core.tessellation import SharedBoundary
+from src.batch.runner import solve_layer, solve_many
+from src.algorithms.convex_algorithm import extension_interior_check, extension_sides
+from src.algorithms.general_algorithm import extend_perpendicular, find_max_rectangle_general, find_final_rectangle
+from src.evaluation.shapes import generate_corpus
+
+
+def noisy_circle(n_vertices=2000, noise=0.001):
+    """Build a circle with many nearly collinear vertices."""
+    t = np.linspace(0, 2 * np.pi, n_vertices, endpoint=False)
+    radius = 1 + noise * np.sin(50 * t)
+    return Polygon(np.c_[radius * np.cos(t), radius * np.sin(t)])
+
+
+def test_simplify_inward_stays_inside():
+    """Test that the simplified polygon lies inside the original."""
+    polygon = noisy_circle()
+    simplified, report = simplify_inward(polygon, 0.01)
+
+    assert polygon.covers(simplified)
+    assert report.original_vertices == 2000
+    assert report.simplified_vertices < 200
+    assert report.vertices_removed == report.original_vertices - report.simplified_vertices
+    assert 0 < report.area_lost < 0.1
+
+
+def test_simplify_inward_rejects_bad_tolerance():
+    """Test that a non-positive tolerance is rejected."""
+    with pytest.raises(ValueError):
+        simplify_inward(Polygon([(0, 0), (1, 0), (1, 1), (0, 1)]), 0)
+
+
+def test_general_algorithm_with_simplification():
+    """Test that rectangles found after simplification fit the original polygon."""
+    polygon = noisy_circle(n_vertices=400)
+    coords = list(polygon.exterior.coords[:-1])
+
+    side, angle, point1, point2 = find_max_rectangle_general(coords, point_gap=0.2, simplify_tolerance=0.02)
+    rectangle = Polygon(sort_rectangle_coords(list(find_final_rectangle(side, angle, point1, point2))))
+
+    assert side > 0
+    assert polygon.buffer(1e-9).contains(rectangle)
+
+
+def test_ray_index_matches_exact_queries():
+    """Test that the edge index answers ray and sweep queries like the exact computations."""
+    polygon = noisy_circle(noise=0.05)
+    index = PolygonRayIndex(polygon)
+    rng = np.random.default_rng(0)
+
+    angles = rng.uniform(0, 2 * np.pi, 200)
+    directions = np.c_[np.cos(angles), np.sin(angles)]
+    distances = index.first_hit(np.zeros((200, 2)), directions)
+    hits = directions * distances[:, None]
+    # Every hit lies on the boundary and the segment up to it inside the polygon
+    assert np.allclose(shapely.distance(polygon.exterior, shapely.points(hits)), 0, atol=1e-9)
+    assert shapely.covers(polygon.buffer(1e-9), shapely.linestrings(np.stack((np.zeros_like(hits), hits), axis=1))).all()
+
+    samples = split_into_points(polygon, 0.2)
+    pairs = rng.integers(0, len(samples), (300, 2))
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    exact = sweep_heights(samples[pairs[:, 0]], samples[pairs[:, 1]], np.asarray(polygon.exterior.coords[:-1]))
+    assert np.allclose(index.sweep_heights(samples[pairs[:, 0]], samples[pairs[:, 1]]), exact)
+
+    # Holes block rays and sweeps too
+    square = Polygon([(0, 0), (4, 0), (4, 4), (0, 4)], [[(1, 1), (2, 1), (2, 2), (1, 2)]])
+    index = PolygonRayIndex(square)
+    assert index.first_hit([(0.5, 1.5), (0.5, 1.5)], [(1, 0), (-1, 0)]) == pytest.approx([0.5, 0.5])
+    assert index.sweep_heights(np.array([(0.5, 0.0), (2.5, 0.0)]), np.array([(3.5, 0.0), (3.5, 0.0)])) == \
+        pytest.approx([1.0, 4.0])
+
+
+def test_sweep_heights_ignore_slivers_at_base_vertices():
+    """Test that an edge leaving a base's end vertex outwards does not block the sweep at height 0."""
+    _, _, coords = generate_corpus(per_class=1, classes=['star'])[0]
+    polygon = Polygon(coords)
+    samples = split_into_points(polygon, 0.05)
+    ring = np.asarray(polygon.exterior.coords[:-1])
+    # Bases from samples to vertex 8, where the next edge is clipped to a rounding-sized piece of the strip
+    points1, points2 = samples[[2, 6, 13]], np.repeat(ring[8:9], 3, axis=0)
+    tiny = tiny_increment(polygon, 0.05)
+    stepped = [extend_perpendicular(point1, point2, polygon, tiny)[0] for point1, point2 in zip(points1, points2)]
+
+    heights = sweep_heights(points1, points2, ring)
+    assert np.all(heights >= np.array(stepped))
+    assert np.all(heights < np.array(stepped) + 2 * tiny)
+    assert np.allclose(PolygonRayIndex(polygon).sweep_heights(points1, points2), heights)
+
+
+def test_sample_normals_decide_extension_side():
+    """Test that the sample normals pick the same extension side as the containment test."""
+    # Clockwise L-shape with a reflex vertex, and a triangle with samples next to its vertices
+    for coords, point_gap in (([(0, 0), (0, 2), (1, 2), (1, 1), (2, 1), (2, 0)], 0.07),
+                              ([(0, 0), (3, 0), (1, 2)], 0.1)):
+        polygon = Polygon(coords)
+        samples = sample_boundary(polygon, point_gap)
+        tiny = tiny_increment(polygon, point_gap)
+        assert np.array_equal(samples.points, split_into_points(polygon, point_gap))
+        assert samples.reflex.sum() == (1 if len(coords) == 6 else 0)
+
+        for index, point1 in enumerate(samples.points):
+            sides = extension_sides(index, np.arange(len(samples.points)), samples, polygon, tiny)
+            for point2, side in zip(samples.points, sides):
+                if np.any(point1 != point2):
+                    expected = next((switch for switch in (1, -1) if extension_interior_check(
+                        point1, point2, azimuth(point1, point2), polygon, tiny, switch == 1)), 0)
+                    assert side == expected
+
+
+def test_shared_boundary_samples_each_segment_once():
+    """Test that neighbouring polygons reuse the samples of the segment they share."""
+    left = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    right = [(1, 0), (2.5, 0), (2.5, 1), (1, 1)]
+    layer = SharedBoundary([left, right], 0.1)
+
+    assert len(layer.segments) == 7
+    assert layer.shared_segments == 1
+    for index, coords in enumerate((left, right)):
+        samples = layer.samples(index)
+        expected = split_into_points(Polygon(coords), 0.1)
+        assert samples.shape == expected.shape
+        assert np.allclose(samples, expected, atol=1e-9)
+
+    items = [("left", left), ("right", right)]
+    for engine in ("general", "convex"):
+        shared = list(solve_layer(items, 0.1, engine=engine))
+        separate = list(solve_many(items, engine=engine, point_gap=0.1))
+        assert [record["area"] for record in shared] == pytest.approx([record["area"] for record in separate])
@@ -0,0 +1,50 @@
+"""
+Tests for the integer-grid precision mode.
+"""
+
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+from src.algorithms.general_algorithm import find_final_rectangle
+from src.algorithms.grid_algorithm import find_max_rectangle_grid
+from src.core.geometry_utils import sort_rectangle_coords
+from src.core.precision import points_in_ring, segments_in_ring, snap_polygon_inward
+
+L_SHAPE = [(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)]
+L_RING = np.array([(0, 0), (20, 0), (20, 10), (10, 10), (10, 20), (0, 20)])
+
+
+def test_snap_polygon_inward_stays_inside():
+    """Test that the snapped polygon lies inside the original."""
+    polygon = Polygon([(0.03, 0.01), (2.07, 0.02), (1.51, 1.33), (0.02, 1.97)])
+    frame, ring = snap_polygon_inward(polygon, 0.1)
+
+    assert ring.dtype == np.int64
+    assert polygon.covers(Polygon(frame.to_world(ring)))
+
+
+def test_points_in_ring_exact():
+    """Test point location including points on edges and vertices."""
+    points = np.array([(5, 5), (15, 15), (10, 10), (10, 15), (25, 5), (0, 0)])
+
+    assert list(points_in_ring(points, L_RING)) == [1, -1, 0, 0, -1, 0]
+
+
+def test_segments_in_ring_exact():
+    """Test segment containment around the notch of an L-shape."""
+    points1 = np.array([(5, 15), (5, 15), (10, 0), (0, 10), (2, 2), (0, 5)])
+    points2 = np.array([(15, 15), (15, 5), (10, 20), (10, 10), (0, 2), (0, 15)])
+
+    # Crosses the notch, touches the reflex vertex, passes through it along an edge,
+    # ends on it, ends on an edge, runs along an edge
+    expected = [False, True, True, True, True, False]
+    assert list(segments_in_ring(points1, points2, L_RING)) == expected
+
+
+def test_grid_algorithm_result_inside_polygon():
+    """Test that the grid engine returns a rectangle inside the original polygon."""
+    side, angle, point1, point2 = find_max_rectangle_grid(L_SHAPE, grid_size=0.001, point_gap=0.1)
+    rectangle = Polygon(sort_rectangle_coords(list(find_final_rectangle(side, angle, point1, point2))))
+
+    assert Polygon(L_SHAPE).covers(rectangle)
+    assert rectangle.area == pytest.approx(2.0, rel=0.05)
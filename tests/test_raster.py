@@ -0,0 +1,59 @@
+"""
+Tests for the raster-mask engine.
+"""
+
+import numpy as np
+import shapely
+from shapely import affinity
+from shapely.geometry import Polygon
+from src.algorithms.general_algorithm import find_final_rectangle
+from src.algorithms.raster_algorithm import find_max_rectangle_raster, largest_rectangle_in_mask
+from src.core.geometry_utils import sort_rectangle_coords
+
+
+def _brute_force(mask):
+    """Largest all-True rectangle by checking every rectangle with a summed-area table."""
+    rows, columns = mask.shape
+    table = np.zeros((rows + 1, columns + 1), dtype=int)
+    table[1:, 1:] = mask.cumsum(0).cumsum(1)
+    best = 0
+    for row0 in range(rows):
+        for row1 in range(row0 + 1, rows + 1):
+            for col0 in range(columns):
+                for col1 in range(col0 + 1, columns + 1):
+                    area = (row1 - row0) * (col1 - col0)
+                    if area > best and table[row1, col1] - table[row0, col1] - table[row1, col0] + table[row0, col0] == area:
+                        best = area
+    return best
+
+
+def test_largest_rectangle_in_mask_matches_brute_force():
+    """Test the strip-wise dynamic programme against brute force on random masks."""
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        mask = rng.random((7, 9)) < 0.75
+        row0, col0, row1, col1 = largest_rectangle_in_mask(mask, tile_rows=3)
+
+        assert mask[row0:row1, col0:col1].all()
+        assert (row1 - row0) * (col1 - col0) == _brute_force(mask)
+
+
+def test_raster_world_frame_and_rotation():
+    """Test that results use the affine world frame and that rotated search finds tilted shapes."""
+    mask = np.zeros((100, 200), dtype=bool)
+    mask[10:60, 20:180] = True
+    side, angle, point1, point2 = find_max_rectangle_raster(mask, transform=(0.5, 0, 1000, 0, -0.5, 2000))
+    corners = np.array(find_final_rectangle(side, angle, point1, point2))
+
+    assert side * np.linalg.norm(point2 - point1) == 80 * 25
+    assert np.allclose(corners.min(axis=0), [1010, 1970]) and np.allclose(corners.max(axis=0), [1090, 1995])
+
+    tilted = affinity.rotate(shapely.box(50, 80, 250, 140), 30, origin=(150, 110))
+    rows, columns = np.mgrid[0:300, 0:300] + 0.5
+    mask = shapely.contains_xy(tilted, columns, rows)
+    axis_aligned = find_max_rectangle_raster(mask)
+    side, angle, point1, point2 = find_max_rectangle_raster(mask, angles=[0.0, np.radians(30)])
+    rectangle = Polygon(sort_rectangle_coords(list(find_final_rectangle(side, angle, point1, point2))))
+
+    assert rectangle.area > 0.9 * tilted.area > axis_aligned[0] * np.linalg.norm(axis_aligned[3] - axis_aligned[2])
+    assert tilted.buffer(1.5).covers(rectangle)
@@ -0,0 +1,58 @@
+"""
+Tests for the local solving service.
+"""
+
+import asyncio
+import json
+import pytest
+from src.service.server import SolverService, canonical_polygon, serve
+
+SQUARE = [(0, 0), (1, 0), (1, 1), (0, 1)]
+
+
+def test_canonical_polygon_ignores_start_and_orientation():
+    """Test that rotated, reversed and closed copies of a ring share one key."""
+    key, ring = canonical_polygon(SQUARE)
+    variants = [SQUARE[2:] + SQUARE[:2], SQUARE[::-1], SQUARE + [SQUARE[0]]]
+
+    assert all(canonical_polygon(variant) == (key, ring) for variant in variants)
+    assert canonical_polygon([(0, 0), (2, 0), (2, 1), (0, 1)])[0] != key
+
+
+def test_service_deduplicates_and_enforces_deadlines():
+    """Test that concurrent identical requests are solved once and deadlines are honoured."""
+    async def scenario():
+        async with SolverService(jobs=1, batch_window=0.05) as service:
+            records = await asyncio.gather(*(service.solve(SQUARE[i:] + SQUARE[:i], point_gap=0.1)
+                                             for i in range(4)))
+            with pytest.raises(asyncio.TimeoutError):
+                await service.solve([(0, 0), (3, 0), (3, 2), (0, 2)], point_gap=0.1, timeout=0)
+            return records, service.metrics()
+
+    records, metrics = asyncio.run(scenario())
+
+    assert all(record == records[0] for record in records)
+    assert metrics['deduplicated'] == 3
+    assert metrics['solved'] == 1
+    assert metrics['timeouts'] == 1
+
+
+def test_http_endpoints():
+    """Test the JSON endpoints over a real loopback connection."""
+    async def scenario():
+        ready = asyncio.Event()
+        server = asyncio.create_task(serve('127.0.0.1', 0, ready=ready, jobs=1))
+        await ready.wait()
+        reader, writer = await asyncio.open_connection('127.0.0.1', ready.port)
+        body = json.dumps({'polygon': SQUARE, 'point_gap': 0.1}).encode()
+        writer.write(b"POST /solve HTTP/1.1\r\nConnection: close\r\n"
+                     + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        response = await reader.read()
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+        return response
+
+    head, _, body = asyncio.run(scenario()).partition(b"\r\n\r\n")
+
+    assert head.startswith(b"HTTP/1.1 200")
+    assert json.loads(body)['area'] > 0.8
@@ -0,0 +1,69 @@
+"""
+Tests for the visualization utilities.
+"""
+
+import json
+import re
+import pytest
+import numpy as np
+from shapely import wkb
+from src.formats.exporters import export_results
+from src.visualization.batch_renderer import render_batch, render_page
+
+
+def sample_results(count):
+    """Build simple square results for rendering."""
+    square = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    rectangle = [np.array([0.1, 0.1]), np.array([0.9, 0.1]), np.array([0.1, 0.9]), np.array([0.9, 0.9])]
+    return [(square, rectangle)] * count
+
+
+def test_render_page_uses_collections():
+    """Test that a page draws all polygons with two collections."""
+    figure = render_page(sample_results(6), columns=3, rows=2, labels=True, titles=list("abcdef"))
+    axes = figure.axes[0]
+
+    assert len(axes.collections) == 3
+    assert len(axes.collections[0].get_paths()) == 6
+    assert len(axes.texts) == 6 * 4 + 6
+
+
+def test_render_batch_png_pages(tmp_path):
+    """Test that results are split into PNG pages."""
+    written = render_batch(sample_results(10), str(tmp_path / "pages"), columns=2, rows=2, dpi=20, jobs=2)
+
+    assert len(written) == 3
+    assert all((tmp_path / "pages" / f"page_{i:04d}.png").exists() for i in range(3))
+
+
+def test_render_batch_pdf(tmp_path):
+    """Test that results can be written to a multi-page PDF."""
+    output = str(tmp_path / "results.pdf")
+    assert render_batch(sample_results(5), output, columns=2, rows=2) == [output]
+    assert (tmp_path / "results.pdf").stat().st_size > 0
+
+
+def test_export_results_vector_formats(tmp_path):
+    """Test that results are exported to SVG, GeoJSON and WKB, in one file or in tiles."""
+    results = sample_results(5)
+
+    export_results(results, str(tmp_path / "results.geojson"), ids=list("abcde"))
+    features = json.loads((tmp_path / "results.geojson").read_text())["features"]
+    assert [feature["properties"]["role"] for feature in features[:2]] == ["polygon", "rectangle"]
+    assert features[1]["properties"]["area"] == pytest.approx(0.64)
+    # Corners are in ring order, not in the order given
+    assert features[1]["geometry"]["coordinates"][0] == [[0.1, 0.1], [0.9, 0.1], [0.9, 0.9], [0.1, 0.9], [0.1, 0.1]]
+
+    export_results(results, str(tmp_path / "results.wkb"))
+    identifier, data = (tmp_path / "results.wkb").read_text().splitlines()[0].split("\t")
+    polygon, rectangle = wkb.loads(data, hex=True).geoms
+    assert identifier == "0" and polygon.area == 1.0 and rectangle.is_valid
+
+    svg = tmp_path / "results.svg"
+    export_results(results, str(svg))
+    assert svg.read_text().count('class="rectangle"') == 5
+    view_box = re.search(r'viewBox="([^"]*)"', svg.read_text()).group(1).split()
+    assert [float(value) for value in view_box] == [0.0, -1.0, 1.0, 1.0]
+
+    tiles = export_results(results, str(tmp_path / "tiles"), "svg", tile_size=2)
+    assert [path.rsplit("/", 1)[-1] for path in tiles] == ["tile_00000.svg", "tile_00001.svg", "tile_00002.svg"]